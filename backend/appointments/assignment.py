@@ -0,0 +1,161 @@
+"""
+Assign a batch of jobs to technicians and start times.
+
+Each technician's free time is a sorted list of disjoint gaps (working
+windows minus existing bookings), in integer epoch seconds. Jobs are placed
+greedily, most constrained first (fewest eligible technicians, then
+longest), each into the best-fitting gap across all technicians, i.e. the
+one that leaves the least unused time behind. A local search then tries to
+fit every job still unassigned by moving one placed job elsewhere to open
+up room for it. Every accepted move adds a job without dropping one, so the
+filled time only increases; the search stops when no move helps or its time
+budget runs out.
+"""
+import bisect
+import time as timer
+
+LOCAL_SEARCH_SECONDS = 2.0
+
+
+class Job:
+    """
+    A job to place. ``durations`` maps each eligible technician to how long
+    the job takes them, in seconds; the job must run within ``[earliest, latest)``.
+    """
+
+    def __init__(self, key, durations, earliest, latest):
+        self.key = key
+        self.durations = durations
+        self.earliest = earliest
+        self.latest = latest
+
+
+class TechnicianCalendar:
+    """The free gaps of one technician and the jobs placed in them."""
+
+    def __init__(self, technician, gaps):
+        self.technician = technician
+        self.starts = [start for start, _ in gaps]
+        self.ends = [end for _, end in gaps]
+        self.jobs = {}
+
+    def capacity(self):
+        return sum(end - start for start, end in zip(self.starts, self.ends))
+
+    def best_fit(self, duration, earliest, latest):
+        """Return ``(leftover, start)`` for the tightest gap fitting the job, or ``None``."""
+        best = None
+        i = bisect.bisect_right(self.ends, earliest)
+        for gap_start, gap_end in zip(self.starts[i:], self.ends[i:]):
+            if gap_start >= latest:
+                break
+            start = max(gap_start, earliest)
+            if min(gap_end, latest) - start < duration:
+                continue
+            leftover = (gap_end - gap_start) - duration
+            if best is None or leftover < best[0]:
+                best = (leftover, start)
+        return best
+
+    def occupy(self, key, start, end):
+        i = bisect.bisect_right(self.starts, start) - 1
+        gap_start, gap_end = self.starts[i], self.ends[i]
+        pieces = [(s, e) for s, e in ((gap_start, start), (end, gap_end)) if e > s]
+        self.starts[i:i + 1] = [s for s, _ in pieces]
+        self.ends[i:i + 1] = [e for _, e in pieces]
+        self.jobs[key] = (start, end)
+
+    def release(self, key):
+        start, end = self.jobs.pop(key)
+        i = bisect.bisect_left(self.starts, start)
+        if i > 0 and self.ends[i - 1] == start:
+            i -= 1
+            start = self.starts[i]
+            del self.starts[i], self.ends[i]
+        if i < len(self.starts) and self.starts[i] == end:
+            end = self.ends[i]
+            del self.starts[i], self.ends[i]
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+
+def best_placement(job, calendars):
+    """Return ``(calendar, start, end)`` for the tightest fit over all eligible technicians."""
+    best = None
+    for technician, duration in job.durations.items():
+        calendar = calendars.get(technician)
+        if calendar is None:
+            continue
+        fit = calendar.best_fit(duration, job.earliest, job.latest)
+        if fit is not None and (best is None or fit < best[0]):
+            best = (fit, calendar, duration)
+    if best is None:
+        return None
+    (_, start), calendar, duration = best
+    return calendar, start, start + duration
+
+
+def place(job, calendars, placements):
+    placement = best_placement(job, calendars)
+    if placement is None:
+        return False
+    calendar, start, end = placement
+    calendar.occupy(job.key, start, end)
+    placements[job.key] = calendar
+    return True
+
+
+def insert_by_relocation(job, jobs, calendars, placements, deadline):
+    """Fit ``job`` by moving one already placed job out of its way."""
+    if place(job, calendars, placements):
+        return True
+    for technician, duration in job.durations.items():
+        calendar = calendars.get(technician)
+        if calendar is None:
+            continue
+        for other_key in list(calendar.jobs):
+            if timer.monotonic() > deadline:
+                return False
+            other_start, other_end = calendar.jobs[other_key]
+            calendar.release(other_key)
+            fit = calendar.best_fit(duration, job.earliest, job.latest)
+            if fit is not None:
+                calendar.occupy(job.key, fit[1], fit[1] + duration)
+                placements[job.key] = calendar
+                if place(jobs[other_key], calendars, placements):
+                    return True
+                calendar.release(job.key)
+                del placements[job.key]
+            calendar.occupy(other_key, other_start, other_end)
+            placements[other_key] = calendar
+    return False
+
+
+def assign(jobs, calendars, local_search_seconds=LOCAL_SEARCH_SECONDS):
+    """
+    Place ``jobs`` into ``calendars`` (technician -> ``TechnicianCalendar``).
+
+    Returns ``({job key: (technician, start, end)}, [unassigned job keys])``.
+    """
+    by_key = {job.key: job for job in jobs}
+    placements = {}
+    unassigned = []
+    order = sorted(jobs, key=lambda job: (len(job.durations), -max(job.durations.values(), default=0), job.latest))
+    for job in order:
+        if not place(job, calendars, placements):
+            unassigned.append(job)
+
+    deadline = timer.monotonic() + local_search_seconds
+    improved = True
+    while improved and unassigned and timer.monotonic() < deadline:
+        improved = False
+        for job in list(unassigned):
+            if insert_by_relocation(job, by_key, calendars, placements, deadline):
+                unassigned.remove(job)
+                improved = True
+
+    assignments = {
+        key: (calendar.technician, *calendar.jobs[key])
+        for key, calendar in placements.items()
+    }
+    return assignments, sorted(job.key for job in unassigned)
@@ -0,0 +1,147 @@
+"""
+Streaming bulk import and export of appointments.
+
+Imports read the upload line by line, validate rows in fixed-size chunks and
+insert each chunk with one ``bulk_create``, so memory stays bounded no matter
+how many rows are sent. Exports stream rows straight off a server-side cursor.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from users.versions import APPOINTMENTS, bump_version
+from .conflicts import BusyCalendar, busy_intervals, lock_schedule
+from .models import Appointment
+from .reminders import schedule_reminders
+from .rollups import mark_appointments
+from .serializers import AppointmentSerializer
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+CSV_CONTENT_TYPE = 'text/csv'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+IMPORT_CONTENT_TYPES = (CSV_CONTENT_TYPE, NDJSON_CONTENT_TYPE)
+UNDECODABLE = '\ufffd'
+
+EXPORT_FIELDS = [
+    'id', 'customer_name', 'customer_phone', 'address', 'description',
+    'service', 'scheduled_time', 'end_time', 'created_at',
+]
+DATETIME_FIELDS = {'scheduled_time', 'end_time', 'created_at'}
+
+
+def iter_upload_rows(stream, content_type, encoding='utf-8'):
+    """Yield ``(row_number, row)``; ``row`` is a ``ValueError`` for unparseable lines."""
+    # Undecodable bytes become U+FFFD and fail their row rather than the
+    # whole upload, which may already have committed earlier chunks.
+    lines = codecs.iterdecode(stream, encoding, errors='replace')
+    if content_type == CSV_CONTENT_TYPE:
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            if any(UNDECODABLE in value for value in row.values() if isinstance(value, str)):
+                row = ValueError(f'Row is not valid {encoding}')
+            yield number, row
+        return
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        if UNDECODABLE in line:
+            yield number, ValueError(f'Line is not valid {encoding}')
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, ValueError(f'Invalid JSON: {exc}')
+            continue
+        if not isinstance(row, dict):
+            row = ValueError('Each line must be a JSON object')
+        yield number, row
+
+
+def import_chunk(chunk, errors, owner):
+    """Validate ``chunk`` of ``(row_number, row)`` pairs and insert the valid rows for ``owner``."""
+    candidates = []
+    for number, row in chunk:
+        if isinstance(row, ValueError):
+            errors.append({'row': number, 'errors': {'non_field_errors': [str(row)]}})
+            continue
+        serializer = AppointmentSerializer(data=row, context={'owner': owner})
+        if not serializer.is_valid():
+            errors.append({'row': number, 'errors': serializer.errors})
+            continue
+        appointment = Appointment(owner=owner, **serializer.validated_data)
+        appointment.compute_end_time()
+        candidates.append((number, appointment))
+
+    if not candidates:
+        return 0
+
+    with transaction.atomic():
+        lock_schedule(owner.pk)
+        window_start = min(a.scheduled_time for _, a in candidates)
+        window_end = max(a.end_time for _, a in candidates)
+        calendar = BusyCalendar(busy_intervals(owner.pk, window_start, window_end))
+
+        accepted = []
+        for number, appointment in candidates:
+            if calendar.overlaps(appointment.scheduled_time, appointment.end_time):
+                errors.append({'row': number, 'errors': {'non_field_errors': ['Appointment overlaps an existing booking']}})
+                continue
+            calendar.add(appointment.scheduled_time, appointment.end_time)
+            accepted.append(appointment)
+        Appointment.objects.bulk_create(accepted, batch_size=CHUNK_SIZE)
+        if accepted:
+            bump_version(APPOINTMENTS, owner.pk)
+            schedule_reminders(accepted)
+            mark_appointments(accepted)
+    return len(accepted)
+
+
+def import_appointments(rows, owner):
+    """Import ``(row_number, row)`` pairs for ``owner``; return the created count and row errors."""
+    created = 0
+    errors = []
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) == CHUNK_SIZE:
+            created += import_chunk(chunk, errors, owner)
+            chunk = []
+    if chunk:
+        created += import_chunk(chunk, errors, owner)
+    errors.sort(key=lambda error: error['row'])
+    return created, errors
+
+
+class Echo:
+    """File-like object whose ``write`` hands the value back to ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(queryset):
+    datetime_field = serializers.DateTimeField()
+    positions = [i for i, name in enumerate(EXPORT_FIELDS) if name in DATETIME_FIELDS]
+    for values in queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=CHUNK_SIZE):
+        values = list(values)
+        for i in positions:
+            values[i] = datetime_field.to_representation(values[i])
+        yield values
+
+
+def export_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for values in iter_export_rows(queryset):
+        yield writer.writerow(['' if value is None else value for value in values])
+
+
+def export_ndjson(queryset):
+    for values in iter_export_rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, values))) + '\n'
@@ -0,0 +1,96 @@
+import bisect
+from itertools import chain, islice
+
+from django.db import connection
+from .models import Appointment
+from .occurrences import series_bookings
+from .recurrence import MAX_COUNT
+from .slots import merge_intervals
+
+# Namespace for the PostgreSQL advisory locks that serialize booking writes;
+# the second key is the owner, so tenants never wait on each other.
+SCHEDULE_LOCK_KEY = 0x706C756D
+
+
+def lock_schedule(owner_id):
+    """
+    Serialize concurrent bookings for one owner for the rest of the current
+    transaction.
+
+    Row locks on overlapping appointments cannot stop two dispatchers from
+    both booking an empty slot, so on PostgreSQL a transaction-scoped
+    advisory lock guards the check-then-insert. SQLite already allows only
+    one writer at a time.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [SCHEDULE_LOCK_KEY, owner_id])
+
+
+def find_conflicts(owner_id, start, end, exclude_pk=None, exclude_occurrence=None):
+    """
+    Return the owner's bookings overlapping ``[start, end)`` as
+    ``(appointment_ids, occurrences)``, locking the appointments.
+
+    The ``(owner, end_time, scheduled_time)`` index turns the appointment
+    lookup into a range scan over the owner's bookings that end after
+    ``start``, which skips the historical backlog and every other tenant.
+    ``occurrences`` are ``(series_id, occurrence_time)`` pairs of series
+    occurrences that have no row of their own; ``exclude_occurrence`` is the
+    pair an override is about to replace.
+    """
+    overlapping = Appointment.objects.select_for_update().filter(
+        owner_id=owner_id,
+        end_time__gt=start,
+        scheduled_time__lt=end,
+    )
+    if exclude_pk is not None:
+        overlapping = overlapping.exclude(pk=exclude_pk)
+    occurrences = [
+        (series_id, occurrence) for _, series_id, occurrence, _ in series_bookings([owner_id], start, end)
+        if (series_id, occurrence) != exclude_occurrence
+    ]
+    return list(overlapping.order_by('scheduled_time').values_list('pk', flat=True)), occurrences
+
+
+def busy_intervals(owner_id, start, end):
+    """``(start, end)`` of everything booked for the owner overlapping ``[start, end)``: appointments and series occurrences."""
+    appointments = Appointment.objects.filter(
+        owner_id=owner_id,
+        end_time__gt=start,
+        scheduled_time__lt=end,
+    ).values_list('scheduled_time', 'end_time')
+    occurrences = series_bookings([owner_id], start, end)
+    return chain(appointments.iterator(), ((occurrence, end_time) for _, _, occurrence, end_time in occurrences))
+
+
+def find_series_conflicts(series):
+    """
+    Return the start times of unsaved ``series``' occurrences that overlap
+    its owner's bookings. Only the first ``MAX_COUNT`` occurrences are
+    checked, which covers every count-limited series.
+    """
+    occurrences = list(islice(series.occurrences(series.dtstart, None), MAX_COUNT))
+    if not occurrences:
+        return []
+    duration = series.duration
+    calendar = BusyCalendar(busy_intervals(series.owner_id, occurrences[0], occurrences[-1] + duration))
+    return [occurrence for occurrence in occurrences if calendar.overlaps(occurrence, occurrence + duration)]
+
+
+class BusyCalendar:
+    """Sorted, disjoint booked intervals over a span of time."""
+
+    def __init__(self, intervals):
+        merged = merge_intervals(intervals)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def overlaps(self, start, end):
+        i = bisect.bisect_left(self.starts, end) - 1
+        return i >= 0 and self.ends[i] > start
+
+    def add(self, start, end):
+        i = bisect.bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
@@ -0,0 +1,150 @@
+"""
+Auto-assignment of a batch of incoming jobs across technicians.
+
+All technicians' work hours, service catalogs, existing bookings and series
+occurrences in the range are read with a few queries in total, turned into free-gap calendars and
+handed to ``assignment.assign``. With ``commit`` the schedules of every
+technician involved are locked first, so the plan cannot race a booking.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import serializers
+
+from services.models import Service
+from users.versions import APPOINTMENTS, bump_version
+from work_hours.models import WorkHour
+from .assignment import Job, TechnicianCalendar, assign
+from .conflicts import lock_schedule
+from .models import DEFAULT_APPOINTMENT_MINUTES, Appointment
+from .occurrences import series_bookings
+from .reminders import schedule_reminders
+from .rollups import mark_appointments
+from .slots import merge_intervals, subtract_intervals, working_windows
+
+User = get_user_model()
+
+
+def technician_ids(requested=None):
+    """Active users with work hours, optionally limited to ``requested`` ids."""
+    users = User.objects.filter(is_active=True, pk__in=WorkHour.objects.values('user_id'))
+    if requested is not None:
+        users = users.filter(pk__in=requested)
+    return sorted(users.values_list('pk', flat=True))
+
+
+def load_calendars(technicians, start_date, end_date, tz):
+    range_start = datetime.combine(start_date, time.min, tz)
+    range_end = datetime.combine(end_date + timedelta(days=1), time.min, tz)
+
+    weekly_hours = {}
+    for user_id, day, start_time, end_time in WorkHour.objects.filter(
+        user_id__in=technicians,
+    ).values_list('user_id', 'day', 'start_time', 'end_time'):
+        weekly_hours.setdefault(user_id, {}).setdefault(day, []).append((start_time, end_time))
+
+    busy = {}
+    for owner_id, start, end in Appointment.objects.filter(
+        owner_id__in=technicians,
+        end_time__gt=range_start,
+        scheduled_time__lt=range_end,
+    ).values_list('owner_id', 'scheduled_time', 'end_time'):
+        busy.setdefault(owner_id, []).append((start, end))
+    for owner_id, _, start, end in series_bookings(technicians, range_start, range_end):
+        busy.setdefault(owner_id, []).append((start, end))
+
+    calendars = {}
+    for technician in technicians:
+        windows = working_windows(weekly_hours.get(technician, {}), start_date, end_date, tz)
+        free = subtract_intervals(windows, merge_intervals(busy.get(technician, ())))
+        calendars[technician] = TechnicianCalendar(
+            technician, [(int(start.timestamp()), int(end.timestamp())) for start, end in free],
+        )
+    return calendars, range_start, range_end
+
+
+def build_jobs(rows, technicians, range_start, range_end):
+    """
+    Turn validated job rows into ``Job``s. A job naming a service can only go
+    to technicians offering a service of that name, for that service's length.
+    """
+    catalog = {}
+    for user_id, name, service_id, minutes in Service.objects.filter(
+        user_id__in=technicians,
+    ).values_list('user_id', 'name', 'id', 'duration_minutes'):
+        catalog.setdefault(name.strip().lower(), {})[user_id] = (service_id, minutes)
+
+    jobs = []
+    services = {}
+    for index, row in enumerate(rows):
+        name = row.get('service', '').strip().lower()
+        if name:
+            offers = catalog.get(name, {})
+        else:
+            offers = {technician: (None, DEFAULT_APPOINTMENT_MINUTES) for technician in technicians}
+        services[index] = {technician: service_id for technician, (service_id, _) in offers.items()}
+        jobs.append(Job(
+            index,
+            {technician: minutes * 60 for technician, (_, minutes) in offers.items()},
+            int(max(row.get('earliest', range_start), range_start).timestamp()),
+            int(min(row.get('latest', range_end), range_end).timestamp()),
+        ))
+    return jobs, services
+
+
+def auto_assign(rows, start_date, end_date, requested=None, commit=False):
+    """
+    Assign job ``rows`` to technicians between ``start_date`` and ``end_date``.
+
+    Must run inside a transaction when ``commit`` is set; the assigned jobs
+    are then booked as appointments owned by their technicians.
+    """
+    tz = timezone.get_current_timezone()
+    technicians = technician_ids(requested)
+    if commit:
+        for technician in technicians:
+            lock_schedule(technician)
+    calendars, range_start, range_end = load_calendars(technicians, start_date, end_date, tz)
+    capacity = sum(calendar.capacity() for calendar in calendars.values())
+    jobs, services = build_jobs(rows, technicians, range_start, range_end)
+    assignments, unassigned = assign(jobs, calendars)
+
+    results = []
+    created = []
+    for index, (technician, start, end) in sorted(assignments.items()):
+        scheduled_time = datetime.fromtimestamp(start, tz)
+        end_time = datetime.fromtimestamp(end, tz)
+        results.append({'job': index, 'technician': technician, 'scheduled_time': scheduled_time, 'end_time': end_time})
+        if commit:
+            row = rows[index]
+            created.append(Appointment(
+                owner_id=technician,
+                customer_name=row['customer_name'],
+                customer_phone=row['customer_phone'],
+                address=row['address'],
+                description=row.get('description', ''),
+                service_id=services[index][technician],
+                scheduled_time=scheduled_time,
+                end_time=end_time,
+            ))
+    if created:
+        Appointment.objects.bulk_create(created)
+        schedule_reminders(created)
+        mark_appointments(created)
+        for technician in {appointment.owner_id for appointment in created}:
+            bump_version(APPOINTMENTS, technician)
+
+    datetime_field = serializers.DateTimeField()
+    for result, appointment in zip(results, created or [None] * len(results)):
+        result['scheduled_time'] = datetime_field.to_representation(result['scheduled_time'])
+        result['end_time'] = datetime_field.to_representation(result['end_time'])
+        result['appointment'] = appointment.pk if appointment is not None else None
+    filled = sum(end - start for _, start, end in assignments.values())
+    return {
+        'assignments': results,
+        'unassigned': unassigned,
+        'capacity_minutes': capacity // 60,
+        'filled_minutes': filled // 60,
+        'utilization': round(filled / capacity, 4) if capacity else 0.0,
+    }
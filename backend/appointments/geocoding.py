@@ -0,0 +1,82 @@
+"""
+Address geocoding with a persistent per-address cache.
+
+Each distinct address is geocoded once and its coordinates are stored in
+``GeocodedAddress`` under a hash of the normalized address, so planning a
+day reads every stop's coordinates with a single query. The geocoder itself
+is pluggable through ``settings.GEOCODER``.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import GeocodedAddress
+
+
+class LocalGeocoder:
+    """
+    Offline stand-in for a hosted geocoder.
+
+    Addresses are hashed to a stable point inside a metro-sized bounding box,
+    so the same address always lands in the same place and distinct addresses
+    are spread out. Only relative positions matter for route planning.
+    """
+
+    def __init__(self, south=40.60, west=-74.10, north=40.85, east=-73.80):
+        self.south, self.west, self.north, self.east = south, west, north, east
+
+    def geocode(self, address):
+        if not address:
+            return None
+        digest = hashlib.sha256(address.encode()).digest()
+        x = int.from_bytes(digest[:8], 'big') / 2 ** 64
+        y = int.from_bytes(digest[8:16], 'big') / 2 ** 64
+        return (self.south + y * (self.north - self.south), self.west + x * (self.east - self.west))
+
+
+@lru_cache(maxsize=None)
+def _load_geocoder(path):
+    return import_string(path)()
+
+
+def get_geocoder():
+    return _load_geocoder(settings.GEOCODER)
+
+
+def normalize_address(address):
+    return ' '.join(address.lower().split())
+
+
+def address_key(address):
+    return hashlib.sha1(normalize_address(address).encode()).hexdigest()
+
+
+def geocode_addresses(addresses):
+    """
+    Return ``{address: (latitude, longitude) or None}`` for ``addresses``.
+
+    Cached coordinates are read in one query; only addresses never seen
+    before reach the geocoder, and their results are stored for next time.
+    """
+    keys = {address: address_key(address) for address in set(addresses)}
+    known = {
+        key: (latitude, longitude)
+        for key, latitude, longitude in GeocodedAddress.objects.filter(
+            key__in=set(keys.values()),
+        ).values_list('key', 'latitude', 'longitude')
+    }
+
+    geocoder = get_geocoder()
+    new_rows = []
+    for address, key in keys.items():
+        if key in known:
+            continue
+        point = geocoder.geocode(normalize_address(address))
+        known[key] = point
+        if point is not None:
+            new_rows.append(GeocodedAddress(key=key, address=address, latitude=point[0], longitude=point[1]))
+    if new_rows:
+        GeocodedAddress.objects.bulk_create(new_rows, ignore_conflicts=True)
+    return {address: known[key] for address, key in keys.items()}
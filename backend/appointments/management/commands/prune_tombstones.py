@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from appointments.models import AppointmentTombstone
+from appointments.sync import TOMBSTONE_RETENTION
+
+
+class Command(BaseCommand):
+    help = "Delete appointment tombstones older than the sync retention window."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - TOMBSTONE_RETENTION
+        deleted, _ = AppointmentTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"Pruned {deleted} tombstones older than {cutoff.isoformat()}")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from appointments.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the per-day calendar rollups from the appointments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owners', help='Only rebuild this owner; repeatable.')
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options['owners'])
+        self.stdout.write(f"Wrote {written} daily rollups")
@@ -0,0 +1,36 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from appointments.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Send appointment reminders as they come due. Several schedulers can "
+        "run at once; each claims different reminders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Reminders claimed per transaction.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Messages sent at the same time.')
+        parser.add_argument('--poll-interval', type=float, default=10.0, help='Seconds to wait when nothing is due.')
+        parser.add_argument('--once', action='store_true', help='Exit once no reminder is due instead of polling.')
+
+    def handle(self, *args, **options):
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+        batch_size = options['batch_size']
+        sent = 0
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            while not stopping.is_set():
+                claimed = send_due_reminders(batch_size, pool.map)
+                sent += claimed
+                if claimed < batch_size:
+                    if options['once']:
+                        break
+                    stopping.wait(options['poll_interval'])
+        self.stdout.write(f"Handled {sent} reminders")
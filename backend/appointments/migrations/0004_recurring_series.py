@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0003_appointment_service_end_time'),
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurrence_time', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='occurrence_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RecurringSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('customer_name', models.CharField(max_length=255)),
+                ('customer_phone', models.CharField(max_length=20)),
+                ('address', models.TextField()),
+                ('description', models.TextField(blank=True)),
+                ('dtstart', models.DateTimeField()),
+                ('freq', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=7)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('by_weekday', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('by_set_pos', models.SmallIntegerField(blank=True, null=True)),
+                ('until', models.DateTimeField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_occurrence', models.DateTimeField(editable=False, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='series', to='services.service')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='appointment',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='overrides', to='appointments.recurringseries'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(fields=('series', 'occurrence_time'), name='appointment_unique_series_occurrence'),
+        ),
+        migrations.AddField(
+            model_name='seriesexception',
+            name='series',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='appointments.recurringseries'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringseries',
+            index=models.Index(fields=['dtstart', 'last_occurrence'], name='series_window_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='seriesexception',
+            unique_together={('series', 'occurrence_time')},
+        ),
+    ]
@@ -0,0 +1,59 @@
+"""
+Assign every existing appointment, series and tombstone to an owner.
+
+Rows booked against a service belong to that service's user. Anything
+left over (no service, or a tombstone whose appointment is gone) goes to
+the first superuser, or the first user if there is none. Rows are updated
+in primary-key batches, each in its own transaction, so a large table is
+never locked as a whole.
+"""
+from django.conf import settings
+from django.db import migrations, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def default_owner_id(User):
+    for users in (User.objects.filter(is_superuser=True), User.objects.all()):
+        owner_id = users.order_by('pk').values_list('pk', flat=True).first()
+        if owner_id is not None:
+            return owner_id
+    return None
+
+
+def backfill(model, owner_from_service, fallback_owner_id):
+    last_pk = model.objects.aggregate(last=Max('pk'))['last'] or 0
+    for low in range(0, last_pk + 1, BATCH_SIZE):
+        batch = model.objects.filter(pk__gte=low, pk__lt=low + BATCH_SIZE, owner__isnull=True)
+        with transaction.atomic():
+            if owner_from_service is not None:
+                batch.filter(service__isnull=False).update(owner=owner_from_service)
+            if batch.exists():
+                if fallback_owner_id is None:
+                    raise RuntimeError(f'Cannot backfill {model.__name__}.owner: create a user first.')
+                batch.update(owner=fallback_owner_id)
+
+
+def backfill_owner(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Service = apps.get_model('services', 'Service')
+    service_owner = Subquery(Service.objects.filter(pk=OuterRef('service_id')).values('user_id')[:1])
+    fallback_owner_id = default_owner_id(User)
+
+    backfill(apps.get_model('appointments', 'RecurringSeries'), service_owner, fallback_owner_id)
+    backfill(apps.get_model('appointments', 'Appointment'), service_owner, fallback_owner_id)
+    backfill(apps.get_model('appointments', 'AppointmentTombstone'), None, fallback_owner_id)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('appointments', '0006_owner'),
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owner, migrations.RunPython.noop),
+    ]
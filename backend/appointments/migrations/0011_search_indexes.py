@@ -0,0 +1,56 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Frozen copies of search_vector() and phone_digits() in appointments/search.py
+# at the time of writing; the planner only uses an index whose expression
+# matches the query exactly.
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('simple'::regconfig, COALESCE(\"customer_name\", '')), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, COALESCE(\"address\", '')), 'B'))"
+    " || setweight(to_tsvector('simple'::regconfig, COALESCE(\"description\", '')), 'C')"
+)
+PHONE_DIGITS = (
+    "REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(\"customer_phone\","
+    " '-', ''), ' ', ''), '(', ''), ')', ''), '.', ''), '+', '')"
+)
+
+CREATE_INDEXES = [
+    f'CREATE INDEX CONCURRENTLY "appointment_search_idx" ON "appointments_appointment" '
+    f'USING gin (({SEARCH_VECTOR}))',
+    f'CREATE INDEX CONCURRENTLY "appointment_phone_trgm_idx" ON "appointments_appointment" '
+    f'USING gin (({PHONE_DIGITS}) gin_trgm_ops)',
+]
+DROP_INDEXES = [
+    'DROP INDEX CONCURRENTLY IF EXISTS "appointment_search_idx"',
+    'DROP INDEX CONCURRENTLY IF EXISTS "appointment_phone_trgm_idx"',
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    # Full-text and trigram indexes exist only on PostgreSQL; other databases
+    # use the unindexed fallback in appointments/search.py.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in CREATE_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_INDEXES:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    # Building the indexes concurrently keeps the table writable meanwhile.
+    atomic = False
+
+    dependencies = [
+        ('appointments', '0010_reminder'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
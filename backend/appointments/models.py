@@ -1,13 +1,195 @@
+from datetime import timedelta
 from django.db import models
+from django.contrib.auth import get_user_model
+from services.models import Service
+from .recurrence import FREQUENCIES, iter_occurrences, nth_occurrence
+
+User = get_user_model()
+
+# Length of a booking that is not tied to a service.
+DEFAULT_APPOINTMENT_MINUTES = 60
 
 # Create your models here.
 class Appointment(models.Model):
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="appointments")
     customer_name = models.CharField(max_length=255)
     customer_phone = models.CharField(max_length=20)
     address = models.TextField()
     description = models.TextField(blank=True)
+    service = models.ForeignKey(Service, null=True, blank=True, on_delete=models.SET_NULL, related_name="appointments")
+    series = models.ForeignKey('RecurringSeries', null=True, blank=True, on_delete=models.CASCADE, related_name="overrides")
+    occurrence_time = models.DateTimeField(null=True, blank=True)
     scheduled_time = models.DateTimeField()
+    end_time = models.DateTimeField(editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Every query is scoped to one owner, so each index leads with it.
+            models.Index(fields=['owner', 'scheduled_time', 'id'], name='appointment_owner_sched_idx'),
+            models.Index(fields=['owner', 'end_time', 'scheduled_time'], name='appointment_owner_end_idx'),
+            models.Index(fields=['owner', 'updated_at', 'id'], name='appointment_owner_updated_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'occurrence_time'], name='appointment_unique_series_occurrence'),
+        ]
+
+    @property
+    def duration(self):
+        if self.service_id is not None:
+            return timedelta(minutes=self.service.duration_minutes)
+        return timedelta(minutes=DEFAULT_APPOINTMENT_MINUTES)
+
+    def compute_end_time(self):
+        self.scheduled_time = self._meta.get_field('scheduled_time').to_python(self.scheduled_time)
+        self.end_time = self.scheduled_time + self.duration
+        return self.end_time
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets a save that moves the booking find the day it moved away from.
+        instance._loaded_scheduled_time = instance.__dict__.get('scheduled_time')
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.compute_end_time()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'end_time' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'end_time']
+        super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"Appointment for {self.customer_name} at {self.address}"
\ No newline at end of file
+        return f"Appointment for {self.customer_name} at {self.address}"
+
+
+
+class RecurringSeries(models.Model):
+    """
+    A repeating booking such as "every first Monday for two years".
+
+    Occurrences are never stored; they are expanded per requested window.
+    Only deviations are persisted: a cancelled occurrence as a
+    ``SeriesException`` and a changed one as an ``Appointment`` override.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="series")
+    customer_name = models.CharField(max_length=255)
+    customer_phone = models.CharField(max_length=20)
+    address = models.TextField()
+    description = models.TextField(blank=True)
+    service = models.ForeignKey(Service, null=True, blank=True, on_delete=models.SET_NULL, related_name="series")
+    dtstart = models.DateTimeField()
+    freq = models.CharField(max_length=7, choices=FREQUENCIES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    by_weekday = models.PositiveSmallIntegerField(null=True, blank=True)
+    by_set_pos = models.SmallIntegerField(null=True, blank=True)
+    until = models.DateTimeField(null=True, blank=True)
+    count = models.PositiveIntegerField(null=True, blank=True)
+    last_occurrence = models.DateTimeField(null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'dtstart', 'last_occurrence'], name='series_owner_window_idx'),
+        ]
+
+    @property
+    def duration(self):
+        if self.service_id is not None:
+            return timedelta(minutes=self.service.duration_minutes)
+        return timedelta(minutes=DEFAULT_APPOINTMENT_MINUTES)
+
+    def rule(self):
+        return {
+            'dtstart': self.dtstart,
+            'freq': self.freq,
+            'interval': self.interval,
+            'until': self.until,
+            'by_weekday': self.by_weekday,
+            'by_set_pos': self.by_set_pos,
+        }
+
+    def occurrences(self, window_start, window_end):
+        rule = self.rule()
+        # last_occurrence also caps count-limited series
+        rule['until'] = self.last_occurrence
+        return iter_occurrences(window_start=window_start, window_end=window_end, **rule)
+
+    def compute_last_occurrence(self):
+        self.last_occurrence = self.until
+        if self.count:
+            self.last_occurrence = nth_occurrence(count=self.count, **self.rule()) or self.until
+        return self.last_occurrence
+
+    def save(self, *args, **kwargs):
+        self.compute_last_occurrence()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.get_freq_display()} series for {self.customer_name}"
+
+
+class SeriesException(models.Model):
+    series = models.ForeignKey(RecurringSeries, on_delete=models.CASCADE, related_name="exceptions")
+    occurrence_time = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("series", "occurrence_time")
+
+
+class AppointmentTombstone(models.Model):
+    """Marks a deleted appointment so sync clients can drop their copy."""
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    appointment_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'deleted_at'], name='tombstone_owner_deleted_idx'),
+        ]
+
+
+class GeocodedAddress(models.Model):
+    """Coordinates for an address, keyed by a hash of its normalized form."""
+    key = models.CharField(max_length=40, primary_key=True)
+    address = models.TextField()
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class Reminder(models.Model):
+    """
+    A customer reminder due ``REMINDER_LEAD_HOURS`` before an appointment.
+
+    ``sent_at`` is set once the reminder is handled, including when its
+    appointment had already started and nothing was sent.
+    """
+    appointment = models.OneToOneField(Appointment, on_delete=models.CASCADE, related_name="reminder")
+    due_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Only pending reminders are scanned, so sent ones stay out of the index.
+            models.Index(fields=['due_at'], name='reminder_pending_due_idx', condition=models.Q(sent_at__isnull=True)),
+        ]
+
+
+class DailyRollup(models.Model):
+    """
+    How many appointments an owner has starting on one local day and how many
+    minutes they book. Kept up to date by ``appointments.rollups``; days
+    without bookings have no row.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    appointment_count = models.PositiveIntegerField()
+    booked_minutes = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            # Also the index behind every calendar range read.
+            models.UniqueConstraint(fields=['owner', 'day'], name='rollup_owner_day_unique'),
+        ]
@@ -0,0 +1,27 @@
+"""
+Outgoing customer notifications.
+
+The transport is pluggable through ``settings.NOTIFIER``; the default only
+logs the messages, so nothing is sent until a real SMS gateway is set.
+"""
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class LogNotifier:
+    def send_sms(self, phone, message):
+        logger.info("SMS to %s: %s", phone, message)
+
+
+@lru_cache(maxsize=None)
+def _load_notifier(path):
+    return import_string(path)()
+
+
+def get_notifier():
+    return _load_notifier(settings.NOTIFIER)
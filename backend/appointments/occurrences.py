@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from rest_framework import serializers
+
+from .models import Appointment, RecurringSeries, SeriesException
+
+SERIES_FIELDS = ['customer_name', 'customer_phone', 'address', 'description', 'service']
+
+
+def active_series(owner, window_start, window_end):
+    return RecurringSeries.objects.filter(
+        Q(last_occurrence__isnull=True) | Q(last_occurrence__gte=window_start),
+        owner=owner,
+        dtstart__lt=window_end,
+    ).select_related('service')
+
+
+def expand_series(owner, window_start, window_end, series_queryset=None):
+    """
+    Return the occurrences of ``owner``'s series starting in
+    ``[window_start, window_end)`` as response rows sorted by ``scheduled_time``.
+
+    Cancelled occurrences are dropped and overridden ones are replaced by
+    their ``Appointment`` row; both are fetched with one query each.
+    """
+    if series_queryset is None:
+        series_queryset = active_series(owner, window_start, window_end)
+    series_list = list(series_queryset)
+    series_ids = [series.pk for series in series_list]
+    in_window = {
+        'series_id__in': series_ids,
+        'occurrence_time__gte': window_start,
+        'occurrence_time__lt': window_end,
+    }
+    cancelled = set(SeriesException.objects.filter(**in_window).values_list('series_id', 'occurrence_time'))
+    overrides = {
+        (appointment.series_id, appointment.occurrence_time): appointment
+        for appointment in Appointment.objects.filter(**in_window).select_related('service')
+    }
+
+    datetime_field = serializers.DateTimeField()
+    rows = []
+    for series in series_list:
+        duration = series.duration
+        for occurrence in series.occurrences(window_start, window_end):
+            key = (series.pk, occurrence)
+            if key in cancelled:
+                continue
+            override = overrides.get(key)
+            source = override or series
+            row = {field: getattr(source, field) for field in SERIES_FIELDS}
+            row['service'] = source.service_id
+            row['series'] = series.pk
+            row['occurrence_time'] = datetime_field.to_representation(occurrence)
+            if override is not None:
+                row.update(appointment=override.pk, scheduled_time=override.scheduled_time, end_time=override.end_time)
+            else:
+                row.update(appointment=None, scheduled_time=occurrence, end_time=occurrence + duration)
+            rows.append(row)
+
+    rows.sort(key=lambda row: (row['scheduled_time'], row['series']))
+    for row in rows:
+        row['scheduled_time'] = datetime_field.to_representation(row['scheduled_time'])
+        row['end_time'] = datetime_field.to_representation(row['end_time'])
+    return rows
+
+
+def series_bookings(owner_ids, start, end):
+    """
+    Return ``(owner_id, series_id, occurrence, end_time)`` for the series
+    occurrences of ``owner_ids`` overlapping ``[start, end)``, sorted by start.
+
+    Only occurrences without a row of their own are included: cancelled
+    ones are dropped and overridden ones are already among the owners'
+    appointments. Owners without series in range cost one query.
+    """
+    series_list = [
+        series for series in RecurringSeries.objects.filter(
+            owner_id__in=owner_ids, dtstart__lt=end,
+        ).select_related('service')
+        if series.last_occurrence is None or series.last_occurrence + series.duration > start
+    ]
+    if not series_list:
+        return []
+    in_window = {
+        'series_id__in': [series.pk for series in series_list],
+        'occurrence_time__gt': start - max(series.duration for series in series_list),
+        'occurrence_time__lt': end,
+    }
+    stored = set(SeriesException.objects.filter(**in_window).values_list('series_id', 'occurrence_time'))
+    stored.update(Appointment.objects.filter(**in_window).values_list('series_id', 'occurrence_time'))
+
+    bookings = []
+    for series in series_list:
+        duration = series.duration
+        for occurrence in series.occurrences(start - duration, end):
+            if occurrence + duration > start and (series.pk, occurrence) not in stored:
+                bookings.append((series.owner_id, series.pk, occurrence, occurrence + duration))
+    bookings.sort(key=lambda booking: booking[2])
+    return bookings
+
+
+def is_occurrence(series, occurrence_time):
+    upper = occurrence_time + timedelta(seconds=1)
+    return next(series.occurrences(occurrence_time, upper), None) == occurrence_time
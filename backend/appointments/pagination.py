@@ -0,0 +1,110 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_RANKED_OFFSET = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(scheduled_time, pk):
+    raw = f"{scheduled_time.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, pk = raw.rsplit('|', 1)
+        scheduled_time = parse_datetime(timestamp)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+    if scheduled_time is None or timezone.is_naive(scheduled_time):
+        raise InvalidCursor('Invalid cursor')
+    return scheduled_time, pk
+
+
+def parse_page_size(value):
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if size < 1:
+        raise ValueError('limit must be positive')
+    return min(size, MAX_PAGE_SIZE)
+
+
+def instance_key(row):
+    return row.scheduled_time, row.pk
+
+
+def paginate_keyset(queryset, cursor, page_size, key=instance_key):
+    """
+    Return one page of ``queryset`` ordered newest first by
+    ``(scheduled_time, id)`` and the cursor for the following page.
+    ``key`` extracts that pair from a row, for ``values_list()`` querysets.
+
+    The cursor marks the last row already seen, so each page is a single
+    range scan on the ``(scheduled_time, id)`` index regardless of depth.
+    """
+    return split_page(list(page_queryset(queryset, cursor, page_size)), page_size, key)
+
+
+async def apaginate_keyset(queryset, cursor, page_size, key=instance_key):
+    """Async ``paginate_keyset``."""
+    return split_page([row async for row in page_queryset(queryset, cursor, page_size)], page_size, key)
+
+
+def page_queryset(queryset, cursor, page_size):
+    queryset = queryset.order_by('-scheduled_time', '-id')
+    if cursor:
+        scheduled_time, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(scheduled_time__lt=scheduled_time) |
+            Q(scheduled_time=scheduled_time, id__lt=pk)
+        )
+    # One extra row tells whether another page follows
+    return queryset[:page_size + 1]
+
+
+def split_page(rows, page_size, key):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(*key(rows[-1]))
+    return rows, next_cursor
+
+
+def paginate_ranked(queryset, cursor, page_size):
+    """
+    Return one page of a relevance-ordered ``queryset`` and the next cursor.
+
+    Relevance is computed per query, so there is no index to seek into and
+    the cursor holds a plain offset instead; it stops at ``MAX_RANKED_OFFSET``
+    rows, past which a narrower query serves better than another page.
+    """
+    offset = 0
+    if cursor:
+        try:
+            offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (binascii.Error, UnicodeError, ValueError):
+            raise InvalidCursor('Invalid cursor')
+        if not 0 <= offset < MAX_RANKED_OFFSET:
+            raise InvalidCursor('Invalid cursor')
+    rows = list(queryset[offset:offset + page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        if offset + page_size < MAX_RANKED_OFFSET:
+            next_cursor = base64.urlsafe_b64encode(str(offset + page_size).encode()).decode()
+    return rows, next_cursor
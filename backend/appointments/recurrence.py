@@ -0,0 +1,108 @@
+"""
+Lazy expansion of RRULE-style recurrence rules.
+
+Occurrences are generated on demand for a requested window. The generator
+jumps straight to the first period that can intersect the window, so the
+cost of listing a month depends on the month, not on how long ago the series
+started or how far it runs.
+"""
+import calendar
+from datetime import MAXYEAR, date, datetime, timedelta
+from itertools import islice
+
+DAILY = 'daily'
+WEEKLY = 'weekly'
+MONTHLY = 'monthly'
+FREQUENCIES = [
+    (DAILY, 'Daily'),
+    (WEEKLY, 'Weekly'),
+    (MONTHLY, 'Monthly'),
+]
+MAX_COUNT = 5000
+MAX_INTERVAL = 99
+
+
+def nth_weekday(year, month, weekday, n):
+    """Day of month of the ``n``-th ``weekday`` (0 = Monday); ``n = -1`` is the last."""
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    if n > 0:
+        day = 1 + (weekday - first_weekday) % 7 + 7 * (n - 1)
+    else:
+        last_weekday = (first_weekday + days_in_month - 1) % 7
+        day = days_in_month - (last_weekday - weekday) % 7 + 7 * (n + 1)
+    return day if 1 <= day <= days_in_month else None
+
+
+def _iter_fixed_step(dtstart, step, window_start):
+    k = 0
+    if window_start > dtstart:
+        k = -((dtstart - window_start) // step)  # ceiling division
+    try:
+        occurrence = dtstart + k * step
+        while True:
+            yield occurrence
+            occurrence += step
+    except OverflowError:  # past datetime.max
+        return
+
+
+def _iter_monthly(dtstart, interval, window_start, by_weekday, by_set_pos):
+    months = (window_start.year - dtstart.year) * 12 + window_start.month - dtstart.month
+    k = max(0, months // interval)
+    while True:
+        index = dtstart.month - 1 + k * interval
+        year, month = dtstart.year + index // 12, index % 12 + 1
+        if year > MAXYEAR:
+            return
+        if by_weekday is not None:
+            day = nth_weekday(year, month, by_weekday, by_set_pos or 1)
+        else:
+            day = dtstart.day if dtstart.day <= calendar.monthrange(year, month)[1] else None
+        if day is not None:
+            occurrence = datetime.combine(date(year, month, day), dtstart.timetz())
+            if occurrence >= dtstart:
+                yield occurrence
+        k += 1
+
+
+def iter_occurrences(dtstart, freq, interval=1, window_start=None, window_end=None,
+                     until=None, by_weekday=None, by_set_pos=None):
+    """
+    Yield occurrence start times in ``[window_start, window_end)``, in order.
+
+    ``window_end`` and ``until`` may be ``None`` for an unbounded series, in
+    which case the generator runs until the last representable date.
+    """
+    window_start = dtstart if window_start is None else max(window_start, dtstart)
+    if freq == MONTHLY:
+        occurrences = _iter_monthly(dtstart, interval, window_start, by_weekday, by_set_pos)
+    else:
+        days = 7 if freq == WEEKLY else 1
+        occurrences = _iter_fixed_step(dtstart, timedelta(days=days * interval), window_start)
+
+    for occurrence in occurrences:
+        if window_end is not None and occurrence >= window_end:
+            return
+        if until is not None and occurrence > until:
+            return
+        if occurrence >= window_start:
+            yield occurrence
+
+
+def nth_occurrence(dtstart, freq, interval, count, until=None, by_weekday=None, by_set_pos=None):
+    """
+    Return the ``count``-th occurrence (1-based), or ``None`` if ``until``
+    ends the rule first.
+
+    Raises ``ValueError`` if ``count`` exceeds ``MAX_COUNT`` or the occurrence
+    would fall after the last representable date.
+    """
+    if count > MAX_COUNT:
+        raise ValueError(f'count cannot exceed {MAX_COUNT}.')
+    occurrences = iter_occurrences(
+        dtstart, freq, interval, until=until, by_weekday=by_weekday, by_set_pos=by_set_pos,
+    )
+    occurrence = next(islice(occurrences, count - 1, None), None)
+    if occurrence is None and until is None:
+        raise ValueError(f'The series would run past the year {MAXYEAR}.')
+    return occurrence
@@ -0,0 +1,95 @@
+"""
+Customer reminders ahead of appointments.
+
+Every appointment booked far enough ahead has one ``Reminder`` row due
+``REMINDER_LEAD_HOURS`` before it starts. Pending reminders are kept in a
+partial index on ``due_at``, so finding due work is a short index range scan
+however many reminders were sent before. ``send_due_reminders`` claims a
+batch with ``SELECT ... FOR UPDATE SKIP LOCKED`` and marks it sent in the
+same transaction: parallel schedulers split the due rows between them, and
+the batch of a scheduler that dies mid-send is picked up again.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Reminder
+from .notifications import get_notifier
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(minutes=5)
+
+
+def reminder_lead():
+    return timedelta(hours=settings.REMINDER_LEAD_HOURS)
+
+
+def schedule_reminders(appointments):
+    """
+    Create or move the reminders of ``appointments`` to match their start
+    times. Appointments starting within the lead time get none.
+    """
+    now = timezone.now()
+    lead = reminder_lead()
+    upcoming = []
+    too_late = []
+    for appointment in appointments:
+        due_at = appointment.scheduled_time - lead
+        if due_at > now:
+            upcoming.append(Reminder(appointment_id=appointment.pk, due_at=due_at))
+        else:
+            too_late.append(appointment.pk)
+    if too_late:
+        Reminder.objects.filter(appointment_id__in=too_late, sent_at__isnull=True).delete()
+    if upcoming:
+        Reminder.objects.bulk_create(
+            upcoming, update_conflicts=True, unique_fields=['appointment'], update_fields=['due_at', 'sent_at'],
+        )
+
+
+def reminder_message(appointment):
+    when = timezone.localtime(appointment.scheduled_time).strftime('%a %d %b at %H:%M')
+    what = f'your {appointment.service.name} appointment' if appointment.service_id else 'your appointment'
+    return f"Hi {appointment.customer_name}, a reminder that {what} is on {when}."
+
+
+def deliver(notifier, reminder):
+    appointment = reminder.appointment
+    try:
+        notifier.send_sms(appointment.customer_phone, reminder_message(appointment))
+    except Exception:
+        logger.exception("Reminder #%s could not be sent", reminder.pk)
+        return False
+    return True
+
+
+def send_due_reminders(limit=500, map_func=map):
+    """
+    Send up to ``limit`` due reminders and return how many were claimed.
+
+    ``map_func`` runs the sends, e.g. a thread pool's ``map`` for a notifier
+    that waits on the network. A reminder that fails to send is retried
+    after ``RETRY_DELAY``; one whose appointment has started is dropped.
+    """
+    now = timezone.now()
+    notifier = get_notifier()
+    with transaction.atomic():
+        reminders = list(
+            Reminder.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('appointment__service')
+            .filter(sent_at__isnull=True, due_at__lte=now)
+            .order_by('due_at')[:limit]
+        )
+        pending = [reminder for reminder in reminders if reminder.appointment.scheduled_time > now]
+        results = list(map_func(lambda reminder: deliver(notifier, reminder), pending))
+        failed = {reminder.pk for reminder, sent in zip(pending, results) if not sent}
+        done = [reminder.pk for reminder in reminders if reminder.pk not in failed]
+        if failed:
+            Reminder.objects.filter(pk__in=failed).update(due_at=now + RETRY_DELAY)
+        if done:
+            Reminder.objects.filter(pk__in=done).update(sent_at=now)
+    return len(reminders)
@@ -0,0 +1,223 @@
+"""
+Per-day booking totals behind the month calendar.
+
+``DailyRollup`` holds one row per owner and day (in ``TIME_ZONE``) with the
+number of appointments starting that day and the minutes they book. Writes
+don't adjust running totals, which could drift; they mark the days they
+touch, and once the transaction commits each marked day is recounted from
+``Appointment`` with one grouped range scan per owner. Saves and deletes
+are marked by signals; ``bulk_create`` callers mark their rows with
+``mark_appointments``, and ``retime_appointments`` marks the days of the
+rows it updates. ``rebuild_rollups`` recounts everything.
+
+Recurring series occurrences are not stored, so only booked appointments
+and series overrides count.
+"""
+import threading
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from work_hours.models import WorkHour
+from .conflicts import lock_schedule
+from .models import Appointment, DailyRollup
+from .slots import WEEKDAYS, merge_intervals
+
+REBUILD_BATCH_SIZE = 5000
+
+_pending = threading.local()
+
+
+def local_day(value):
+    return timezone.localdate(value, timezone.get_default_timezone())
+
+
+def day_start(day):
+    return datetime.combine(day, time.min, timezone.get_default_timezone())
+
+
+def daily_totals(appointments):
+    """Group ``appointments`` into ``(owner_id, day, count, booked)`` rows, ``booked`` a timedelta."""
+    return (
+        appointments
+        .annotate(day=TruncDate('scheduled_time', tzinfo=timezone.get_default_timezone()))
+        .values('owner_id', 'day')
+        .order_by()
+        .annotate(count=Count('id'), booked=Sum(F('end_time') - F('scheduled_time')))
+        .values_list('owner_id', 'day', 'count', 'booked')
+    )
+
+
+def to_rollup(owner_id, day, count, booked):
+    return DailyRollup(
+        owner_id=owner_id, day=day, appointment_count=count, booked_minutes=int(booked.total_seconds()) // 60,
+    )
+
+
+def refresh_days(owner_id, days):
+    """Recount ``owner_id``'s rollups for ``days`` from its appointments."""
+    with transaction.atomic():
+        # Taken after the writers' commits, so a recount never misses them.
+        lock_schedule(owner_id)
+        rows = [
+            to_rollup(*row) for row in daily_totals(Appointment.objects.filter(
+                owner_id=owner_id,
+                scheduled_time__gte=day_start(min(days)),
+                scheduled_time__lt=day_start(max(days) + timedelta(days=1)),
+            ))
+            if row[1] in days
+        ]
+        empty = days - {rollup.day for rollup in rows}
+        if empty:
+            DailyRollup.objects.filter(owner_id=owner_id, day__in=empty).delete()
+        if rows:
+            DailyRollup.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=['owner', 'day'],
+                update_fields=['appointment_count', 'booked_minutes'],
+            )
+
+
+def flush_pending():
+    by_owner = {}
+    for owner_id, day in getattr(_pending, 'days', ()):
+        by_owner.setdefault(owner_id, set()).add(day)
+    _pending.days = set()
+    for owner_id, days in by_owner.items():
+        refresh_days(owner_id, days)
+
+
+def mark_days(owner_days):
+    """Recount the ``(owner_id, day)`` pairs once the current transaction commits."""
+    if not hasattr(_pending, 'days'):
+        _pending.days = set()
+    _pending.days.update(owner_days)
+    # Every mark registers a flush, so days marked in a rolled-back
+    # transaction still go out with the next one; the first flush to run
+    # takes everything and later ones find nothing to do.
+    transaction.on_commit(flush_pending)
+
+
+def mark_appointments(appointments):
+    mark_days({(appointment.owner_id, local_day(appointment.scheduled_time)) for appointment in appointments})
+
+
+def retime_appointments(appointments, minutes):
+    """
+    Set the ``end_time`` of ``appointments`` to ``minutes`` after their start,
+    as when their service's length changes or the service is deleted, and
+    mark the days they fall on. Returns how many rows changed.
+    """
+    owner_days = set(
+        appointments
+        .annotate(day=TruncDate('scheduled_time', tzinfo=timezone.get_default_timezone()))
+        .values_list('owner_id', 'day')
+        .distinct()
+        .order_by()
+    )
+    updated = appointments.update(
+        end_time=F('scheduled_time') + timedelta(minutes=minutes),
+        updated_at=timezone.now(),
+    )
+    if updated:
+        mark_days(owner_days)
+    return updated
+
+
+def rebuild_rollups(owner_ids=None):
+    """Replace the rollups of ``owner_ids`` (everyone by default); return how many rows were written."""
+    appointments = Appointment.objects.all()
+    rollups = DailyRollup.objects.all()
+    if owner_ids is not None:
+        appointments = appointments.filter(owner_id__in=owner_ids)
+        rollups = rollups.filter(owner_id__in=owner_ids)
+    written = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in daily_totals(appointments).iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(to_rollup(*row))
+            if len(batch) == REBUILD_BATCH_SIZE:
+                DailyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        DailyRollup.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def parse_period(month=None, quarter=None):
+    """
+    The first and last day of ``month`` (``2026-10``) or ``quarter``
+    (``2026-Q4``), defaulting to the current month.
+    """
+    if month and quarter:
+        raise ValueError('Pass month or quarter, not both')
+    try:
+        if quarter:
+            year, number = quarter.upper().split('-Q')
+            year, first_month, months = int(year), (int(number) - 1) * 3 + 1, 3
+            if not 1 <= int(number) <= 4:
+                raise ValueError
+        elif month:
+            year, first_month = (int(part) for part in month.split('-'))
+            months = 1
+        else:
+            today = timezone.localdate()
+            year, first_month, months = today.year, today.month, 1
+        start = date(year, first_month, 1)
+    except ValueError:
+        raise ValueError('month must look like 2026-10 and quarter like 2026-Q4')
+    next_month = first_month + months
+    end = date(year + (next_month - 1) // 12, (next_month - 1) % 12 + 1, 1) - timedelta(days=1)
+    return start, end
+
+
+def weekly_capacity(hours):
+    """Bookable minutes per weekday, Monday first, from ``(day, start_time, end_time)`` rows."""
+    by_weekday = [[] for _ in WEEKDAYS]
+    for day, start_time, end_time in hours:
+        if end_time > start_time:
+            by_weekday[WEEKDAYS.index(day)].append((
+                start_time.hour * 60 + start_time.minute,
+                end_time.hour * 60 + end_time.minute,
+            ))
+    return [sum(end - start for start, end in merge_intervals(windows)) for windows in by_weekday]
+
+
+def build_calendar(technicians, start, end):
+    """
+    Per-day bookings and capacity for each of ``technicians`` from ``start``
+    through ``end``, read with one rollup query and one work hour query.
+    """
+    booked = {
+        (owner_id, day): (count, minutes)
+        for owner_id, day, count, minutes in DailyRollup.objects.filter(
+            owner_id__in=technicians, day__gte=start, day__lte=end,
+        ).values_list('owner_id', 'day', 'appointment_count', 'booked_minutes')
+    }
+    hours = {}
+    for user_id, day, start_time, end_time in WorkHour.objects.filter(
+        user_id__in=technicians,
+    ).values_list('user_id', 'day', 'start_time', 'end_time'):
+        hours.setdefault(user_id, []).append((day, start_time, end_time))
+
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    calendar = []
+    for technician in technicians:
+        capacity = weekly_capacity(hours.get(technician, ()))
+        rows = []
+        for day in days:
+            count, minutes = booked.get((technician, day), (0, 0))
+            available = capacity[day.weekday()]
+            rows.append({
+                'date': day.isoformat(),
+                'appointments': count,
+                'booked_minutes': minutes,
+                'capacity_minutes': available,
+                'utilization': round(minutes / available, 3) if available else None,
+            })
+        calendar.append({'technician': technician, 'days': rows})
+    return calendar
@@ -0,0 +1,131 @@
+"""
+Daily route planning for one technician.
+
+Stops are ordered with a nearest-neighbour tour improved by 2-opt over a
+great-circle distance matrix built with NumPy in one vectorized step. Every
+2-opt pass scores all segment ends for a given segment start at once, so a
+day of 50-200 stops plans in milliseconds. The ordered stops are then laid
+out through the day's working windows using each job's duration and the
+drive time between stops.
+"""
+from datetime import timedelta
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+MAX_TWO_OPT_PASSES = 50
+
+
+def distance_matrix(coordinates):
+    """Great-circle distances in km between every pair of ``(latitude, longitude)`` rows."""
+    points = np.radians(np.asarray(coordinates, dtype=float).reshape(-1, 2))
+    lat = points[:, :1]
+    lon = points[:, 1:]
+    a = np.sin((lat - lat.T) / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin((lon - lon.T) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def open_route_matrix(dist, origin=None):
+    """
+    Pad ``dist`` with a start node (index ``n``) and an end node (``n + 1``).
+
+    The start node is ``origin`` (distances from it to every stop) or, when
+    there is none, free to leave from anywhere. The end node costs nothing
+    to reach, which turns the tour into an open route.
+    """
+    n = len(dist)
+    padded = np.zeros((n + 2, n + 2))
+    padded[:n, :n] = dist
+    if origin is not None:
+        padded[n, :n] = origin
+        padded[:n, n] = origin
+    return padded
+
+
+def nearest_neighbour(dist, first, last):
+    """Greedy route from ``first`` through every node, finishing at ``last``."""
+    visited = np.zeros(len(dist), dtype=bool)
+    visited[[first, last]] = True
+    route = [first]
+    current = first
+    for _ in range(len(dist) - 2):
+        current = int(np.where(visited, np.inf, dist[current]).argmin())
+        visited[current] = True
+        route.append(current)
+    route.append(last)
+    return np.array(route)
+
+
+def two_opt(dist, route, max_passes=MAX_TWO_OPT_PASSES):
+    """
+    Reverse segments of ``route`` while that shortens it; both ends stay put.
+
+    Reversing ``route[i:k + 1]`` swaps edges ``(a, b), (c, d)`` for
+    ``(a, c), (b, d)``; for each ``i`` the change is computed for every ``k``
+    as one array and the best improving move is applied.
+    """
+    route = route.copy()
+    n = len(route)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 2):
+            a, b = route[i - 1], route[i]
+            c, d = route[i + 1:n - 1], route[i + 2:n]
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            j = int(delta.argmin())
+            if delta[j] < -1e-9:
+                route[i:i + j + 2] = route[i:i + j + 2][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return route
+
+
+def route_length(dist, route):
+    return float(dist[route[:-1], route[1:]].sum())
+
+
+def order_stops(dist, origin=None):
+    """
+    Return the visiting order of the stops in ``dist`` (indices into it) and
+    the padded matrix used, whose start node is ``len(dist)``.
+    """
+    n = len(dist)
+    padded = open_route_matrix(dist, origin)
+    if n <= 1:
+        return list(range(n)), padded
+    route = two_opt(padded, nearest_neighbour(padded, n, n + 1))
+    return [int(stop) for stop in route[1:-1]], padded
+
+
+def lay_out(order, dist, durations, windows, speed_kmh, start):
+    """
+    Assign times to stops visited in ``order`` from node ``start``.
+
+    Each job starts when the technician arrives or its working window opens,
+    whichever is later, and must finish inside that window. A job that fits
+    in no remaining window is left unplaced and the route continues from the
+    last placed stop. Returns ``(placed, unplaced)``; ``placed`` holds
+    ``(stop, arrival, start, end, km)`` tuples.
+    """
+    placed = []
+    unplaced = []
+    window = 0
+    position = start
+    clock = windows[0][0] if windows else None
+    for stop in order:
+        km = float(dist[position, stop])
+        arrival = clock + timedelta(hours=km / speed_kmh) if clock is not None else None
+        for candidate in range(window, len(windows)):
+            window_start, window_end = windows[candidate]
+            begin = max(arrival, window_start)
+            if begin + durations[stop] <= window_end:
+                break
+        else:
+            unplaced.append(stop)
+            continue
+        window = candidate
+        clock = begin + durations[stop]
+        placed.append((stop, arrival, begin, clock, km))
+        position = stop
+    return placed, unplaced
@@ -0,0 +1,83 @@
+"""
+Ranked appointment search for dispatchers.
+
+On PostgreSQL every word of the query must prefix-match the customer name,
+address or description through a weighted full-text vector, served by the
+GIN index ``appointment_search_idx``; a query that looks like a phone number
+also matches phone fragments through the trigram index
+``appointment_phone_trgm_idx``. Migration 0011 holds frozen SQL copies of
+``search_vector()`` and ``phone_digits()``, so the planner only uses the
+indexes while these expressions stay unchanged. Other databases fall back to
+substring matching ranked with the same weights, which is fine for
+development data.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Replace
+
+MAX_SEARCH_TERMS = 8
+MIN_PHONE_DIGITS = 3
+
+# Field, full-text weight label, and the weight ts_rank gives that label.
+SEARCH_FIELDS = (
+    ('customer_name', 'A', 1.0),
+    ('address', 'B', 0.4),
+    ('description', 'C', 0.2),
+)
+PHONE_SEPARATORS = ('-', ' ', '(', ')', '.', '+')
+PHONE_RE = re.compile(r'^[\d\s().+-]+$')
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    vectors = [SearchVector(field, weight=weight, config='simple') for field, weight, _ in SEARCH_FIELDS]
+    combined = vectors[0]
+    for vector in vectors[1:]:
+        combined = combined + vector
+    return combined
+
+
+def phone_digits():
+    """``customer_phone`` without separators, e.g. ``(555) 010-0123`` -> ``5550100123``."""
+    expression = F('customer_phone')
+    for separator in PHONE_SEPARATORS:
+        expression = Replace(expression, Value(separator))
+    return expression
+
+
+def parse_query(q):
+    """Split ``q`` into lowercase word terms and, if it looks like a phone number, its digits."""
+    terms = re.findall(r'\w+', q.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValueError('q must contain a word or number')
+    digits = re.sub(r'\D', '', q) if PHONE_RE.match(q.strip()) else ''
+    return terms, digits if len(digits) >= MIN_PHONE_DIGITS else ''
+
+
+def ranked_matches(appointments, q):
+    """Filter ``appointments`` to matches for ``q``, best first, then latest first."""
+    terms, digits = parse_query(q)
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), config='simple', search_type='raw')
+        appointments = appointments.annotate(document=search_vector())
+        matches = Q(document=query)
+        rank = SearchRank(F('document'), query)
+    else:
+        matches = Q()
+        for term in terms:
+            matches &= Q(*(Q(**{f'{field}__icontains': term}) for field, _, _ in SEARCH_FIELDS), _connector=Q.OR)
+        rank = sum((
+            Case(When(**{f'{field}__icontains': term}, then=Value(weight)), default=Value(0.0), output_field=FloatField())
+            for term in terms for field, _, weight in SEARCH_FIELDS
+        ), Value(0.0))
+    if digits:
+        appointments = appointments.annotate(phone_digits=phone_digits())
+        phone_match = Q(phone_digits__contains=digits)
+        matches |= phone_match
+        rank = rank + Case(When(phone_match, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+    return appointments.filter(matches).annotate(rank=rank).order_by('-rank', '-scheduled_time', '-id')
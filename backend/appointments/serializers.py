@@ -1,7 +1,81 @@
 from rest_framework import serializers
-from .models import Appointment
+from .models import Appointment, RecurringSeries
+from .recurrence import MAX_COUNT, MAX_INTERVAL, MONTHLY, nth_occurrence
 
-class AppointmentSerializer(serializers.ModelSerializer):
+MAX_ASSIGNMENT_JOBS = 2000
+MAX_ASSIGNMENT_DAYS = 31
+
+class OwnedServiceMixin:
+    """Reject services that belong to someone other than the ``owner`` in context."""
+
+    def validate_service(self, service):
+        owner = self.context.get('owner')
+        if service is not None and owner is not None and service.user_id != owner.pk:
+            raise serializers.ValidationError('Service not found.')
+        return service
+
+
+class AppointmentSerializer(OwnedServiceMixin, serializers.ModelSerializer):
     class Meta:
         model = Appointment
         fields = '__all__'
+        read_only_fields = ['owner', 'series', 'occurrence_time']
+
+
+class RecurringSeriesSerializer(OwnedServiceMixin, serializers.ModelSerializer):
+    by_weekday = serializers.IntegerField(min_value=0, max_value=6, required=False, allow_null=True)
+    by_set_pos = serializers.IntegerField(min_value=-1, max_value=4, required=False, allow_null=True)
+    interval = serializers.IntegerField(min_value=1, max_value=MAX_INTERVAL, default=1)
+    count = serializers.IntegerField(min_value=1, max_value=MAX_COUNT, required=False, allow_null=True)
+
+    class Meta:
+        model = RecurringSeries
+        fields = '__all__'
+        read_only_fields = ['owner']
+
+    def validate(self, attrs):
+        if attrs.get('by_set_pos') == 0:
+            raise serializers.ValidationError({'by_set_pos': 'Must be 1-4 or -1 for the last weekday.'})
+        if attrs.get('by_weekday') is not None and attrs.get('freq') != MONTHLY:
+            raise serializers.ValidationError({'by_weekday': 'Only supported for monthly series.'})
+        if attrs.get('by_set_pos') is not None and attrs.get('by_weekday') is None:
+            raise serializers.ValidationError({'by_set_pos': 'Requires by_weekday.'})
+        if attrs.get('count'):
+            try:
+                nth_occurrence(
+                    attrs['dtstart'], attrs['freq'], attrs['interval'], attrs['count'], until=attrs.get('until'),
+                    by_weekday=attrs.get('by_weekday'), by_set_pos=attrs.get('by_set_pos'),
+                )
+            except ValueError as exc:
+                raise serializers.ValidationError({'count': str(exc)})
+        return attrs
+
+
+class AssignmentJobSerializer(serializers.Serializer):
+    customer_name = serializers.CharField(max_length=255)
+    customer_phone = serializers.CharField(max_length=20)
+    address = serializers.CharField()
+    description = serializers.CharField(required=False, allow_blank=True)
+    # Matched by name against each technician's own catalog
+    service = serializers.CharField(required=False, allow_blank=True)
+    earliest = serializers.DateTimeField(required=False)
+    latest = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if 'earliest' in attrs and 'latest' in attrs and attrs['latest'] <= attrs['earliest']:
+            raise serializers.ValidationError({'latest': 'Must be after earliest.'})
+        return attrs
+
+
+class AssignmentRequestSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    technicians = serializers.ListField(child=serializers.IntegerField(), required=False)
+    jobs = AssignmentJobSerializer(many=True, allow_empty=False, max_length=MAX_ASSIGNMENT_JOBS)
+    commit = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        days = (attrs['end'] - attrs['start']).days
+        if not 0 <= days < MAX_ASSIGNMENT_DAYS:
+            raise serializers.ValidationError({'end': f'Must be on or after start and within {MAX_ASSIGNMENT_DAYS} days.'})
+        return attrs
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Appointment, AppointmentTombstone
+from .rollups import local_day, mark_days
+
+User = get_user_model()
+
+
+def deleting_owner(instance, origin):
+    """Whether ``instance`` is being deleted along with its owner."""
+    if isinstance(origin, User):
+        return origin.pk == instance.owner_id
+    if isinstance(origin, QuerySet) and origin.model is User:
+        # Users are deleted after their appointments, so the row is still there.
+        return origin.filter(pk=instance.owner_id).exists()
+    return False
+
+
+@receiver(post_delete, sender=Appointment)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    # A tombstone would point at the user being deleted, who has nothing left to sync.
+    if not deleting_owner(instance, origin):
+        AppointmentTombstone.objects.create(owner_id=instance.owner_id, appointment_id=instance.pk)
+
+
+@receiver(post_save, sender=Appointment)
+def mark_saved_day(sender, instance, **kwargs):
+    days = {(instance.owner_id, local_day(instance.scheduled_time))}
+    previous = getattr(instance, '_loaded_scheduled_time', None)
+    if previous is not None:
+        days.add((instance.owner_id, local_day(previous)))
+    instance._loaded_scheduled_time = instance.scheduled_time
+    mark_days(days)
+
+
+@receiver(post_delete, sender=Appointment)
+def mark_deleted_day(sender, instance, **kwargs):
+    mark_days({(instance.owner_id, local_day(instance.scheduled_time))})
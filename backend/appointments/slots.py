@@ -0,0 +1,79 @@
+"""
+Pure-Python available-slot engine.
+
+Free time is computed by sweeping sorted intervals instead of scanning the
+calendar minute by minute: the plumber's working windows and the booked
+intervals are each sorted and merged once, then subtracted with a single
+two-pointer pass, so the cost is O(n log n) in the number of appointments.
+"""
+from datetime import datetime, timedelta
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def merge_intervals(intervals):
+    """Sort ``(start, end)`` pairs and coalesce any that overlap or touch."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def working_windows(weekly_hours, start_date, end_date, tzinfo=None):
+    """
+    Expand ``weekly_hours`` (weekday name -> list of ``(start_time, end_time)``)
+    into concrete datetime windows for every date in ``[start_date, end_date]``.
+    """
+    by_weekday = [sorted(weekly_hours.get(day, ())) for day in WEEKDAYS]
+    windows = []
+    day = start_date
+    while day <= end_date:
+        for start_time, end_time in by_weekday[day.weekday()]:
+            if end_time <= start_time:
+                continue
+            windows.append((
+                datetime.combine(day, start_time, tzinfo),
+                datetime.combine(day, end_time, tzinfo),
+            ))
+        day += timedelta(days=1)
+    return merge_intervals(windows)
+
+
+def subtract_intervals(windows, busy):
+    """Return the parts of sorted, merged ``windows`` not covered by ``busy``."""
+    free = []
+    i = 0
+    for window_start, window_end in windows:
+        cursor = window_start
+        while i < len(busy) and busy[i][1] <= cursor:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < window_end:
+            busy_start, busy_end = busy[j]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            if busy_end > cursor:
+                cursor = busy_end
+            if cursor >= window_end:
+                break
+            j += 1
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
+
+
+def available_slots(weekly_hours, busy, start_date, end_date, duration, tzinfo=None):
+    """
+    Return the free ``(start, end)`` intervals between ``start_date`` and
+    ``end_date`` (inclusive) that are long enough to fit ``duration``.
+
+    ``busy`` is any iterable of ``(start, end)`` datetimes; it does not need
+    to be sorted or disjoint.
+    """
+    windows = working_windows(weekly_hours, start_date, end_date, tzinfo)
+    free = subtract_intervals(windows, merge_intervals(busy))
+    return [(start, end) for start, end in free if end - start >= duration]
@@ -0,0 +1,105 @@
+"""
+Delta sync for offline-capable clients.
+
+The opaque cursor records how far the client has read: an
+``(updated_at, id)`` position in the appointment change stream plus the
+service and work-hour change versions it last saw. Appointments are read
+from the ``(owner, updated_at, id)`` index and deletions from tombstones, so a
+reconnect costs in proportion to what changed. Services and work hours are
+small per user and are re-sent whole when their version moved.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from backend.rows import row_mapper
+from services.models import Service
+from services.serializers import ServiceSerializer
+from users.versions import SERVICES, WORK_HOURS, get_version
+from work_hours.cache import get_rows as get_work_hour_rows
+from .models import Appointment, AppointmentTombstone
+from .serializers import AppointmentSerializer
+
+SYNC_PAGE_SIZE = 500
+# Re-read this much of the recent change stream on every sync so rows from
+# transactions that committed after a later-stamped one are not skipped.
+SYNC_OVERLAP = timedelta(seconds=5)
+# Tombstones older than this may be pruned; older cursors get a full reset.
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(since, after_id, services_version, work_hours_version):
+    payload = {'t': since.isoformat(), 'id': after_id, 'sv': services_version, 'wv': work_hours_version}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        since = parse_datetime(payload['t'])
+        after_id, services_version, work_hours_version = int(payload['id']), int(payload['sv']), int(payload['wv'])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if since is None or timezone.is_naive(since):
+        raise InvalidCursor('Invalid cursor')
+    return since, after_id, services_version, work_hours_version
+
+
+def build_sync(user, cursor=None):
+    now = timezone.now()
+    reset = cursor is None
+    if cursor is not None:
+        since, after_id, services_version, work_hours_version = decode_cursor(cursor)
+        if since < now - TOMBSTONE_RETENTION:
+            reset = True
+    if reset:
+        since, after_id, services_version, work_hours_version = EPOCH, 0, None, None
+
+    mapper = row_mapper(AppointmentSerializer)
+    updated_at_index, id_index = mapper.index('updated_at'), mapper.index('id')
+    changed = list(
+        mapper.values(Appointment.objects.filter(
+            Q(updated_at__gt=since) | Q(updated_at=since, id__gt=after_id),
+            owner=user,
+        ).order_by('updated_at', 'id'))[:SYNC_PAGE_SIZE + 1]
+    )
+    has_more = len(changed) > SYNC_PAGE_SIZE
+    if has_more:
+        changed = changed[:SYNC_PAGE_SIZE]
+        next_since, next_after_id = changed[-1][updated_at_index], changed[-1][id_index]
+    else:
+        next_since, next_after_id = now - SYNC_OVERLAP, 0
+
+    deleted = [] if reset else list(
+        AppointmentTombstone.objects.filter(owner=user, deleted_at__gte=since).values_list('appointment_id', flat=True).distinct()
+    )
+
+    current_services_version = get_version(SERVICES, user.pk)
+    current_work_hours_version = get_version(WORK_HOURS, user.pk)
+    services = None
+    if current_services_version != services_version:
+        service_mapper = row_mapper(ServiceSerializer)
+        services = service_mapper.to_rows(service_mapper.values(Service.objects.filter(user=user)))
+    work_hours = None
+    if current_work_hours_version != work_hours_version:
+        work_hours = get_work_hour_rows(user.pk)
+
+    return {
+        'reset': reset,
+        'has_more': has_more,
+        'cursor': encode_cursor(next_since, next_after_id, current_services_version, current_work_hours_version),
+        'appointments': {'upserted': mapper.to_rows(changed), 'deleted': deleted},
+        'services': services,
+        'work_hours': work_hours,
+    }
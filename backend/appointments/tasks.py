@@ -0,0 +1,25 @@
+"""Background work triggered by bookings; see ``tasks.queue``."""
+from django.utils import timezone
+
+from tasks.queue import background
+from .geocoding import geocode_addresses
+from .models import Appointment
+from .notifications import get_notifier
+
+
+@background
+def send_confirmation(appointment_id):
+    appointment = Appointment.objects.select_related('service').filter(pk=appointment_id).first()
+    if appointment is None:
+        return
+    when = timezone.localtime(appointment.scheduled_time).strftime('%a %d %b at %H:%M')
+    what = f'your {appointment.service.name} appointment' if appointment.service_id else 'your appointment'
+    get_notifier().send_sms(
+        appointment.customer_phone,
+        f"Hi {appointment.customer_name}, {what} is booked for {when}.",
+    )
+
+
+@background
+def geocode_address(address):
+    geocode_addresses([address])
@@ -1,13 +1,38 @@
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Appointment
+from rest_framework_simplejwt.tokens import RefreshToken
+from services.models import Service
+from tasks.models import Task
+from tasks.worker import claim, execute
+from work_hours.models import WorkHour
+from .assignment import Job, TechnicianCalendar, assign, insert_by_relocation
+from .occurrences import expand_series
+from .models import Appointment, AppointmentTombstone, DailyRollup, GeocodedAddress, RecurringSeries, Reminder
+from .recurrence import MONTHLY, WEEKLY, iter_occurrences, nth_weekday
+from .reminders import send_due_reminders
+from .rollups import rebuild_rollups
+from .routing import distance_matrix, lay_out, nearest_neighbour, order_stops, route_length
+from .slots import available_slots, merge_intervals
+from .sync import encode_cursor
+
+User = get_user_model()
 
 class AppointmentListAPITests(APITestCase):
 
     def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
         # Create some sample appointments to list
         Appointment.objects.create(
+            owner=self.user,
             customer_name="Alice",
             customer_phone="111-222-3333",
             address="100 Main St",
@@ -15,6 +40,7 @@ class AppointmentListAPITests(APITestCase):
             scheduled_time="2025-06-01T09:00:00Z"
         )
         Appointment.objects.create(
+            owner=self.user,
             customer_name="Bob",
             customer_phone="444-555-6666",
             address="200 Oak Ave",
@@ -30,16 +56,58 @@ class AppointmentListAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Should return 2 appointments
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next_cursor'])
 
         # Check one appointment's customer_name
-        self.assertEqual(response.data[0]['customer_name'], "Bob")  # Because of order_by descending scheduled_time
-        self.assertEqual(response.data[1]['customer_name'], "Alice")
+        self.assertEqual(response.data['results'][0]['customer_name'], "Bob")  # Because of order_by descending scheduled_time
+        self.assertEqual(response.data['results'][1]['customer_name'], "Alice")
+
+    def test_list_appointments_cursor_pagination(self):
+        # Same scheduled_time as Bob so the id tie-breaker is exercised
+        Appointment.objects.create(
+            owner=self.user,
+            customer_name="Carol",
+            customer_phone="777-888-9999",
+            address="300 Elm St",
+            scheduled_time="2025-06-02T10:00:00Z"
+        )
+        url = reverse('list_appointments')
+        names = []
+        cursor = None
+        while True:
+            params = {'limit': 1}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 1)
+            names.append(response.data['results'][0]['customer_name'])
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(names, ["Carol", "Bob", "Alice"])
+
+    def test_list_appointments_time_window(self):
+        url = reverse('list_appointments')
+        response = self.client.get(url, {'from': '2025-06-02T00:00:00Z', 'to': '2025-06-03T00:00:00Z'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([a['customer_name'] for a in response.data['results']], ["Bob"])
+
+    def test_list_appointments_invalid_params(self):
+        url = reverse('list_appointments')
+        for params in ({'cursor': 'not-a-cursor'}, {'from': 'yesterday'}, {'limit': 'ten'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
 
 class AppointmentDetailAPITests(APITestCase):
 
     def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
         self.appointment = Appointment.objects.create(
+            owner=self.user,
             customer_name="Eve",
             customer_phone="555-123-4567",
             address="789 Pine St",
@@ -61,6 +129,11 @@ class AppointmentDetailAPITests(APITestCase):
         self.assertIn('error', response.data)
 
 class AppointmentAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
     def test_create_appointment(self):
         url = reverse('create_appointment')
         data = {
@@ -88,6 +161,28 @@ class AppointmentAPITests(APITestCase):
         appointment = Appointment.objects.first()
         self.assertEqual(appointment.customer_name, data['customer_name'])
 
+    def test_create_appointment_queues_confirmation_and_geocoding(self):
+        data = {
+            "customer_name": "John Doe",
+            "customer_phone": "555-1234",
+            "address": "123 Main St",
+            "scheduled_time": "2025-06-01T10:00:00Z"
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('create_appointment'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(Task.objects.values_list('name', flat=True)),
+            ['appointments.tasks.geocode_address', 'appointments.tasks.send_confirmation'],
+        )
+
+        with mock.patch('appointments.notifications.LogNotifier.send_sms') as send_sms:
+            for task in claim(10):
+                execute(task)
+        send_sms.assert_called_once_with('555-1234', 'Hi John Doe, your appointment is booked for Sun 01 Jun at 10:00.')
+        self.assertTrue(GeocodedAddress.objects.filter(address='123 Main St').exists())
+        self.assertFalse(Task.objects.exists())
+
     def test_create_appointment_missing_required_fields(self):
         url = reverse('create_appointment')
 
@@ -108,7 +203,10 @@ class AppointmentAPITests(APITestCase):
 class AppointmentDeleteAPITests(APITestCase):
 
     def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
         self.appointment = Appointment.objects.create(
+            owner=self.user,
             customer_name="Charlie",
             customer_phone="777-888-9999",
             address="300 Pine St",
@@ -131,7 +229,10 @@ class AppointmentDeleteAPITests(APITestCase):
 class AppointmentUpdateAPITests(APITestCase):
 
     def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
         self.appointment = Appointment.objects.create(
+            owner=self.user,
             customer_name="Dana",
             customer_phone="111-222-3333",
             address="400 Oak St",
@@ -167,4 +268,926 @@ class AppointmentUpdateAPITests(APITestCase):
         data = {'description': 'Will not work'}
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertIn('error', response.data)
\ No newline at end of file
+        self.assertIn('error', response.data)
+
+class SlotEngineTests(SimpleTestCase):
+
+    def dt(self, day, hour, minute=0):
+        return datetime(2025, 6, day, hour, minute, tzinfo=timezone.utc)
+
+    def test_merge_intervals(self):
+        merged = merge_intervals([(3, 5), (1, 2), (2, 3), (7, 9), (8, 8)])
+        self.assertEqual(merged, [(1, 5), (7, 9)])
+
+    def test_available_slots_subtracts_busy_time(self):
+        weekly_hours = {"monday": [(time(9), time(17))]}  # 2025-06-02 is a Monday
+        busy = [
+            (self.dt(2, 11), self.dt(2, 12)),
+            (self.dt(2, 8), self.dt(2, 9, 30)),
+            (self.dt(2, 11, 30), self.dt(2, 13)),
+        ]
+        slots = available_slots(
+            weekly_hours, busy, date(2025, 6, 1), date(2025, 6, 3),
+            timedelta(minutes=60), timezone.utc,
+        )
+        self.assertEqual(slots, [
+            (self.dt(2, 9, 30), self.dt(2, 11)),
+            (self.dt(2, 13), self.dt(2, 17)),
+        ])
+
+    def test_available_slots_drops_gaps_shorter_than_duration(self):
+        weekly_hours = {"monday": [(time(9), time(12))]}
+        busy = [(self.dt(2, 9, 30), self.dt(2, 11, 30))]
+        slots = available_slots(
+            weekly_hours, busy, date(2025, 6, 2), date(2025, 6, 2),
+            timedelta(minutes=45), timezone.utc,
+        )
+        self.assertEqual(slots, [])
+
+
+class AvailableSlotsAPITests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+        self.service = Service.objects.create(user=self.user, name="Drain", duration_minutes=90)
+        WorkHour.objects.create(user=self.user, day="monday", start_time="09:00", end_time="13:00")
+        Appointment.objects.create(
+            owner=self.user,
+            customer_name="Fay",
+            customer_phone="111-222-3333",
+            address="1 Elm St",
+            scheduled_time="2025-06-02T10:00:00Z"
+        )
+
+    def test_list_available_slots(self):
+        url = reverse('list_available_slots')
+        response = self.client.get(url, {'service': self.service.pk, 'start': '2025-06-02', 'end': '2025-06-08'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # 09:00-10:00 is too short for a 90 minute job; 11:00-13:00 fits
+        self.assertEqual(response.data, [{
+            'start': '2025-06-02T11:00:00+00:00',
+            'end': '2025-06-02T13:00:00+00:00',
+            'latest_start': '2025-06-02T11:30:00+00:00',
+        }])
+
+    def test_series_occurrences_are_busy(self):
+        RecurringSeries.objects.create(
+            owner=self.user, customer_name="Gus", customer_phone="555-0101", address="2 Elm St",
+            dtstart=datetime(2025, 5, 26, 11, 30, tzinfo=timezone.utc), freq=WEEKLY, count=4,
+        )
+        response = self.client.get(reverse('list_available_slots'), {
+            'service': self.service.pk, 'start': '2025-06-02', 'end': '2025-06-08',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The 11:30-12:30 occurrence splits the afternoon into two short gaps
+        self.assertEqual(response.data, [])
+
+    def test_list_available_slots_unknown_service(self):
+        url = reverse('list_available_slots')
+        response = self.client.get(url, {'service': 9999, 'start': '2025-06-02', 'end': '2025-06-08'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_available_slots_invalid_range(self):
+        url = reverse('list_available_slots')
+        response = self.client.get(url, {'service': self.service.pk, 'start': '2025-06-08', 'end': '2025-06-02'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_list_available_slots_requires_auth(self):
+        self.client.credentials()
+        response = self.client.get(reverse('list_available_slots'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AppointmentConflictAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.service = Service.objects.create(user=self.user, name="Water Heater Install", duration_minutes=120)
+        self.appointment = Appointment.objects.create(
+            owner=self.user,
+            customer_name="Gus",
+            customer_phone="222-333-4444",
+            address="12 Cedar Ln",
+            service=self.service,
+            scheduled_time="2025-06-05T09:00:00Z"
+        )
+        self.payload = {
+            "customer_name": "Hana",
+            "customer_phone": "555-0000",
+            "address": "34 Spruce Ct",
+        }
+
+    def test_end_time_computed_from_service_duration(self):
+        self.assertEqual(self.appointment.end_time.isoformat(), "2025-06-05T11:00:00+00:00")
+        other = Appointment.objects.create(owner=self.user, scheduled_time="2025-06-06T09:00:00Z", **self.payload)
+        self.assertEqual(other.end_time.isoformat(), "2025-06-06T10:00:00+00:00")
+
+    def test_create_overlapping_appointment_rejected(self):
+        data = dict(self.payload, scheduled_time="2025-06-05T10:30:00Z")
+        response = self.client.post(reverse('create_appointment'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['conflicts'], [self.appointment.pk])
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_create_adjacent_appointment_allowed(self):
+        data = dict(self.payload, scheduled_time="2025-06-05T11:00:00Z")
+        response = self.client.post(reverse('create_appointment'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['end_time'], "2025-06-05T12:00:00Z")
+
+    def test_update_into_overlap_rejected(self):
+        other = Appointment.objects.create(owner=self.user, scheduled_time="2025-06-05T13:00:00Z", **self.payload)
+        url = reverse('update_appointment', kwargs={'pk': other.pk})
+        response = self.client.patch(url, {'scheduled_time': "2025-06-05T08:30:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        other.refresh_from_db()
+        self.assertEqual(other.scheduled_time.isoformat(), "2025-06-05T13:00:00+00:00")
+
+    def test_update_does_not_conflict_with_itself(self):
+        url = reverse('update_appointment', kwargs={'pk': self.appointment.pk})
+        response = self.client.patch(url, {'scheduled_time': "2025-06-05T10:00:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.end_time.isoformat(), "2025-06-05T12:00:00+00:00")
+
+
+class AppointmentBulkAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+    def test_bulk_create_csv(self):
+        body = (
+            "customer_name,customer_phone,address,description,scheduled_time\n"
+            "Ivy,555-0001,1 First St,Leak,2025-07-01T09:00:00Z\n"
+            "Jon,555-0002,\"2 Second St, Apt 4\",,2025-07-01T10:00:00Z\n"
+        )
+        response = self.client.post(reverse('bulk_create_appointments'), body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'], [])
+        jon = Appointment.objects.get(customer_name="Jon")
+        self.assertEqual(jon.address, "2 Second St, Apt 4")
+        self.assertEqual(jon.end_time.isoformat(), "2025-07-01T11:00:00+00:00")
+
+    def test_bulk_create_ndjson_reports_row_errors(self):
+        Appointment.objects.create(
+            owner=self.user,
+            customer_name="Kim",
+            customer_phone="555-0003",
+            address="3 Third St",
+            scheduled_time="2025-07-02T09:00:00Z"
+        )
+        body = "\n".join([
+            '{"customer_name": "Lee", "customer_phone": "555-0004", "address": "4 Fourth St", "scheduled_time": "2025-07-02T12:00:00Z"}',
+            '{"customer_name": "Max"}',
+            'not json',
+            '{"customer_name": "Ned", "customer_phone": "555-0005", "address": "5 Fifth St", "scheduled_time": "2025-07-02T09:30:00Z"}',
+            '{"customer_name": "Oli", "customer_phone": "555-0006", "address": "6 Sixth St", "scheduled_time": "2025-07-02T12:30:00Z"}',
+        ])
+        response = self.client.post(reverse('bulk_create_appointments'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 4, 5])
+        self.assertIn('scheduled_time', response.data['errors'][0]['errors'])
+        self.assertEqual(Appointment.objects.count(), 2)
+
+    def test_bulk_create_reports_undecodable_rows(self):
+        body = (
+            "customer_name,customer_phone,address,description,scheduled_time\n"
+            "Ivy,555-0001,1 First St,Leak,2025-07-01T09:00:00Z\n"
+            "Jos\xe9,555-0002,2 Second St,,2025-07-01T10:00:00Z\n"
+        ).encode('latin-1')
+        response = self.client.post(reverse('bulk_create_appointments'), body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2])
+
+        Appointment.objects.all().delete()
+        response = self.client.post(reverse('bulk_create_appointments'), body, content_type='text/csv; charset=latin-1')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Appointment.objects.filter(customer_name="Jos\xe9").exists())
+
+    def test_bulk_create_unsupported_content_type(self):
+        response = self.client.post(reverse('bulk_create_appointments'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        response = self.client.post(reverse('bulk_create_appointments'), "a\n", content_type='text/csv; charset=klingon')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_bulk_create_accepts_content_type_parameters(self):
+        body = '{"customer_name": "Lee", "customer_phone": "555-0004", "address": "4 Fourth St", "scheduled_time": "2025-07-02T12:00:00Z"}\n'
+        response = self.client.post(reverse('bulk_create_appointments'), body, content_type='application/x-ndjson; charset=utf-8')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_export_round_trip(self):
+        Appointment.objects.create(
+            owner=self.user,
+            customer_name="Pat",
+            customer_phone="555-0007",
+            address="7 Seventh St",
+            scheduled_time="2025-07-03T09:00:00Z"
+        )
+        response = self.client.get(reverse('export_appointments'), {'type': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"scheduled_time": "2025-07-03T09:00:00Z"', lines[0])
+
+        response = self.client.get(reverse('export_appointments'))
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertTrue(rows[0].startswith("id,customer_name"))
+        self.assertIn("Pat", rows[1])
+
+
+
+class RecurrenceTests(SimpleTestCase):
+
+    def dt(self, year, month, day, hour=9):
+        return datetime(year, month, day, hour, tzinfo=timezone.utc)
+
+    def test_nth_weekday(self):
+        self.assertEqual(nth_weekday(2025, 6, 0, 1), 2)   # first Monday
+        self.assertEqual(nth_weekday(2025, 6, 0, -1), 30)  # last Monday
+        self.assertIsNone(nth_weekday(2025, 6, 2, 5))      # no fifth Wednesday
+
+    def test_first_monday_window_jumps_ahead(self):
+        occurrences = list(iter_occurrences(
+            self.dt(2025, 1, 6), MONTHLY,
+            window_start=self.dt(2026, 1, 1, 0), window_end=self.dt(2026, 4, 1, 0),
+            by_weekday=0, by_set_pos=1,
+        ))
+        self.assertEqual(occurrences, [self.dt(2026, 1, 5), self.dt(2026, 2, 2), self.dt(2026, 3, 2)])
+
+    def test_weekly_interval_and_until(self):
+        occurrences = list(iter_occurrences(
+            self.dt(2025, 1, 6), WEEKLY, interval=2,
+            window_start=self.dt(2025, 3, 1, 0), window_end=self.dt(2025, 4, 1, 0),
+            until=self.dt(2025, 3, 17),
+        ))
+        self.assertEqual(occurrences, [self.dt(2025, 3, 3), self.dt(2025, 3, 17)])
+
+    def test_monthly_by_day_skips_short_months(self):
+        occurrences = list(iter_occurrences(self.dt(2025, 1, 31), MONTHLY, window_end=self.dt(2025, 6, 1, 0)))
+        self.assertEqual(occurrences, [self.dt(2025, 1, 31), self.dt(2025, 3, 31), self.dt(2025, 5, 31)])
+
+
+class RecurringSeriesAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        response = self.client.post(reverse('create_series'), {
+            "customer_name": "Quinn",
+            "customer_phone": "555-0100",
+            "address": "9 Ninth St",
+            "dtstart": "2025-01-06T09:00:00Z",
+            "freq": "monthly",
+            "by_weekday": 0,
+            "by_set_pos": 1,
+            "count": 24,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.series = RecurringSeries.objects.get(pk=response.data['id'])
+
+    def occurrences(self, start, end):
+        response = self.client.get(reverse('list_occurrences'), {'from': start, 'to': end})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_count_sets_last_occurrence(self):
+        self.assertEqual(self.series.last_occurrence.isoformat(), "2026-12-07T09:00:00+00:00")
+        self.assertEqual(self.occurrences("2027-01-01T00:00:00Z", "2027-03-01T00:00:00Z"), [])
+
+    def test_list_occurrences_for_window(self):
+        rows = self.occurrences("2026-06-01T00:00:00Z", "2026-07-01T00:00:00Z")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['scheduled_time'], "2026-06-01T09:00:00Z")
+        self.assertEqual(rows[0]['end_time'], "2026-06-01T10:00:00Z")
+        self.assertIsNone(rows[0]['appointment'])
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_cancel_and_override_occurrences(self):
+        url = reverse('create_series_exception', kwargs={'pk': self.series.pk})
+        response = self.client.post(url, {'occurrence_time': "2025-02-03T09:00:00Z", 'cancel': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, {'occurrence_time': "2025-03-03T09:00:00Z", 'scheduled_time': "2025-03-03T13:00:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        rows = self.occurrences("2025-02-01T00:00:00Z", "2025-04-01T00:00:00Z")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['scheduled_time'], "2025-03-03T13:00:00Z")
+        self.assertEqual(rows[0]['appointment'], response.data['id'])
+
+    def test_overrides_load_their_service_in_the_same_query(self):
+        url = reverse('create_series_exception', kwargs={'pk': self.series.pk})
+        for day in ("2025-02-03", "2025-03-03", "2025-04-07", "2025-05-05"):
+            response = self.client.post(url, {
+                'occurrence_time': f"{day}T09:00:00Z", 'scheduled_time': f"{day}T13:00:00Z",
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        service = Service.objects.create(user=self.user, name="Leak Repair", duration_minutes=90)
+        Appointment.objects.filter(series=self.series).update(service=service)
+
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Series, cancellations and overrides.
+        with self.assertNumQueries(3):
+            rows = expand_series(self.user, start, start + timedelta(days=180))
+        self.assertEqual([row['service'] for row in rows if row['appointment']], [service.pk] * 4)
+
+    def test_bookings_cannot_overlap_occurrences(self):
+        booking = {"customer_name": "Rae", "customer_phone": "555-0101", "address": "1 First St"}
+        response = self.client.post(reverse('create_appointment'), {**booking, "scheduled_time": "2025-02-03T09:00:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['conflicts'], [])
+        self.assertEqual(response.data['series_conflicts'], [{'series': self.series.pk, 'occurrence_time': "2025-02-03T09:00:00Z"}])
+
+        # Moving an occurrence does not collide with the occurrence it replaces
+        url = reverse('create_series_exception', kwargs={'pk': self.series.pk})
+        response = self.client.post(url, {'occurrence_time': "2025-02-03T09:00:00Z", 'scheduled_time': "2025-02-03T09:30:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, {'occurrence_time': "2025-03-03T09:00:00Z", 'cancel': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse('create_appointment'), {**booking, "scheduled_time": "2025-03-03T09:00:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_series_cannot_overlap_bookings(self):
+        series = {
+            "customer_name": "Rae", "customer_phone": "555-0101", "address": "1 First St",
+            "dtstart": "2025-01-06T09:30:00Z", "freq": "weekly", "count": 5,
+        }
+        response = self.client.post(reverse('create_series'), series, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['conflict_count'], 2)
+        self.assertEqual(response.data['conflicts'], ["2025-01-06T09:30:00Z", "2025-02-03T09:30:00Z"])
+        response = self.client.post(reverse('create_series'), {**series, "dtstart": "2025-01-06T10:00:00Z"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_exception_must_match_an_occurrence(self):
+        url = reverse('create_series_exception', kwargs={'pk': self.series.pk})
+        response = self.client.post(url, {'occurrence_time': "2025-02-04T09:00:00Z", 'cancel': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_impossible_and_naive_datetimes(self):
+        url = reverse('list_occurrences')
+        response = self.client.get(url, {'from': "2025-02-30T00:00:00Z", 'to': "2025-03-01T00:00:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'from': "2025-02-01T00:00:00", 'to': "2025-03-01T00:00:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+        url = reverse('create_series_exception', kwargs={'pk': self.series.pk})
+        response = self.client.post(url, {'occurrence_time': "2025-02-30T09:00:00Z", 'cancel': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {'occurrence_time': "2025-02-03T09:00:00", 'cancel': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_series_rule(self):
+        response = self.client.post(reverse('create_series'), {
+            "customer_name": "Quinn",
+            "customer_phone": "555-0100",
+            "address": "9 Ninth St",
+            "dtstart": "2025-01-06T09:00:00Z",
+            "freq": "weekly",
+            "by_weekday": 0,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('by_weekday', response.data)
+
+    def test_series_length_is_bounded(self):
+        rule = {
+            "customer_name": "Quinn",
+            "customer_phone": "555-0100",
+            "address": "9 Ninth St",
+            "dtstart": "2025-01-06T09:00:00Z",
+        }
+        for data, field in (
+            ({"freq": "daily", "count": 3000000}, 'count'),
+            ({"freq": "daily", "interval": 100}, 'interval'),
+            # Within both caps, but the last occurrence lands after year 9999
+            ({"freq": "monthly", "interval": 99, "count": 5000}, 'count'),
+        ):
+            response = self.client.post(reverse('create_series'), {**rule, **data}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(field, response.data)
+        self.assertEqual(RecurringSeries.objects.count(), 1)
+
+
+
+class AppointmentOwnershipAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.rival = User.objects.create_user(username="rival", password="pass1234")
+        self.rival_service = Service.objects.create(user=self.rival, name="Drain", duration_minutes=60)
+        self.theirs = Appointment.objects.create(
+            owner=self.rival,
+            customer_name="Uma",
+            customer_phone="555-0400",
+            address="12 Twelfth St",
+            scheduled_time="2025-06-01T09:00:00Z"
+        )
+        self.payload = {
+            "customer_name": "Vic",
+            "customer_phone": "555-0401",
+            "address": "13 Thirteenth St",
+            "scheduled_time": "2025-06-01T09:00:00Z",
+        }
+
+    def test_other_owners_appointments_are_invisible(self):
+        response = self.client.get(reverse('list_appointments'))
+        self.assertEqual(response.data['results'], [])
+        for name, method in (('get_appointment_details', 'get'), ('update_appointment', 'patch'), ('delete_appointment', 'delete')):
+            response = getattr(self.client, method)(reverse(name, kwargs={'pk': self.theirs.pk}), {}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Appointment.objects.filter(pk=self.theirs.pk).exists())
+
+    def test_conflicts_are_per_owner(self):
+        response = self.client.post(reverse('create_appointment'), self.payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['owner'], self.user.pk)
+
+    def test_other_owners_service_rejected(self):
+        data = dict(self.payload, service=self.rival_service.pk)
+        response = self.client.post(reverse('create_appointment'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('service', response.data)
+
+    def test_requires_auth(self):
+        self.client.credentials()
+        response = self.client.get(reverse('list_appointments'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+
+@mock.patch('appointments.sync.SYNC_OVERLAP', timedelta(0))
+class SyncAPITests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tech", password="pass1234")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+        self.first = Appointment.objects.create(
+            owner=self.user,
+            customer_name="Sam",
+            customer_phone="555-0300",
+            address="10 Tenth St",
+            scheduled_time="2025-06-01T09:00:00Z"
+        )
+        self.second = Appointment.objects.create(
+            owner=self.user,
+            customer_name="Tia",
+            customer_phone="555-0301",
+            address="11 Eleventh St",
+            scheduled_time="2025-06-01T11:00:00Z"
+        )
+
+    def sync(self, cursor=None):
+        params = {'cursor': cursor} if cursor else {}
+        response = self.client.get(reverse('sync'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_is_full_snapshot(self):
+        data = self.sync()
+        self.assertTrue(data['reset'])
+        self.assertFalse(data['has_more'])
+        self.assertEqual({row['id'] for row in data['appointments']['upserted']}, {self.first.pk, self.second.pk})
+        self.assertEqual(data['services'], [])
+        self.assertEqual(data['work_hours'], [])
+
+    def test_incremental_sync_returns_only_changes(self):
+        cursor = self.sync()['cursor']
+        self.client.patch(reverse('update_appointment', kwargs={'pk': self.first.pk}), {'description': 'Bring parts'}, format='json')
+        self.client.delete(reverse('delete_appointment', kwargs={'pk': self.second.pk}))
+        self.client.post("/services/", {"name": "Drain", "duration_minutes": 30}, format="json")
+
+        data = self.sync(cursor)
+        self.assertFalse(data['reset'])
+        self.assertEqual([row['id'] for row in data['appointments']['upserted']], [self.first.pk])
+        self.assertEqual(data['appointments']['upserted'][0]['description'], 'Bring parts')
+        self.assertEqual(data['appointments']['deleted'], [self.second.pk])
+        self.assertEqual(len(data['services']), 1)
+        self.assertIsNone(data['work_hours'])
+
+        data = self.sync(data['cursor'])
+        self.assertEqual(data['appointments']['upserted'], [])
+        self.assertIsNone(data['services'])
+
+    @mock.patch('appointments.sync.SYNC_PAGE_SIZE', 1)
+    def test_sync_pages_through_changes(self):
+        data = self.sync()
+        self.assertTrue(data['has_more'])
+        seen = [row['id'] for row in data['appointments']['upserted']]
+        data = self.sync(data['cursor'])
+        seen += [row['id'] for row in data['appointments']['upserted']]
+        self.assertEqual(seen, [self.first.pk, self.second.pk])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('sync'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_without_timezone_is_invalid(self):
+        naive = encode_cursor(datetime(2025, 6, 1, 9, 0), 0, 0, 0)
+        response = self.client.get(reverse('sync'), {'cursor': naive})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deleting_owner_leaves_no_tombstones(self):
+        other = User.objects.create_user(username="other", password="pass1234")
+        Appointment.objects.create(
+            owner=other, customer_name="Uma", customer_phone="555-0302",
+            address="12 Twelfth St", scheduled_time="2025-06-01T09:00:00Z",
+        )
+        self.user.delete()
+        User.objects.filter(pk=other.pk).delete()
+        connection.check_constraints()
+        self.assertFalse(AppointmentTombstone.objects.exists())
+        self.assertFalse(Appointment.objects.exists())
+
+
+
+class RouteEngineTests(SimpleTestCase):
+
+    def test_distance_matrix(self):
+        dist = distance_matrix([(0, 0), (0, 1), (1, 0)])
+        self.assertAlmostEqual(dist[0, 1], 111.19, places=1)
+        self.assertAlmostEqual(dist[1, 0], dist[0, 1])
+        self.assertEqual(dist[2, 2], 0)
+
+    def test_order_stops_untangles_route(self):
+        # Points along a line, shuffled; the best open route walks the line.
+        coordinates = [(0, x / 100) for x in (5, 1, 9, 3, 7, 0, 2, 8, 4, 6)]
+        dist = distance_matrix(coordinates)
+        order, padded = order_stops(dist, origin=dist[5])
+        self.assertEqual([coordinates[stop][1] for stop in order], sorted(c[1] for c in coordinates))
+
+    def test_two_opt_beats_nearest_neighbour_alone(self):
+        rng = random.Random(3)
+        coordinates = [(rng.random(), rng.random()) for _ in range(60)]
+        dist = distance_matrix(coordinates)
+        order, padded = order_stops(dist)
+        n = len(dist)
+        self.assertEqual(sorted(order), list(range(n)))
+        route = [n] + order + [n + 1]
+        self.assertLessEqual(route_length(padded, route), route_length(padded, nearest_neighbour(padded, n, n + 1)))
+
+    def test_lay_out_respects_windows(self):
+        start = datetime(2025, 6, 2, 9, tzinfo=timezone.utc)
+        windows = [(start, start + timedelta(hours=3)), (start + timedelta(hours=4), start + timedelta(hours=6))]
+        dist = distance_matrix([(0, 0), (0, 0.1), (0, 0.2)])
+        durations = [timedelta(hours=2), timedelta(hours=2), timedelta(hours=3)]
+        placed, unplaced = lay_out([0, 1, 2], dist, durations, windows, speed_kmh=60, start=0)
+        self.assertEqual([stop for stop, *_ in placed], [0, 1])
+        self.assertEqual(placed[1][2], start + timedelta(hours=4))  # waits out the break
+        self.assertEqual(unplaced, [2])
+
+
+class RoutePlanAPITests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        WorkHour.objects.create(user=self.user, day="monday", start_time="00:00", end_time="23:59")
+        start = datetime(2025, 6, 2, 0, tzinfo=timezone.utc)
+        Appointment.objects.bulk_create([
+            Appointment(
+                owner=self.user,
+                customer_name=f"Stop {i}",
+                customer_phone="555-0500",
+                address=f"{i} Route Rd",
+                scheduled_time=start + timedelta(minutes=10 * i),
+                end_time=start + timedelta(minutes=10 * i + 60),
+            )
+            for i in range(60)
+        ])
+
+    def test_plan_route(self):
+        url = reverse('plan_route')
+        with self.settings(ROUTE_SPEED_KMH=600):
+            response = self.client.get(url, {'date': '2025-06-02', 'origin': '1 Depot Way'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stops = response.data['stops']
+        self.assertEqual(len(stops) + len(response.data['unplaced']), 60)
+        self.assertGreater(len(stops), 15)
+        for earlier, later in zip(stops, stops[1:]):
+            self.assertLessEqual(earlier['end'], later['start'])
+        # Every address (and the origin) is geocoded once and then reused
+        self.assertEqual(GeocodedAddress.objects.count(), 61)
+        with self.assertNumQueries(3):
+            self.client.get(url, {'date': '2025-06-02', 'origin': '1 Depot Way'})
+
+    def test_plan_route_invalid_date(self):
+        response = self.client.get(reverse('plan_route'), {'date': 'monday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+
+class AssignmentEngineTests(SimpleTestCase):
+
+    def test_occupy_and_release_merge_gaps(self):
+        calendar = TechnicianCalendar(1, [(0, 100), (200, 300)])
+        calendar.occupy('a', 20, 50)
+        calendar.occupy('b', 200, 300)
+        self.assertEqual(list(zip(calendar.starts, calendar.ends)), [(0, 20), (50, 100)])
+        calendar.release('a')
+        calendar.release('b')
+        self.assertEqual(list(zip(calendar.starts, calendar.ends)), [(0, 100), (200, 300)])
+
+    def test_best_fit_prefers_tightest_gap(self):
+        calendar = TechnicianCalendar(1, [(0, 100), (200, 240), (300, 400)])
+        self.assertEqual(calendar.best_fit(30, 0, 1000), (10, 200))
+        self.assertEqual(calendar.best_fit(30, 350, 1000), (70, 350))
+        self.assertIsNone(calendar.best_fit(30, 380, 1000))
+
+    def test_relocation_makes_room(self):
+        calendars = {1: TechnicianCalendar(1, [(0, 100)]), 2: TechnicianCalendar(2, [(0, 100)])}
+        jobs = {
+            'a': Job('a', {1: 30, 2: 30}, 0, 100),
+            'c': Job('c', {1: 50}, 0, 100),
+        }
+        placements = {'a': calendars[1]}
+        calendars[1].occupy('a', 30, 60)
+        self.assertTrue(insert_by_relocation(jobs['c'], jobs, calendars, placements, deadline=float('inf')))
+        self.assertIn('c', calendars[1].jobs)
+        self.assertIn('a', placements['a'].jobs)
+
+    def test_assign_respects_eligibility(self):
+        calendars = {1: TechnicianCalendar(1, [(0, 60)]), 2: TechnicianCalendar(2, [(0, 60)])}
+        jobs = [Job(0, {1: 60}, 0, 60), Job(1, {1: 30, 2: 30}, 0, 60), Job(2, {}, 0, 60)]
+        assignments, unassigned = assign(jobs, calendars)
+        self.assertEqual(assignments, {0: (1, 0, 60), 1: (2, 0, 30)})
+        self.assertEqual(unassigned, [2])
+
+
+class AssignJobsAPITests(APITestCase):
+
+    def setUp(self):
+        self.dispatcher = User.objects.create_user(username="dispatch", password="pass1234", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.dispatcher).access_token))
+        self.technicians = []
+        for name, minutes in (("ann", 60), ("ben", 120)):
+            technician = User.objects.create_user(username=name, password="pass1234")
+            WorkHour.objects.create(user=technician, day="monday", start_time="09:00", end_time="12:00")
+            Service.objects.create(user=technician, name="Drain", duration_minutes=minutes)
+            self.technicians.append(technician)
+        self.job = {"customer_name": "Wes", "customer_phone": "555-0600", "address": "14 Fourteenth St", "service": "drain"}
+
+    def test_assign_jobs_commit(self):
+        response = self.client.post(reverse('assign_jobs'), {
+            "start": "2025-06-02",
+            "end": "2025-06-02",
+            "jobs": [self.job] * 5,
+            "commit": True,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # ann fits three one-hour jobs, ben one two-hour job
+        self.assertEqual(len(response.data['assignments']), 4)
+        self.assertEqual(len(response.data['unassigned']), 1)
+        self.assertEqual(response.data['capacity_minutes'], 360)
+        self.assertEqual(response.data['filled_minutes'], 300)
+        ann, ben = self.technicians
+        self.assertEqual(Appointment.objects.filter(owner=ann).count(), 3)
+        self.assertEqual(Appointment.objects.filter(owner=ben).count(), 1)
+        self.assertTrue(all(row['appointment'] for row in response.data['assignments']))
+
+    def test_assign_jobs_dry_run(self):
+        response = self.client.post(reverse('assign_jobs'), {
+            "start": "2025-06-02",
+            "end": "2025-06-02",
+            "technicians": [self.technicians[1].pk],
+            "jobs": [self.job],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['assignments'][0]['technician'], self.technicians[1].pk)
+        self.assertEqual(response.data['assignments'][0]['scheduled_time'], "2025-06-02T09:00:00Z")
+        self.assertFalse(Appointment.objects.exists())
+
+    def test_assign_jobs_requires_staff(self):
+        technician = self.technicians[0]
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(technician).access_token))
+        response = self.client.post(reverse('assign_jobs'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ReminderTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def book(self, starts_in):
+        response = self.client.post(reverse('create_appointment'), {
+            "customer_name": "Rita",
+            "customer_phone": "555-0700",
+            "address": "1 Reminder Rd",
+            "scheduled_time": (self.now + starts_in).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Appointment.objects.get(pk=response.data['id'])
+
+    def test_reminder_follows_scheduled_time(self):
+        appointment = self.book(timedelta(days=3))
+        self.assertEqual(appointment.reminder.due_at, appointment.scheduled_time - timedelta(hours=24))
+        self.assertFalse(Reminder.objects.filter(appointment=self.book(timedelta(hours=2))).exists())
+
+        Reminder.objects.update(sent_at=self.now)
+        new_time = self.now + timedelta(days=5)
+        response = self.client.patch(reverse('update_appointment', kwargs={'pk': appointment.pk}), {
+            "scheduled_time": new_time.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        appointment.reminder.refresh_from_db()
+        self.assertEqual(appointment.reminder.due_at, new_time - timedelta(hours=24))
+        self.assertIsNone(appointment.reminder.sent_at)
+
+        self.client.patch(reverse('update_appointment', kwargs={'pk': appointment.pk}), {
+            "scheduled_time": (self.now + timedelta(hours=1)).isoformat(),
+        }, format='json')
+        self.assertFalse(Reminder.objects.exists())
+
+    def test_send_due_reminders(self):
+        due = self.book(timedelta(days=2))
+        failing = self.book(timedelta(days=3))
+        started = self.book(timedelta(days=4))
+        later = self.book(timedelta(days=5))
+        Reminder.objects.filter(appointment__in=[due, failing, started]).update(due_at=self.now - timedelta(minutes=1))
+        Appointment.objects.filter(pk=started.pk).update(scheduled_time=self.now - timedelta(minutes=5))
+        Appointment.objects.filter(pk=failing.pk).update(customer_phone='555-FAIL')
+
+        def send_sms(phone, message):
+            if phone == '555-FAIL':
+                raise ConnectionError
+            sent.append((phone, message))
+
+        sent = []
+        with mock.patch('appointments.notifications.LogNotifier.send_sms', side_effect=send_sms), \
+                self.assertLogs('appointments.reminders', 'ERROR'):
+            self.assertEqual(send_due_reminders(), 3)
+        when = due.scheduled_time.strftime('%a %d %b at %H:%M')
+        self.assertEqual(sent, [('555-0700', f'Hi Rita, a reminder that your appointment is on {when}.')])
+        self.assertIsNotNone(Reminder.objects.get(appointment=due).sent_at)
+        self.assertIsNotNone(Reminder.objects.get(appointment=started).sent_at)
+        retry = Reminder.objects.get(appointment=failing)
+        self.assertIsNone(retry.sent_at)
+        self.assertGreater(retry.due_at, self.now)
+        self.assertIsNone(Reminder.objects.get(appointment=later).sent_at)
+        self.assertEqual(send_due_reminders(), 0)
+
+
+class SearchAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        start = datetime(2025, 6, 2, 9, tzinfo=timezone.utc)
+        rows = [
+            ("Maria Lopez", "(555) 010-4477", "12 Harbor St", "Kitchen sink"),
+            ("Tom Harbor", "555-0200", "9 Elm St", "Water heater"),
+            ("Ann Smith", "555-0300", "40 Elm St", "Leak reported by Maria"),
+        ]
+        for i, (name, phone, address, description) in enumerate(rows):
+            Appointment.objects.create(
+                owner=self.user, customer_name=name, customer_phone=phone, address=address,
+                description=description, scheduled_time=start + timedelta(hours=2 * i),
+            )
+        rival = User.objects.create_user(username="rival", password="pass1234")
+        Appointment.objects.create(
+            owner=rival, customer_name="Maria Rival", customer_phone="555-0100", address="1 Other St",
+            scheduled_time=start,
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('search_appointments'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def names(self, **params):
+        return [row['customer_name'] for row in self.search(**params)['results']]
+
+    def test_ranks_name_matches_above_description_matches(self):
+        self.assertEqual(self.names(q="mari"), ["Maria Lopez", "Ann Smith"])
+        self.assertEqual(self.names(q="harbor"), ["Tom Harbor", "Maria Lopez"])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.names(q="elm heater"), ["Tom Harbor"])
+        self.assertEqual(self.names(q="elm kitchen"), [])
+
+    def test_phone_fragment_ignores_separators(self):
+        self.assertEqual(self.names(q="0104477"), ["Maria Lopez"])
+        self.assertEqual(self.names(q="010-44"), ["Maria Lopez"])
+
+    def test_pagination(self):
+        first = self.search(q="st", limit=2)
+        self.assertEqual(len(first['results']), 2)
+        second = self.search(q="st", limit=2, cursor=first['next_cursor'])
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next_cursor'])
+        ids = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_invalid_queries(self):
+        for params in ({}, {'q': '  '}, {'q': '!!'}, {'q': 'elm', 'cursor': 'nope'}):
+            response = self.client.get(reverse('search_appointments'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
+
+
+class CalendarAPITests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="plumber", password="pass1234")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.service = Service.objects.create(user=self.user, name="Repair", duration_minutes=90)
+        WorkHour.objects.create(user=self.user, day="monday", start_time=time(8), end_time=time(12))
+        WorkHour.objects.create(user=self.user, day="monday", start_time=time(11), end_time=time(16))
+
+    def book(self, scheduled_time, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('create_appointment'), {
+                "customer_name": "Cal",
+                "customer_phone": "555-0800",
+                "address": "1 Calendar Ct",
+                "scheduled_time": scheduled_time.isoformat(),
+                **extra,
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def rollups(self):
+        return sorted(DailyRollup.objects.values_list('day', 'appointment_count', 'booked_minutes'))
+
+    def test_rollups_follow_writes(self):
+        first = self.book(datetime(2026, 3, 2, 9, tzinfo=timezone.utc), service=self.service.pk)
+        self.book(datetime(2026, 3, 2, 14, tzinfo=timezone.utc))
+        self.assertEqual(self.rollups(), [(date(2026, 3, 2), 2, 150)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('update_appointment', kwargs={'pk': first}), {
+                "scheduled_time": datetime(2026, 3, 3, 9, tzinfo=timezone.utc).isoformat(),
+            }, format='json')
+        self.assertEqual(self.rollups(), [(date(2026, 3, 2), 1, 60), (date(2026, 3, 3), 1, 90)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_appointment', kwargs={'pk': first}))
+        self.assertEqual(self.rollups(), [(date(2026, 3, 2), 1, 60)])
+
+    def test_bulk_import_and_rebuild(self):
+        body = "\n".join(
+            f'{{"customer_name": "Bulk", "customer_phone": "555", "address": "2 Bulk Rd", '
+            f'"scheduled_time": "2026-03-0{day}T10:00:00Z"}}'
+            for day in (4, 4, 5)
+        ).replace('04T10', '04T12', 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.generic('POST', reverse('bulk_create_appointments'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        expected = [(date(2026, 3, 4), 2, 120), (date(2026, 3, 5), 1, 60)]
+        self.assertEqual(self.rollups(), expected)
+
+        DailyRollup.objects.all().delete()
+        self.assertEqual(rebuild_rollups(), 2)
+        self.assertEqual(self.rollups(), expected)
+
+    def test_month_against_capacity(self):
+        self.book(datetime(2026, 3, 2, 9, tzinfo=timezone.utc), service=self.service.pk)
+        # The rollups and the work hours; the user comes from the auth cache.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('calendar'), {'month': '2026-03'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['start'], response.data['end']), ('2026-03-01', '2026-03-31'))
+        [calendar] = response.data['technicians']
+        self.assertEqual(calendar['technician'], self.user.pk)
+        self.assertEqual(len(calendar['days']), 31)
+        self.assertEqual(calendar['days'][1], {
+            'date': '2026-03-02', 'appointments': 1, 'booked_minutes': 90, 'capacity_minutes': 480, 'utilization': 0.188,
+        })
+        self.assertEqual(calendar['days'][2]['capacity_minutes'], 0)
+        self.assertIsNone(calendar['days'][2]['utilization'])
+
+    def test_quarter_and_staff_view(self):
+        self.book(datetime(2026, 12, 28, 9, tzinfo=timezone.utc))
+        other = User.objects.create_user(username="other", password="pass1234")
+        WorkHour.objects.create(user=other, day="monday", start_time=time(9), end_time=time(17))
+        response = self.client.get(reverse('calendar'), {'quarter': '2026-Q4', 'technicians': other.pk})
+        self.assertEqual((response.data['start'], response.data['end']), ('2026-10-01', '2026-12-31'))
+        self.assertEqual([row['technician'] for row in response.data['technicians']], [self.user.pk])
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('calendar'), {'quarter': '2026-Q4'})
+        self.assertEqual([row['technician'] for row in response.data['technicians']], [self.user.pk, other.pk])
+        self.assertEqual(response.data['technicians'][0]['days'][-4]['appointments'], 1)
+
+    def test_invalid_periods(self):
+        for params in ({'month': '2026-13'}, {'month': 'march'}, {'quarter': '2026-Q5'}, {'month': '2026-03', 'quarter': '2026-Q1'}):
+            response = self.client.get(reverse('calendar'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
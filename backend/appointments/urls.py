@@ -1,10 +1,25 @@
 from django.urls import path
-from .views import create_appointment, list_appointments, delete_appointment, update_appointment, get_appointment_details
+from .views import (
+    create_appointment, list_appointments, delete_appointment, update_appointment, get_appointment_details, list_available_slots,
+    bulk_create_appointments, export_appointments, create_series, list_occurrences, create_series_exception,
+    plan_route, assign_jobs, search_appointments, sync, get_calendar,
+)
 
 urlpatterns = [
     path('appointments/', list_appointments, name='list_appointments'),
+    path('appointments/search/', search_appointments, name='search_appointments'),
+    path('appointments/slots/', list_available_slots, name='list_available_slots'),
+    path('appointments/route/', plan_route, name='plan_route'),
+    path('appointments/assign/', assign_jobs, name='assign_jobs'),
     path('appointments/create/', create_appointment, name='create_appointment'),
+    path('appointments/bulk/', bulk_create_appointments, name='bulk_create_appointments'),
+    path('appointments/export/', export_appointments, name='export_appointments'),
     path('appointments/<int:pk>/', delete_appointment, name='delete_appointment'),
     path('appointments/<int:pk>/update/', update_appointment, name='update_appointment'),
     path('appointments/<int:pk>/details/', get_appointment_details, name='get_appointment_details'),
+    path('appointments/series/', create_series, name='create_series'),
+    path('appointments/series/<int:pk>/exceptions/', create_series_exception, name='create_series_exception'),
+    path('appointments/occurrences/', list_occurrences, name='list_occurrences'),
+    path('sync/', sync, name='sync'),
+    path('calendar/', get_calendar, name='calendar'),
 ]
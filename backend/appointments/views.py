@@ -1,52 +1,474 @@
-from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework import serializers, status
+import codecs
+from datetime import datetime, time, timedelta
+from operator import itemgetter
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from .models import Appointment
-from .serializers import AppointmentSerializer
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_header_parameters
+from backend.asyncapi import JSONResponse, async_api_view
+from backend.renderers import fast_renderers
+from backend.rows import row_mapper
+from users.versions import APPOINTMENTS, bump_version, conditional_get
+from services.models import Service
+from work_hours.cache import get_weekly_hours
+from .bulk import (
+    CSV_CONTENT_TYPE, IMPORT_CONTENT_TYPES, MAX_REPORTED_ERRORS, NDJSON_CONTENT_TYPE,
+    export_csv, export_ndjson, import_appointments, iter_upload_rows,
+)
+from .conflicts import busy_intervals, find_conflicts, find_series_conflicts, lock_schedule
+from .dispatch import auto_assign, technician_ids
+from .geocoding import geocode_addresses
+from .models import Appointment, RecurringSeries, SeriesException
+from .occurrences import SERIES_FIELDS, expand_series, is_occurrence
+from .pagination import apaginate_keyset, paginate_keyset, paginate_ranked, parse_page_size
+from .reminders import schedule_reminders
+from .rollups import build_calendar, parse_period
+from .routing import distance_matrix, lay_out, order_stops
+from .search import ranked_matches
+from .serializers import AppointmentSerializer, AssignmentRequestSerializer, RecurringSeriesSerializer
+from .slots import available_slots, working_windows
+from .sync import build_sync
+from .tasks import geocode_address, send_confirmation
+
+MAX_SLOT_RANGE_DAYS = 180
+MAX_OCCURRENCE_RANGE_DAYS = 366
+MAX_ROUTE_STOPS = 250
+
+def parse_request_datetime(value):
+    """``value`` as an aware datetime, or ``None`` if it is not a valid one; naive values are in ``TIME_ZONE``."""
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:  # well-formed but impossible, e.g. February 30th
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+def filter_window(appointments, params):
+    """Apply the optional ``from``/``to`` query parameters to ``appointments``."""
+    for param, lookup in (('from', 'scheduled_time__gte'), ('to', 'scheduled_time__lt')):
+        value = params.get(param)
+        if value is None:
+            continue
+        bound = parse_request_datetime(value)
+        if bound is None:
+            raise ValueError(f'Invalid {param} datetime')
+        appointments = appointments.filter(**{lookup: bound})
+    return appointments
+
+def check_conflicts(serializer, owner, instance=None, occurrence=None):
+    # Must run inside the transaction that saves the serializer. ``occurrence``
+    # is the (series_id, occurrence_time) a new override replaces.
+    data = serializer.validated_data
+    candidate = Appointment(
+        scheduled_time=data.get('scheduled_time', instance.scheduled_time if instance else None),
+        service=data.get('service', instance.service if instance else None),
+    )
+    end_time = candidate.compute_end_time()
+    lock_schedule(owner.pk)
+    conflicts, occurrences = find_conflicts(
+        owner.pk, candidate.scheduled_time, end_time,
+        exclude_pk=instance.pk if instance else None, exclude_occurrence=occurrence,
+    )
+    if conflicts or occurrences:
+        datetime_field = serializers.DateTimeField()
+        return Response(
+            {
+                'error': 'Appointment overlaps an existing booking',
+                'conflicts': conflicts,
+                'series_conflicts': [
+                    {'series': series_id, 'occurrence_time': datetime_field.to_representation(occurrence_time)}
+                    for series_id, occurrence_time in occurrences
+                ],
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+    return None
 
 @api_view(['POST'])
+@permission_classes([IsAuthenticated])
 def create_appointment(request):
-    serializer = AppointmentSerializer(data=request.data)
+    serializer = AppointmentSerializer(data=request.data, context={'owner': request.user})
     if serializer.is_valid():
-        serializer.save()
+        with transaction.atomic():
+            conflict = check_conflicts(serializer, request.user)
+            if conflict:
+                return conflict
+            appointment = serializer.save(owner=request.user)
+            bump_version(APPOINTMENTS, request.user.pk)
+            schedule_reminders([appointment])
+            send_confirmation.enqueue(appointment_id=appointment.pk)
+            geocode_address.enqueue(address=appointment.address)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes(fast_renderers())
+@conditional_get(APPOINTMENTS)
 def list_appointments(request):
-    appointments = Appointment.objects.all().order_by('-scheduled_time')  # latest first
-    serializer = AppointmentSerializer(appointments, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # Read-only fast path: rows come straight from values_list() tuples
+    mapper = row_mapper(AppointmentSerializer)
+    key = itemgetter(mapper.index('scheduled_time'), mapper.index('id'))
+    try:
+        appointments = filter_window(Appointment.objects.filter(owner=request.user), request.query_params)
+        page_size = parse_page_size(request.query_params.get('limit'))
+        page, next_cursor = paginate_keyset(mapper.values(appointments), request.query_params.get('cursor'), page_size, key)  # latest first
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({'results': mapper.to_rows(page), 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
+
+@async_api_view
+@conditional_get(APPOINTMENTS)
+async def alist_appointments(request):
+    """Async variant of ``list_appointments`` for ASGI deployments."""
+    mapper = row_mapper(AppointmentSerializer)
+    key = itemgetter(mapper.index('scheduled_time'), mapper.index('id'))
+    try:
+        appointments = filter_window(Appointment.objects.filter(owner=request.user), request.GET)
+        page_size = parse_page_size(request.GET.get('limit'))
+        page, next_cursor = await apaginate_keyset(mapper.values(appointments), request.GET.get('cursor'), page_size, key)
+    except ValueError as exc:
+        return JSONResponse({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return JSONResponse({'results': mapper.to_rows(page), 'next_cursor': next_cursor})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes(fast_renderers())
+@conditional_get(APPOINTMENTS)
+def search_appointments(request):
+    q = request.query_params.get('q', '').strip()
+    if not q:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    mapper = row_mapper(AppointmentSerializer)
+    try:
+        matches = ranked_matches(Appointment.objects.filter(owner=request.user), q)
+        page_size = parse_page_size(request.query_params.get('limit'))
+        page, next_cursor = paginate_ranked(mapper.values(matches), request.query_params.get('cursor'), page_size)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({'results': mapper.to_rows(page), 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(APPOINTMENTS)
 def get_appointment_details(request, pk):
     try:
-        appointment = Appointment.objects.get(pk=pk)
+        appointment = Appointment.objects.get(pk=pk, owner=request.user)
     except Appointment.DoesNotExist:
         return Response({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
 
     serializer = AppointmentSerializer(appointment)
     return Response(serializer.data)
 
+@async_api_view
+@conditional_get(APPOINTMENTS)
+async def aget_appointment_details(request, pk):
+    """Async variant of ``get_appointment_details`` for ASGI deployments."""
+    mapper = row_mapper(AppointmentSerializer)
+    row = await mapper.values(Appointment.objects.filter(pk=pk, owner=request.user)).afirst()
+    if row is None:
+        return JSONResponse({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
+    return JSONResponse(mapper.to_rows([row])[0])
+
 @api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
 def delete_appointment(request, pk):
     try:
-        appointment = Appointment.objects.get(pk=pk)
+        appointment = Appointment.objects.get(pk=pk, owner=request.user)
     except Appointment.DoesNotExist:
         return Response({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    appointment.delete()
+    with transaction.atomic():
+        appointment.delete()
+        bump_version(APPOINTMENTS, request.user.pk)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['PUT', 'PATCH'])
+@permission_classes([IsAuthenticated])
 def update_appointment(request, pk):
     try:
-        appointment = Appointment.objects.get(pk=pk)
+        appointment = Appointment.objects.get(pk=pk, owner=request.user)
     except Appointment.DoesNotExist:
         return Response({'error': 'Appointment not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = AppointmentSerializer(appointment, data=request.data, partial=True)  # partial=True allows PATCH
+    serializer = AppointmentSerializer(appointment, data=request.data, partial=True, context={'owner': request.user})  # partial=True allows PATCH
     if serializer.is_valid():
-        serializer.save()
+        with transaction.atomic():
+            conflict = check_conflicts(serializer, request.user, appointment)
+            if conflict:
+                return conflict
+            previous_time = appointment.scheduled_time
+            serializer.save()
+            bump_version(APPOINTMENTS, request.user.pk)
+            if appointment.scheduled_time != previous_time:
+                schedule_reminders([appointment])
+            if 'address' in serializer.validated_data:
+                geocode_address.enqueue(address=appointment.address)
         return Response(serializer.data)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def list_available_slots(request):
+    try:
+        service = Service.objects.get(pk=request.query_params.get('service'), user=request.user)
+    except (Service.DoesNotExist, ValueError, TypeError):
+        return Response({'error': 'Service not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    start_date = parse_date(request.query_params.get('start', ''))
+    end_date = parse_date(request.query_params.get('end', ''))
+    if start_date is None or end_date is None or end_date < start_date:
+        return Response({'error': 'start and end must be dates with start <= end'}, status=status.HTTP_400_BAD_REQUEST)
+    if (end_date - start_date).days >= MAX_SLOT_RANGE_DAYS:
+        return Response({'error': f'Range cannot exceed {MAX_SLOT_RANGE_DAYS} days'}, status=status.HTTP_400_BAD_REQUEST)
+
+    tz = timezone.get_current_timezone()
+    range_start = datetime.combine(start_date, time.min, tz)
+    range_end = datetime.combine(end_date + timedelta(days=1), time.min, tz)
+
+    weekly_hours = get_weekly_hours(request.user.pk)
+
+    slots = available_slots(
+        weekly_hours, busy_intervals(request.user.pk, range_start, range_end), start_date, end_date,
+        timedelta(minutes=service.duration_minutes), tz,
+    )
+    return Response([
+        {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'latest_start': (end - timedelta(minutes=service.duration_minutes)).isoformat(),
+        }
+        for start, end in slots
+    ])
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def plan_route(request):
+    day = parse_date(request.query_params.get('date', ''))
+    if day is None:
+        return Response({'error': 'date must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    tz = timezone.get_current_timezone()
+    day_start = datetime.combine(day, time.min, tz)
+    appointments = list(
+        Appointment.objects.filter(
+            owner=request.user,
+            scheduled_time__gte=day_start,
+            scheduled_time__lt=day_start + timedelta(days=1),
+        ).select_related('service').order_by('scheduled_time', 'id')
+    )
+    if len(appointments) > MAX_ROUTE_STOPS:
+        return Response({'error': f'Cannot plan more than {MAX_ROUTE_STOPS} stops'}, status=status.HTTP_400_BAD_REQUEST)
+
+    origin_address = request.query_params.get('origin')
+    points = geocode_addresses([a.address for a in appointments] + ([origin_address] if origin_address else []))
+    origin = points[origin_address] if origin_address else None
+    if origin_address and origin is None:
+        return Response({'error': 'Could not geocode origin'}, status=status.HTTP_400_BAD_REQUEST)
+
+    located = [a for a in appointments if points[a.address] is not None]
+    coordinates = [points[a.address] for a in located] + ([origin] if origin else [])
+    dist = distance_matrix(coordinates)
+    stops = len(located)
+    order, padded = order_stops(dist[:stops, :stops], dist[stops, :stops] if origin else None)
+
+    windows = working_windows(get_weekly_hours(request.user.pk), day, day, tz)
+    placed, unplaced = lay_out(order, padded, [a.duration for a in located], windows, settings.ROUTE_SPEED_KMH, start=stops)
+    return Response({
+        'date': day.isoformat(),
+        'stops': [
+            {
+                'appointment': located[stop].pk,
+                'customer_name': located[stop].customer_name,
+                'address': located[stop].address,
+                'latitude': points[located[stop].address][0],
+                'longitude': points[located[stop].address][1],
+                'arrival': arrival.isoformat(),
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'drive_km': round(km, 2),
+            }
+            for stop, arrival, start, end, km in placed
+        ],
+        'unplaced': [located[stop].pk for stop in unplaced] + [a.pk for a in appointments if points[a.address] is None],
+        'total_km': round(sum(km for *_, km in placed), 2),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def assign_jobs(request):
+    serializer = AssignmentRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    with transaction.atomic():
+        result = auto_assign(data['jobs'], data['start'], data['end'], data.get('technicians'), data['commit'])
+    return Response(result, status=status.HTTP_201_CREATED if data['commit'] else status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_create_appointments(request):
+    content_type, params = parse_header_parameters(request.content_type)
+    if content_type not in IMPORT_CONTENT_TYPES:
+        return Response(
+            {'error': f"Content-Type must be one of: {', '.join(IMPORT_CONTENT_TYPES)}"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    encoding = params.get('charset', 'utf-8')
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return Response({'error': f'Unknown charset {encoding}'}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    if request.stream is None:
+        return Response({'error': 'Request body is empty'}, status=status.HTTP_400_BAD_REQUEST)
+
+    created, errors = import_appointments(iter_upload_rows(request.stream, content_type, encoding), request.user)
+    if not errors:
+        response_status = status.HTTP_201_CREATED
+    elif created:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_400_BAD_REQUEST
+    return Response(
+        {'created': created, 'error_count': len(errors), 'errors': errors[:MAX_REPORTED_ERRORS]},
+        status=response_status,
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_appointments(request):
+    export_type = request.query_params.get('type', 'csv')
+    appointments = Appointment.objects.filter(owner=request.user).order_by('scheduled_time', 'id')
+    if export_type == 'csv':
+        response = StreamingHttpResponse(export_csv(appointments), content_type=CSV_CONTENT_TYPE)
+        response['Content-Disposition'] = 'attachment; filename="appointments.csv"'
+    elif export_type == 'ndjson':
+        response = StreamingHttpResponse(export_ndjson(appointments), content_type=NDJSON_CONTENT_TYPE)
+    else:
+        return Response({'error': 'type must be csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_series(request):
+    serializer = RecurringSeriesSerializer(data=request.data, context={'owner': request.user})
+    if serializer.is_valid():
+        with transaction.atomic():
+            lock_schedule(request.user.pk)
+            candidate = RecurringSeries(owner=request.user, **serializer.validated_data)
+            candidate.compute_last_occurrence()
+            overlapping = find_series_conflicts(candidate)
+            if overlapping:
+                datetime_field = serializers.DateTimeField()
+                return Response(
+                    {
+                        'error': 'Series overlaps an existing booking',
+                        'conflict_count': len(overlapping),
+                        'conflicts': [datetime_field.to_representation(occurrence) for occurrence in overlapping[:MAX_REPORTED_ERRORS]],
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+            serializer.save(owner=request.user)
+            bump_version(APPOINTMENTS, request.user.pk)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(APPOINTMENTS)
+def list_occurrences(request):
+    window = {}
+    for param in ('from', 'to'):
+        window[param] = parse_request_datetime(request.query_params.get(param, ''))
+        if window[param] is None:
+            return Response({'error': f'Invalid {param} datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    if not timedelta(0) < window['to'] - window['from'] <= timedelta(days=MAX_OCCURRENCE_RANGE_DAYS):
+        return Response(
+            {'error': f'to must be after from and at most {MAX_OCCURRENCE_RANGE_DAYS} days later'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response(expand_series(request.user, window['from'], window['to']))
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_series_exception(request, pk):
+    try:
+        series = RecurringSeries.objects.select_related('service').get(pk=pk, owner=request.user)
+    except RecurringSeries.DoesNotExist:
+        return Response({'error': 'Series not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    occurrence_time = parse_request_datetime(str(request.data.get('occurrence_time', '')))
+    if occurrence_time is None or not is_occurrence(series, occurrence_time):
+        return Response({'occurrence_time': ['Not an occurrence of this series.']}, status=status.HTTP_400_BAD_REQUEST)
+
+    override = Appointment.objects.filter(series=series, occurrence_time=occurrence_time).first()
+    if request.data.get('cancel'):
+        with transaction.atomic():
+            if override is not None:
+                override.delete()
+            SeriesException.objects.get_or_create(series=series, occurrence_time=occurrence_time)
+            bump_version(APPOINTMENTS, request.user.pk)
+        return Response({'series': series.pk, 'occurrence_time': request.data['occurrence_time'], 'cancelled': True}, status=status.HTTP_201_CREATED)
+
+    if override is None:
+        data = {field: getattr(series, field) for field in SERIES_FIELDS}
+        data['service'] = series.service_id
+        data['scheduled_time'] = occurrence_time
+        data.update({key: value for key, value in request.data.items() if key not in ('occurrence_time', 'cancel')})
+        serializer = AppointmentSerializer(data=data, context={'owner': request.user})
+    else:
+        serializer = AppointmentSerializer(override, data=request.data, partial=True, context={'owner': request.user})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    with transaction.atomic():
+        replaced = (series.pk, occurrence_time) if override is None else None
+        conflict = check_conflicts(serializer, request.user, override, occurrence=replaced)
+        if conflict:
+            return conflict
+        serializer.save(owner=request.user, series=series, occurrence_time=occurrence_time)
+        bump_version(APPOINTMENTS, request.user.pk)
+    return Response(serializer.data, status=status.HTTP_201_CREATED if override is None else status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync(request):
+    try:
+        return Response(build_sync(request.user, request.query_params.get('cursor')))
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_calendar(request):
+    try:
+        start, end = parse_period(request.query_params.get('month'), request.query_params.get('quarter'))
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    technicians = [request.user.pk]
+    if request.user.is_staff:
+        requested = request.query_params.get('technicians')
+        try:
+            technicians = technician_ids([int(pk) for pk in requested.split(',')] if requested else None)
+        except ValueError:
+            return Response({'error': 'technicians must be comma-separated ids'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'technicians': build_calendar(technicians, start, end),
+    })
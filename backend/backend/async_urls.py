@@ -0,0 +1,22 @@
+"""
+URL configuration for ASGI deployments (``ASYNC_READ_VIEWS``).
+
+The read endpoints resolve to their native async variants first; every
+other route, and every write on a shared route, is served as in ``urls``.
+"""
+from django.urls import path
+
+from appointments.views import aget_appointment_details, alist_appointments
+from services.views import ServiceListCreateView, ServiceRetrieveUpdateDestroyView, aget_service, alist_services
+from work_hours.views import WorkHourView, aget_work_hours
+from .asyncapi import split_by_method
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('appointments/', alist_appointments, name='list_appointments'),
+    path('appointments/<int:pk>/details/', aget_appointment_details, name='get_appointment_details'),
+    path('services/', split_by_method(alist_services, ServiceListCreateView.as_view()), name='service-list-create'),
+    path('services/<int:pk>/', split_by_method(aget_service, ServiceRetrieveUpdateDestroyView.as_view()), name='service-detail'),
+    path('work_hours/', split_by_method(aget_work_hours, WorkHourView.as_view())),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,238 @@
+"""
+Batched operations across appointments, services and work hours.
+
+A client on a slow link sends one ``POST batch/`` instead of a request per
+action. Every appointment and service the batch names by id is fetched up
+front with one ``in_bulk`` query per resource, the operations then run in
+order inside a single transaction, and change versions, reminders and
+notifications are dealt with once at the end. With ``atomic`` (the default)
+the first failing operation rolls back the whole batch; without it each
+operation runs in its own savepoint and failures only undo themselves.
+"""
+from contextlib import nullcontext
+
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from appointments.models import DEFAULT_APPOINTMENT_MINUTES, Appointment
+from appointments.reminders import schedule_reminders
+from appointments.rollups import retime_appointments
+from appointments.serializers import AppointmentSerializer
+from appointments.tasks import geocode_address, send_confirmation
+from appointments.views import check_conflicts
+from services.models import Service
+from services.serializers import ServiceSerializer
+from users.versions import APPOINTMENTS, SERVICES, bump_version
+from work_hours.cache import get_rows, to_rows
+from work_hours.diff import parse_schedule
+from work_hours.models import WorkHour
+from work_hours.views import clear_schedule, save_schedule
+
+MAX_BATCH_OPERATIONS = 50
+NOT_APPLIED = {'status': status.HTTP_424_FAILED_DEPENDENCY, 'error': 'Not applied because another operation failed'}
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['get', 'create', 'update', 'delete'])
+    resource = serializers.ChoiceField(choices=['appointments', 'services', 'work_hours'])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs['resource'] != 'work_hours' and attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError(f"{attrs['op']} on {attrs['resource']} requires an id")
+        return attrs
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(default=True)
+    operations = BatchOperationSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_OPERATIONS)
+
+
+class OperationFailed(Exception):
+    def __init__(self, status_code, body):
+        super().__init__(status_code, body)
+        self.status_code = status_code
+        self.body = body
+
+
+class Batch:
+    def __init__(self, user):
+        self.user = user
+        self.appointments = {}
+        self.services = {}
+        self.changed = set()
+        self.created = []
+        self.rescheduled = []
+        self.schedule_written = False
+
+    def run(self, operations, atomic):
+        """Execute ``operations``; return per-operation results and whether any failed."""
+        results = []
+        failed = False
+        with transaction.atomic():
+            self.prefetch(operations)
+            for operation in operations:
+                if failed and atomic:
+                    results.append(NOT_APPLIED)
+                    continue
+                try:
+                    with nullcontext() if atomic else transaction.atomic():
+                        status_code, data = self.execute(operation)
+                except OperationFailed as exc:
+                    failed = True
+                    results.append({'status': exc.status_code, **exc.body})
+                else:
+                    results.append({'status': status_code, 'data': data})
+            if failed and atomic:
+                transaction.set_rollback(True)
+                return [result if result['status'] >= 400 else NOT_APPLIED for result in results], True
+            self.finish()
+        return results, failed
+
+    def prefetch(self, operations):
+        ids = {'appointments': set(), 'services': set()}
+        for operation in operations:
+            if 'id' in operation and operation['resource'] in ids:
+                ids[operation['resource']].add(operation['id'])
+        if ids['appointments']:
+            self.appointments = Appointment.objects.filter(owner=self.user).select_related('service').in_bulk(ids['appointments'])
+        if ids['services']:
+            self.services = Service.objects.filter(user=self.user).in_bulk(ids['services'])
+
+    def execute(self, operation):
+        handler = getattr(self, f"{operation['op']}_{operation['resource']}")
+        return handler(operation.get('id'), operation['data'])
+
+    def finish(self):
+        for resource in self.changed:
+            bump_version(resource, self.user.pk)
+        if self.created or self.rescheduled:
+            schedule_reminders(self.created + self.rescheduled)
+        for appointment in self.created:
+            send_confirmation.enqueue(appointment_id=appointment.pk)
+            geocode_address.enqueue(address=appointment.address)
+
+    def lookup(self, instances, pk, label):
+        try:
+            return instances[pk]
+        except KeyError:
+            raise OperationFailed(status.HTTP_404_NOT_FOUND, {'error': f'{label} not found'})
+
+    def save_appointment(self, serializer, instance=None):
+        if not serializer.is_valid():
+            raise OperationFailed(status.HTTP_400_BAD_REQUEST, {'errors': serializer.errors})
+        conflict = check_conflicts(serializer, self.user, instance)
+        if conflict:
+            raise OperationFailed(conflict.status_code, conflict.data)
+        appointment = serializer.save(**({} if instance else {'owner': self.user}))
+        self.appointments[appointment.pk] = appointment
+        self.changed.add(APPOINTMENTS)
+        return appointment
+
+    def get_appointments(self, pk, data):
+        return status.HTTP_200_OK, AppointmentSerializer(self.lookup(self.appointments, pk, 'Appointment')).data
+
+    def create_appointments(self, pk, data):
+        serializer = AppointmentSerializer(data=data, context={'owner': self.user})
+        self.created.append(self.save_appointment(serializer))
+        return status.HTTP_201_CREATED, serializer.data
+
+    def update_appointments(self, pk, data):
+        appointment = self.lookup(self.appointments, pk, 'Appointment')
+        previous_time = appointment.scheduled_time
+        serializer = AppointmentSerializer(appointment, data=data, partial=True, context={'owner': self.user})
+        self.save_appointment(serializer, appointment)
+        if appointment.scheduled_time != previous_time:
+            self.rescheduled.append(appointment)
+        if 'address' in serializer.validated_data:
+            geocode_address.enqueue(address=appointment.address)
+        return status.HTTP_200_OK, serializer.data
+
+    def delete_appointments(self, pk, data):
+        self.lookup(self.appointments, pk, 'Appointment').delete()
+        del self.appointments[pk]
+        self.changed.add(APPOINTMENTS)
+        return status.HTTP_204_NO_CONTENT, None
+
+    def save_service(self, serializer, **kwargs):
+        if not serializer.is_valid():
+            raise OperationFailed(status.HTTP_400_BAD_REQUEST, {'errors': serializer.errors})
+        service = serializer.save(**kwargs)
+        self.services[service.pk] = service
+        self.changed.add(SERVICES)
+        return serializer.data
+
+    def get_services(self, pk, data):
+        return status.HTTP_200_OK, ServiceSerializer(self.lookup(self.services, pk, 'Service')).data
+
+    def create_services(self, pk, data):
+        return status.HTTP_201_CREATED, self.save_service(ServiceSerializer(data=data), user=self.user)
+
+    def retime_service(self, service, minutes, replacement):
+        """Give ``service``'s appointments ``minutes``, in the database and in ``self.appointments``."""
+        if retime_appointments(service.appointments.all(), minutes):
+            self.changed.add(APPOINTMENTS)
+        for appointment in self.appointments.values():
+            if appointment.service_id == service.pk:
+                appointment.service = replacement
+                appointment.compute_end_time()
+
+    def update_services(self, pk, data):
+        service = self.lookup(self.services, pk, 'Service')
+        previous_minutes = service.duration_minutes
+        result = self.save_service(ServiceSerializer(service, data=data, partial=True))
+        if service.duration_minutes != previous_minutes:
+            self.retime_service(service, service.duration_minutes, service)
+        return status.HTTP_200_OK, result
+
+    def delete_services(self, pk, data):
+        service = self.lookup(self.services, pk, 'Service')
+        # As in ServiceRetrieveUpdateDestroyView: SET_NULL skips auto_now and end_time.
+        self.retime_service(service, DEFAULT_APPOINTMENT_MINUTES, None)
+        service.delete()
+        del self.services[pk]
+        self.changed.add(SERVICES)
+        return status.HTTP_204_NO_CONTENT, None
+
+    def get_work_hours(self, pk, data):
+        if not self.schedule_written:
+            return status.HTTP_200_OK, get_rows(self.user.pk)
+        # Not through the cache, which must not see uncommitted rows.
+        schedule = WorkHour.objects.filter(user=self.user).order_by('id').values_list('id', 'day', 'start_time', 'end_time')
+        return status.HTTP_200_OK, to_rows(schedule)
+
+    def create_work_hours(self, pk, data):
+        try:
+            schedule = parse_schedule(data)
+        except ValueError as exc:
+            raise OperationFailed(status.HTTP_400_BAD_REQUEST, {'error': str(exc)})
+        self.schedule_written = True
+        return status.HTTP_201_CREATED, save_schedule(self.user, schedule)
+
+    update_work_hours = create_work_hours
+
+    def delete_work_hours(self, pk, data):
+        self.schedule_written = True
+        if not clear_schedule(self.user):
+            raise OperationFailed(status.HTTP_404_NOT_FOUND, {'error': 'No work hours to delete.'})
+        return status.HTTP_204_NO_CONTENT, None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    serializer = BatchRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    results, failed = Batch(request.user).run(serializer.validated_data['operations'], serializer.validated_data['atomic'])
+    if not failed:
+        response_status = status.HTTP_200_OK
+    elif serializer.validated_data['atomic']:
+        response_status = status.HTTP_400_BAD_REQUEST
+    else:
+        response_status = status.HTTP_207_MULTI_STATUS
+    return Response({'results': results}, status=response_status)
@@ -0,0 +1,145 @@
+"""
+In-process request metrics rendered in the Prometheus text format.
+
+Each worker process keeps its own registry; scrape every worker (or run a
+single-process server) to see the whole picture.
+"""
+import bisect
+import hmac
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    'http_requests_total': ('counter', 'Requests handled.', None),
+    'http_request_duration_seconds': ('histogram', 'Time spent handling a request.', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Size of non-streaming response bodies.', SIZE_BUCKETS),
+    'http_response_render_seconds': ('histogram', 'Time spent rendering the response body (DRF serialization to bytes).', LATENCY_BUCKETS),
+    'db_queries_per_request': ('histogram', 'Database queries executed per request.', QUERY_COUNT_BUCKETS),
+    'db_query_duration_seconds': ('histogram', 'Total database time per request.', LATENCY_BUCKETS),
+    'slow_requests_total': ('counter', 'Requests slower than SLOW_REQUEST_SECONDS.', None),
+    'db_replica_fallbacks_total': ('counter', 'Requests that read from the primary because no replica was healthy.', None),
+}
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(dict)
+        self.collectors = []
+
+    def inc(self, name, labels=(), amount=1):
+        with self._lock:
+            series = self._values[name]
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        with self._lock:
+            series = self._values[name]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(METRICS[name][2])
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, _) in METRICS.items():
+                series = self._values.get(name)
+                if not series:
+                    continue
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in sorted(series.items()):
+                    if kind == 'counter':
+                        lines.append(f'{name}{_format_labels(labels)} {value}')
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*value.buckets, '+Inf'), value.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value.sum}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value.count}')
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def work_hours_cache_collector():
+    from work_hours.cache import stats
+
+    lines = []
+    for counter, value in stats().items():
+        name = f'work_hours_cache_{counter}_total'
+        lines += [f'# TYPE {name} counter', f'{name} {value}']
+    return lines
+
+
+registry.collectors.append(work_hours_cache_collector)
+
+# psycopg_pool stats that describe the pool now; the others count events.
+POOL_GAUGES = {'pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting'}
+
+
+def database_pool_collector():
+    from .pooling import pool_stats
+
+    series = defaultdict(list)
+    for alias, stats in pool_stats().items():
+        for key, value in stats.items():
+            name = f'db_pool_{key}' if key in POOL_GAUGES else f'db_pool_{key}_total'
+            series[name].append(f'{name}{_format_labels([("alias", alias)])} {value}')
+    lines = []
+    for name, values in sorted(series.items()):
+        kind = 'counter' if name.endswith('_total') else 'gauge'
+        lines += [f'# TYPE {name} {kind}', *values]
+    return lines
+
+
+registry.collectors.append(database_pool_collector)
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        # Off unless a token is configured, so a deployment never exposes it by accident
+        raise Http404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,174 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .metrics import registry
+from .routers import SAFE_METHODS, client_key, reading_from_replicas
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_QUERIES = 50
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts and times queries, optionally keeping the SQL."""
+
+    def __init__(self, capture_sql):
+        self.capture_sql = capture_sql
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if self.capture_sql and len(self.queries) < MAX_LOGGED_QUERIES:
+                self.queries.append((elapsed, sql))
+
+
+def install_wrapper(stack, wrapper):
+    """Install ``wrapper`` on every connection of the calling thread until ``stack`` closes."""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(wrapper))
+
+
+class MetricsMiddleware:
+    """
+    Record latency, database and response-size metrics for a sample of requests.
+
+    Requests outside the ``METRICS_SAMPLE_RATE`` sample skip instrumentation
+    entirely, so only sampled requests pay for the query wrapper. Under ASGI
+    the middleware runs natively async so async views stay on the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        self.slow_request_seconds = getattr(settings, 'SLOW_REQUEST_SECONDS', None)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder(capture_sql=self.slow_request_seconds is not None)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            install_wrapper(stack, recorder)
+            response = self.get_response(request)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        # Connections are per thread, and the async ORM and sync views run in
+        # this request's thread-sensitive worker thread, not on the event
+        # loop, so the wrappers are installed on that thread's connections.
+        recorder = QueryRecorder(capture_sql=self.slow_request_seconds is not None)
+        started = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(install_wrapper)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, recorder, elapsed):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        labels = (('view', view), ('method', request.method))
+        registry.inc('http_requests_total', (*labels, ('status', response.status_code)))
+        registry.observe('http_request_duration_seconds', elapsed, labels)
+        registry.observe('db_queries_per_request', recorder.count, labels)
+        registry.observe('db_query_duration_seconds', recorder.duration, labels)
+        if not response.streaming:
+            registry.observe('http_response_size_bytes', len(response.content), labels)
+        render_seconds = getattr(request, '_metrics_render_seconds', None)
+        if render_seconds is not None:
+            registry.observe('http_response_render_seconds', render_seconds, labels)
+
+        if self.slow_request_seconds is not None and elapsed >= self.slow_request_seconds:
+            registry.inc('slow_requests_total', labels)
+            logger.warning(
+                'Slow request %s %s (%s) took %.3fs with %d queries (%.3fs in DB)\n%s',
+                request.method, request.path, view, elapsed, recorder.count, recorder.duration,
+                '\n'.join(f'  [{duration * 1000:.1f}ms] {sql}' for duration, sql in recorder.queries),
+            )
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def record_render(rendered):
+            request._metrics_render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(record_render)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe-method requests from read replicas and pin clients that just
+    wrote to the primary; see backend/routers.py.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        key = client_key(request)
+        if request.method in SAFE_METHODS:
+            if key is not None and cache.get(key):
+                return self.get_response(request)
+            with reading_from_replicas():
+                return self.get_response(request)
+        response = self.get_response(request)
+        if key is not None and response.status_code < 400:
+            cache.set(key, True, settings.READ_YOUR_WRITES_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+        key = client_key(request)
+        if request.method in SAFE_METHODS:
+            if key is not None and await cache.aget(key):
+                return await self.get_response(request)
+            with reading_from_replicas():
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        if key is not None and response.status_code < 400:
+            await cache.aset(key, True, settings.READ_YOUR_WRITES_SECONDS)
+        return response
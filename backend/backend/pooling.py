@@ -0,0 +1,28 @@
+"""
+PostgreSQL connection pools.
+
+With ``DATABASE_POOL`` every PostgreSQL alias gets a psycopg pool per process
+through Django's ``OPTIONS["pool"]``. Django opens a pool on its first query;
+the WSGI and ASGI entry points call ``open_pools`` instead, so the pool
+starts connecting in the background while the worker boots and the first
+request finds a connection ready. Gunicorn must then not ``--preload`` the
+app, or forked workers would share the pools' sockets and threads.
+"""
+from django.db import connections
+
+
+def pools():
+    """Yield ``(alias, pool)`` for every pooled database."""
+    for alias in connections:
+        connection = connections[alias]
+        if connection.settings_dict.get('OPTIONS', {}).get('pool'):
+            yield alias, connection.pool
+
+
+def open_pools():
+    for _, pool in pools():
+        pool.open(wait=False)
+
+
+def pool_stats():
+    return {alias: pool.get_stats() for alias, pool in pools()}
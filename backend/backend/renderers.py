@@ -0,0 +1,50 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# orjson writes exponents as 1e16 and 1e-7 where json writes 1e+16 and 1e-07.
+# This also matches text such as "4e5" inside strings, which only costs a
+# trip through the stdlib path.
+EXPONENT = re.compile(rb'[0-9]e[-0-9]')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes with orjson when it is installed.
+
+    Output is byte-for-byte what ``JSONRenderer`` produces (compact
+    separators, UTF-8, escaped U+2028/U+2029, ``Z`` for UTC datetimes).
+    Anything orjson rejects (``Decimal``, for one), floats in exponent form
+    and indented output go through the stdlib path. The one difference left
+    is NaN and infinity, which orjson writes as ``null`` where
+    ``JSONRenderer`` refuses them, so views opt in with ``fast_renderers()``
+    only where their data holds no floats.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or not api_settings.COMPACT_JSON
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, option=orjson.OPT_UTC_Z)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def fast_renderers():
+    """``DEFAULT_RENDERER_CLASSES`` with ``JSONRenderer`` swapped for ``FastJSONRenderer``."""
+    return [FastJSONRenderer if cls is JSONRenderer else cls for cls in api_settings.DEFAULT_RENDERER_CLASSES]
@@ -0,0 +1,155 @@
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` lets a GET, HEAD or OPTIONS request read from
+one of ``REPLICA_DATABASES``; everything else, including management
+commands and background workers, stays on the primary. One replica is
+picked per request so its reads see a single point in time.
+
+A client that wrote recently is pinned to the primary for
+``READ_YOUR_WRITES_SECONDS``, so it never reads data older than its own
+write. Clients are told apart by the user id in their bearer token, or by
+their session cookie; neither is verified here, since the worst a forged
+value can do is send a request's reads to the primary.
+
+A replica is checked at most every ``REPLICA_CHECK_SECONDS``. One that is
+unreachable or, on PostgreSQL, more than ``REPLICA_MAX_LAG_SECONDS`` behind
+is skipped until a later check passes; with none healthy, reads go to the
+primary. Reads that fill long-lived caches use ``reading_from_primary``.
+"""
+import base64
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework_simplejwt.settings import api_settings
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaReads:
+    """Per-request read routing state; ``alias`` is chosen on the first read."""
+    __slots__ = ('alias',)
+
+    def __init__(self):
+        self.alias = None
+
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=None)
+
+
+@contextmanager
+def reading_from_replicas():
+    """Route reads in this context to a replica unless a transaction is open."""
+    token = _replica_reads.set(ReplicaReads())
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def reading_from_primary():
+    """
+    Route reads in this context to the primary. Anything cached for longer
+    than ``READ_YOUR_WRITES_SECONDS`` must be read this way, or a lagging
+    replica's rows could outlive the writer's pin.
+    """
+    token = _replica_reads.set(None)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaHealth:
+    def __init__(self):
+        self.status = {}
+
+    def healthy(self, alias):
+        now = time.monotonic()
+        status = self.status.get(alias)
+        if status is not None and now - status[1] < settings.REPLICA_CHECK_SECONDS:
+            return status[0]
+        problem = self.check(alias)
+        healthy = problem is None
+        if not healthy and (status is None or status[0]):
+            logger.warning('Replica %s is unhealthy: %s', alias, problem)
+        elif healthy and status is not None and not status[0]:
+            logger.info('Replica %s is healthy again', alias)
+        self.status[alias] = (healthy, now)
+        return healthy
+
+    def check(self, alias):
+        """Return why ``alias`` should not serve reads, or ``None`` if it can."""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor != 'postgresql':
+                    cursor.execute('SELECT 1')
+                    return None
+                # NULL when the database is not replaying WAL. An idle primary
+                # also looks behind, which only sends reads to the primary.
+                cursor.execute('SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())')
+                lag = cursor.fetchone()[0]
+        except DatabaseError as exc:
+            connection.close()
+            return str(exc)
+        if lag is not None and lag > settings.REPLICA_MAX_LAG_SECONDS:
+            return f'{lag:.0f}s behind the primary'
+        return None
+
+
+health = ReplicaHealth()
+
+
+def choose_replica():
+    healthy = [alias for alias in settings.REPLICA_DATABASES if health.healthy(alias)]
+    if not healthy:
+        registry.inc('db_replica_fallbacks_total')
+        return DEFAULT_DB_ALIAS
+    return random.choice(healthy)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        reads = _replica_reads.get()
+        if reads is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if reads.alias is None:
+            reads.alias = choose_replica()
+        return reads.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        return db not in settings.REPLICA_DATABASES
+
+
+def client_key(request):
+    """Who ``request`` comes from, for pinning; ``None`` for anonymous requests."""
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0] in api_settings.AUTH_HEADER_TYPES:
+        try:
+            payload = header[1].split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            return f'routing:pin:user:{claims[api_settings.USER_ID_CLAIM]}'
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return f'routing:pin:session:{session_key}' if session_key else None
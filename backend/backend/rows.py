@@ -0,0 +1,71 @@
+"""
+Read-only fast path that builds response rows from ``values_list()`` tuples.
+
+``RowMapper`` compiles a ``ModelSerializer`` once into column names and
+per-field converters, so listing skips model instantiation and the
+per-field ``get_attribute`` machinery while producing the same dicts the
+serializer would.
+"""
+from functools import lru_cache
+
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose database value is already what the serializer would output.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class RowMapper:
+    def __init__(self, serializer_class):
+        fields = [field for field in serializer_class().fields.values() if not field.write_only]
+        for field in fields:
+            if field.source == '*' or '.' in field.source:
+                raise ValueError(f'{serializer_class.__name__}.{field.field_name} is not a plain column')
+        self.names = [field.field_name for field in fields]
+        self.columns = [field.source for field in fields]
+        self.converters = [
+            (i, field.to_representation)
+            for i, field in enumerate(fields)
+            if not isinstance(field, PASSTHROUGH_FIELDS)
+        ]
+
+    def index(self, name):
+        return self.names.index(name)
+
+    def values(self, queryset):
+        return queryset.values_list(*self.columns)
+
+    def to_rows(self, tuples):
+        names, converters = self.names, self.converters
+        rows = []
+        for values in tuples:
+            values = list(values)
+            for i, converter in converters:
+                if values[i] is not None:
+                    values[i] = converter(values[i])
+            rows.append(dict(zip(names, values)))
+        return rows
+
+
+@lru_cache(maxsize=None)
+def row_mapper(serializer_class):
+    return RowMapper(serializer_class)
+
+
+class FastListMixin:
+    """
+    Serve ``list()`` through a ``RowMapper`` of the view's serializer.
+
+    Include it in a generic view to opt that view into the fast read path;
+    writes and detail views keep using the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        mapper = row_mapper(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(mapper.to_rows(mapper.values(queryset)))
@@ -0,0 +1,5 @@
+"""
+Settings profiles: ``base`` holds what every deployment shares, ``dev`` adds
+the admin, sessions, templates and DEBUG for local work, and ``production``
+is the lean API-only profile the servers run.
+"""
@@ -0,0 +1,226 @@
+"""
+Settings shared by every profile of the backend project.
+
+Pick a profile with DJANGO_SETTINGS_MODULE: ``backend.settings.dev`` (the
+default for manage.py) or ``backend.settings.production`` (the default for
+the WSGI and ASGI entry points).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+import dj_database_url
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv("SECRET_KEY", 'django-insecure-a4*ggr7o=ku(3tbz1xeq%ks0xua*llv@5^ji^@^n)s6qq0hggo')
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'plumbsched-backend.onrender.com',  # Your Render backend domain
+    'localhost',
+]
+
+
+# Application definition. The profiles add to these.
+
+INSTALLED_APPS = [
+    'corsheaders',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'rest_framework',
+    'appointments',
+    'users',
+    'services',
+    'work_hours',
+    'tasks',
+]
+
+MIDDLEWARE = [
+    'backend.middleware.MetricsMiddleware',
+    'backend.middleware.ReplicaRoutingMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+# Under ASGI (SERVER_MODE=asgi) the read endpoints are served by native async
+# views; see backend/async_urls.py.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "1" if os.getenv("SERVER_MODE") == "asgi" else "0") == "1"
+
+ROOT_URLCONF = 'backend.async_urls' if ASYNC_READ_VIEWS else 'backend.urls'
+
+TEMPLATES = []
+
+WSGI_APPLICATION = 'backend.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+# Connections (see backend/pooling.py). By default each process keeps one
+# connection per thread open for 600 seconds. With DATABASE_POOL=1 (PostgreSQL
+# only; needs psycopg[pool]) each process instead shares a pool of
+# DATABASE_POOL_MIN_SIZE to DATABASE_POOL_MAX_SIZE connections, opened in the
+# background at startup so no request waits for a TCP and TLS handshake; a
+# request waits at most DATABASE_POOL_TIMEOUT seconds for a free one. Either
+# way a connection is health-checked before it is reused.
+
+DATABASE_POOL = os.getenv("DATABASE_POOL", "0") == "1"
+DATABASE_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "1")),
+    "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "4")),
+    "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+}
+
+
+def database_config(url):
+    if not url:
+        return {}
+    # SSL is required unless the URL sets its own sslmode (e.g. sslmode=disable
+    # for a local server) or points at SQLite, which has no connection to secure.
+    ssl_require = not url.startswith("sqlite") and "sslmode=" not in url
+    config = dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True, ssl_require=ssl_require)
+    if DATABASE_POOL and config["ENGINE"] == "django.db.backends.postgresql":
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = dict(DATABASE_POOL_OPTIONS)
+    return config
+
+
+DATABASES = {
+    "default": database_config(os.getenv("DATABASE_URL", "")),
+}
+
+# Read replicas (see backend/routers.py). REPLICA_DATABASE_URLS is a
+# comma-separated list of database URLs; GET requests read from one of them
+# while it passes health checks, e.g.
+# postgres://reader@replica-1/plumbsched?connect_timeout=2 (the timeout
+# bounds a check of an unreachable replica) or sqlite:////tmp/replica.sqlite3
+# locally. A client that wrote reads from the primary for
+# READ_YOUR_WRITES_SECONDS; that pin lives in the default cache, so share
+# it between processes through Redis (see CACHES).
+
+REPLICA_DATABASES = []
+for _index, _url in enumerate(url for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()):
+    _alias = f"replica{_index + 1}"
+    DATABASES[_alias] = database_config(_url.strip())
+    DATABASES[_alias]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASES.append(_alias)
+
+DATABASE_ROUTERS = ["backend.routers.ReplicaRouter"]
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_CHECK_SECONDS = float(os.getenv("REPLICA_CHECK_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Point CACHE_BACKEND at django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION at e.g. redis://localhost:6379 to share the cache between processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+    ),
+}
+
+# Authenticated users are cached for this many seconds (see
+# users/authentication.py), saving the user query on most requests.
+
+AUTH_USER_CACHE_SECONDS = int(os.getenv("AUTH_USER_CACHE_SECONDS", "60"))
+
+CORS_ALLOW_ALL_ORIGINS = False  # safer for production
+CORS_ALLOWED_ORIGINS = [
+    "http://localhost:8081",  # Your frontend URL
+    # Add more origins if needed
+]
+
+# Request metrics (see backend/metrics.py), served at /metrics/.
+# Set METRICS_SAMPLE_RATE below 1 to instrument only a fraction of requests,
+# SLOW_REQUEST_SECONDS to log slower requests with their SQL (0 disables).
+# The endpoint answers 404 until METRICS_TOKEN is set, and then requires
+# "Authorization: Bearer <token>".
+
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1.0")) or None
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Route planning (see appointments/routing.py). GEOCODER is the dotted path
+# of a class whose geocode(address) returns (latitude, longitude) or None;
+# the default is a deterministic local stand-in for a hosted geocoder.
+
+GEOCODER = os.getenv("GEOCODER", "appointments.geocoding.LocalGeocoder")
+ROUTE_SPEED_KMH = float(os.getenv("ROUTE_SPEED_KMH", "40"))
+
+# Notifications (see appointments/notifications.py), sent from background
+# tasks run by "manage.py run_tasks". NOTIFIER is the dotted path of a class
+# whose send_sms(phone, message) delivers a text; the default only logs it.
+
+NOTIFIER = os.getenv("NOTIFIER", "appointments.notifications.LogNotifier")
+
+# Customers get a reminder this many hours before their appointment, sent
+# by "manage.py send_reminders" (see appointments/reminders.py).
+
+REMINDER_LEAD_HOURS = float(os.getenv("REMINDER_LEAD_HOURS", "24"))
@@ -0,0 +1,15 @@
+"""
+The API-only profile the servers run.
+
+Clients authenticate with JWTs and read JSON, so this leaves out what only
+the admin and the browsable API need: sessions, messages, CSRF and
+clickjacking middleware, static files and templates. DEBUG stays off, so
+no SQL is kept per request, and with USE_I18N off no translation catalogs
+are loaded; every message is in English already. Run "manage.py
+bench_startup" to see what this saves on a cold start.
+"""
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+
+USE_I18N = False
@@ -0,0 +1,18 @@
+"""
+Work a server worker does while it boots, before it takes requests.
+
+Django imports the URLconf, and with it every view and whatever the views
+import, when it resolves the first request. ``prepare_worker`` does that
+during startup instead, while the database pools fill, so the first request
+a new instance serves is not several times slower than the rest.
+"""
+from importlib import import_module
+
+from django.conf import settings
+
+from .pooling import open_pools
+
+
+def prepare_worker():
+    open_pools()
+    import_module(settings.ROOT_URLCONF)
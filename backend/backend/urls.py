@@ -14,17 +14,26 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
+from .batch import batch
+from .metrics import metrics_view
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('', include('appointments.urls')),
     path('auth/', include('users.urls')),
     path('services/', include('services.urls')),
     path('work_hours/', include('work_hours.urls')),
+    path('batch/', batch, name='batch'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
+
+# The admin is only installed in the dev profile.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
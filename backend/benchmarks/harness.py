@@ -0,0 +1,56 @@
+"""
+Minimal pytest-benchmark style timing harness.
+
+``Benchmark`` times a callable for a number of rounds after a warmup and
+collects latency percentiles and throughput into plain dicts that can be
+dumped to JSON and compared between commits.
+"""
+import math
+import time
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Benchmark:
+    def __init__(self, rounds=100, warmup=5):
+        self.rounds = rounds
+        self.warmup = warmup
+        self.results = {}
+
+    def __call__(self, name, fn, *args, **kwargs):
+        for _ in range(self.warmup):
+            fn(*args, **kwargs)
+        timings = []
+        started = time.perf_counter()
+        for _ in range(self.rounds):
+            call_started = time.perf_counter()
+            fn(*args, **kwargs)
+            timings.append(time.perf_counter() - call_started)
+        total = time.perf_counter() - started
+
+        timings.sort()
+        self.results[name] = {
+            'rounds': self.rounds,
+            'mean_ms': sum(timings) / len(timings) * 1000,
+            'min_ms': timings[0] * 1000,
+            'p50_ms': percentile(timings, 0.50) * 1000,
+            'p99_ms': percentile(timings, 0.99) * 1000,
+            'max_ms': timings[-1] * 1000,
+            'throughput_rps': self.rounds / total if total else 0.0,
+        }
+        return self.results[name]
+
+
+def compare(baseline, current, metric='p50_ms'):
+    """Yield ``(name, before, after, change)`` for benchmarks present in both runs."""
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name][metric], result[metric]
+        yield name, before, after, (after - before) / before if before else 0.0
@@ -0,0 +1,121 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from appointments.rollups import rebuild_rollups
+from benchmarks.harness import Benchmark, compare
+from benchmarks.seed import PASSWORD, seed
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and measure latency and throughput "
+        "of the main REST endpoints, optionally writing JSON results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--appointments', type=int, default=10000)
+        parser.add_argument('--rounds', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+        parser.add_argument('--compare', help='Print p50 changes against a previous JSON result.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self.run_benchmarks(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'parameters': {key: options[key] for key in ('users', 'appointments', 'rounds', 'warmup', 'seed')},
+            'results': results,
+        }
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<20} p50={result['p50_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+                f"{result['throughput_rps']:8.1f} req/s"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)['results']
+            for name, before, after, change in compare(baseline, results):
+                self.stdout.write(f"{name:<20} {before:8.2f}ms -> {after:8.2f}ms ({change:+.1%})")
+
+    def run_benchmarks(self, options):
+        plumbers = seed(users=options['users'], appointments=options['appointments'], rng_seed=options['seed'])
+        rebuild_rollups()
+        plumber = plumbers[0]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(plumber).access_token))
+        appointment = plumber.appointments.order_by('id').first()
+        service = plumber.services.first()
+
+        # Each create books its own slot after the seeded ones, so none conflict.
+        slot = count()
+        last_end = plumber.appointments.order_by('-end_time').values_list('end_time', flat=True).first()
+
+        def create():
+            scheduled_time = last_end + timedelta(hours=4 * next(slot))
+            return client.post('/appointments/create/', {
+                'customer_name': 'Bench Customer',
+                'customer_phone': '555-0000',
+                'address': '1 Bench St',
+                'service': service.pk,
+                'scheduled_time': scheduled_time.isoformat(),
+            }, format='json')
+
+        def expect(status_code, request):
+            def run():
+                response = request()
+                if response.status_code != status_code:
+                    raise RuntimeError(f'{response.status_code}: {getattr(response, "data", response.content)}')
+            return run
+
+        benchmark = Benchmark(rounds=options['rounds'], warmup=options['warmup'])
+        benchmark('list', expect(200, lambda: client.get('/appointments/', {'limit': 50})))
+        benchmark('detail', expect(200, lambda: client.get(f'/appointments/{appointment.pk}/details/')))
+        benchmark('create', expect(201, create))
+        benchmark('update', expect(200, lambda: client.patch(
+            f'/appointments/{appointment.pk}/update/', {'description': 'Updated by benchmark'}, format='json',
+        )))
+        benchmark('search', expect(200, lambda: client.get('/appointments/search/', {'q': 'maple 12'})))
+        busiest = appointment.scheduled_time.strftime('%Y-%m')
+        benchmark('calendar', expect(200, lambda: client.get('/calendar/', {'month': busiest})))
+        benchmark('work_hours', expect(200, lambda: client.get('/work_hours/')))
+        benchmark('services', expect(200, lambda: client.get('/services/')))
+        benchmark('token', expect(200, lambda: client.post(
+            '/auth/token/', {'username': plumber.username, 'password': PASSWORD}, format='json',
+        )))
+        return benchmark.results
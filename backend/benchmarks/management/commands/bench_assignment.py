@@ -0,0 +1,88 @@
+import json
+import random
+import time as timer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from appointments.assignment import Job, TechnicianCalendar, assign
+
+BUDGET_MS = 5000
+DAY = 24 * 3600
+HOUR = 3600
+SERVICE_MINUTES = [45, 60, 90, 120, 180]
+
+
+def build_workload(technicians, jobs, days, seed):
+    rng = random.Random(seed)
+    calendars = {}
+    offers = {}
+    for technician in range(technicians):
+        gaps = []
+        for day in range(days):
+            base = day * DAY
+            for start, end in ((8 * HOUR, 12 * HOUR), (13 * HOUR, 17 * HOUR)):
+                # Some existing bookings already split the window
+                cut = base + start + rng.randrange(0, 4) * HOUR
+                booked = rng.choice((0, 0, HOUR))
+                gaps += [(s, e) for s, e in ((base + start, cut), (cut + booked, base + end)) if e > s]
+        calendars[technician] = gaps
+        services = rng.sample(range(len(SERVICE_MINUTES)), rng.randint(2, len(SERVICE_MINUTES)))
+        offers[technician] = {service: SERVICE_MINUTES[service] * rng.choice((0.75, 1, 1.25)) for service in services}
+
+    workload = []
+    for key in range(jobs):
+        service = rng.randrange(len(SERVICE_MINUTES))
+        earliest = rng.randrange(days) * DAY if rng.random() < 0.3 else 0
+        latest = earliest + rng.randint(1, 2) * DAY if earliest else days * DAY
+        durations = {t: int(minutes[service] * 60) for t, minutes in offers.items() if service in minutes}
+        workload.append(Job(key, durations, earliest, latest))
+    return calendars, workload
+
+
+def run(gaps, jobs, local_search_seconds):
+    calendars = {technician: TechnicianCalendar(technician, g) for technician, g in gaps.items()}
+    capacity = sum(calendar.capacity() for calendar in calendars.values())
+    started = timer.perf_counter()
+    assignments, unassigned = assign(jobs, calendars, local_search_seconds)
+    elapsed = (timer.perf_counter() - started) * 1000
+    filled = sum(end - start for _, start, end in assignments.values())
+    return elapsed, len(assignments), filled / capacity
+
+
+class Command(BaseCommand):
+    help = (
+        "Time multi-technician auto-assignment on a synthetic week, greedy "
+        "alone and with local search, against the latency budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--technicians', type=int, default=40)
+        parser.add_argument('--jobs', type=int, default=900)
+        parser.add_argument('--days', type=int, default=5)
+        parser.add_argument('--local-search-seconds', type=float, default=2.0)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        gaps, jobs = build_workload(options['technicians'], options['jobs'], options['days'], options['seed'])
+        self.stdout.write(f"technicians={options['technicians']} jobs={options['jobs']} days={options['days']}")
+        results = {}
+        for label, seconds in (('greedy', 0), ('greedy+local', options['local_search_seconds'])):
+            elapsed, assigned, utilization = run(gaps, jobs, seconds)
+            results[label] = {'elapsed_ms': elapsed, 'assigned': assigned, 'utilization': utilization}
+            self.stdout.write(f"{label:<13} assigned={assigned:4d} utilization={utilization:6.1%} time={elapsed:8.1f}ms")
+        self.stdout.write(f"budget={BUDGET_MS}ms")
+        if options['output']:
+            report = {
+                'parameters': {
+                    key: options[key]
+                    for key in ('technicians', 'jobs', 'days', 'local_search_seconds', 'seed')
+                },
+                'budget_ms': BUDGET_MS,
+                'results': results,
+            }
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+        elapsed = results['greedy+local']['elapsed_ms']
+        if elapsed > BUDGET_MS:
+            raise CommandError(f"greedy+local took {elapsed:.1f}ms, over the {BUDGET_MS}ms budget")
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.harness import percentile
+from benchmarks.seed import seed
+
+ENDPOINTS = ['/appointments/?limit=50', '/services/', '/work_hours/']
+
+
+class SlowDatabase:
+    """``execute_wrapper`` adding a fixed round-trip latency to every query."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, self)
+
+
+def summarize(latencies, elapsed):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync (WSGI, fixed worker pool) and async (ASGI, one event "
+        "loop) read endpoints under concurrent load against a database stand-in "
+        "that adds latency to every query. Latencies include queueing: with "
+        "--concurrency far above --workers the async p50 mostly measures the "
+        "queue, so also compare at equal concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300)
+        parser.add_argument('--workers', type=int, default=4, help='Sync workers, as in gunicorn --workers.')
+        parser.add_argument('--concurrency', type=int, default=50, help='Concurrent requests on the ASGI event loop.')
+        parser.add_argument('--db-latency-ms', type=float, default=20.0)
+        parser.add_argument('--appointments', type=int, default=2000)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            plumber = seed(users=5, appointments=options['appointments'])[0]
+            token = str(RefreshToken.for_user(plumber).access_token)
+            slow = SlowDatabase(options['db_latency_ms'] / 1000)
+            connection_created.connect(slow.install)
+            slow.install(None, connection)
+            results = {
+                'wsgi': self.run_sync(token, options),
+                'asgi': self.run_async(token, options),
+            }
+            connection_created.disconnect(slow.install)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<5} {result['requests']} requests in {result['elapsed_s']:.2f}s "
+                f"{result['throughput_rps']:8.1f} req/s p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms"
+            )
+        if options['output']:
+            parameters = {key: options[key] for key in ('requests', 'workers', 'concurrency', 'db_latency_ms')}
+            with open(options['output'], 'w') as fh:
+                json.dump({'parameters': parameters, 'results': results}, fh, indent=2)
+
+    def run_sync(self, token, options):
+        urls = [ENDPOINTS[i % len(ENDPOINTS)] for i in range(options['requests'])]
+
+        def worker(chunk):
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+            latencies = []
+            for url in chunk:
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{url}: {response.status_code}')
+            return latencies
+
+        workers = options['workers']
+        with override_settings(ROOT_URLCONF='backend.urls'):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                chunks = pool.map(worker, [urls[i::workers] for i in range(workers)])
+                latencies = [latency for chunk in chunks for latency in chunk]
+            return summarize(latencies, time.perf_counter() - started)
+
+    def run_async(self, token, options):
+        with override_settings(ROOT_URLCONF='backend.async_urls'):
+            handler = ASGIHandler()
+            return asyncio.run(self.drive_asgi(handler, token, options))
+
+    async def drive_asgi(self, handler, token, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        latencies = []
+
+        async def request(url):
+            path, _, query = url.partition('?')
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path, 'root_path': '',
+                'query_string': query.encode(), 'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+                'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+            }
+            done = asyncio.Event()
+            sent = []
+
+            async def receive():
+                if not sent:
+                    sent.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            status = []
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif message['type'] == 'http.response.body' and not message.get('more_body'):
+                    done.set()
+
+            async with semaphore:
+                started = time.perf_counter()
+                await handler(scope, receive, send)
+                latencies.append(time.perf_counter() - started)
+            if status != [200]:
+                raise RuntimeError(f'{url}: {status}')
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request(ENDPOINTS[i % len(ENDPOINTS)]) for i in range(options['requests'])))
+        return summarize(latencies, time.perf_counter() - started)
@@ -0,0 +1,169 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.pooling import open_pools, pool_stats
+from benchmarks.harness import percentile
+from benchmarks.seed import seed
+
+ENDPOINT = '/appointments/'
+QUERY_STRING = 'limit=20'
+
+# Connection settings per mode; "connect" is what CONN_MAX_AGE=0 does and
+# "persistent" the default CONN_MAX_AGE=600 with health checks.
+MODES = {
+    'connect': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+    'pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True},
+}
+
+
+class ConnectCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, sender, connection, **kwargs):
+        self.count += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request latency against PostgreSQL when every request opens "
+        "its own connection, with persistent per-thread connections, and with "
+        "a connection pool opened at startup. Point DATABASE_URL at a server "
+        "with SSL enabled (the default sslmode=require) so the TLS handshake "
+        "is part of every new connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent request threads.')
+        parser.add_argument('--requests', type=int, default=100, help='Requests per worker.')
+        parser.add_argument('--connects', type=int, default=50, help='Fresh connections to time on their own.')
+        parser.add_argument('--mode', choices=list(MODES), action='append', dest='modes')
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_connections needs DATABASE_URL to point at PostgreSQL.')
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        original = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        original_pool = connection.settings_dict['OPTIONS'].pop('pool', None)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            result = self.run_benchmarks(options)
+        finally:
+            self.configure(original, original_pool)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"new connection: {result['connect_ms']:.2f}ms (p50 of {options['connects']})")
+        for mode, row in result['modes'].items():
+            self.stdout.write(
+                f"{mode:<11} opened={row['connections_opened']:4d} first_request_p50={row['first_request_p50_ms']:7.2f}ms "
+                f"p50={row['p50_ms']:7.2f}ms p99={row['p99_ms']:7.2f}ms {row['throughput_rps']:7.1f} req/s"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+
+    def configure(self, values, pool=None):
+        connections.close_all()
+        connection.close_pool()
+        connection.settings_dict.update(values)
+        connection.settings_dict['OPTIONS'].pop('pool', None)
+        if pool:
+            connection.settings_dict['OPTIONS']['pool'] = pool
+
+    def run_benchmarks(self, options):
+        users = seed(users=options['workers'], appointments=options['workers'] * 200)
+        environs = [self.environ(user) for user in users]
+
+        self.configure(MODES['connect'])
+        timings = []
+        for _ in range(options['connects']):
+            fresh = connection.copy()
+            started = time.perf_counter()
+            fresh.ensure_connection()
+            timings.append(time.perf_counter() - started)
+            fresh.close()
+        timings.sort()
+
+        # Load URL resolvers, serializers and the like before anything is timed.
+        WSGIHandler()({**environs[0], 'wsgi.input': io.BytesIO()}, lambda status, headers: None).close()
+
+        result = {
+            'database': connection.vendor,
+            'sslmode': connection.settings_dict['OPTIONS'].get('sslmode'),
+            'parameters': {key: options[key] for key in ('workers', 'requests', 'connects')},
+            'connect_ms': percentile(timings, 0.5) * 1000,
+            'modes': {},
+        }
+        for mode in options['modes'] or list(MODES):
+            pool = {'min_size': options['workers'], 'max_size': options['workers']} if mode == 'pool' else None
+            self.configure(MODES[mode], pool)
+            result['modes'][mode] = self.run_mode(environs, options['requests'], pool)
+        return result
+
+    def environ(self, user):
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': ENDPOINT,
+            'QUERY_STRING': QUERY_STRING,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'HTTP_HOST': 'localhost',
+            'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}',
+            'wsgi.url_scheme': 'http',
+        }
+
+    def run_mode(self, environs, requests, pool):
+        # The real handler, unlike the test client, closes or returns the
+        # connection at the end of each request as CONN_MAX_AGE says.
+        handler = WSGIHandler()
+        counter = ConnectCounter()
+        if pool:
+            # What backend/wsgi.py does while a worker boots.
+            open_pools()
+            connection.pool.wait()
+
+        def work(environ):
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = handler({**environ, 'wsgi.input': io.BytesIO()}, lambda status, headers: None)
+                response.close()
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{ENDPOINT} returned {response.status_code}')
+            connections.close_all()
+            return latencies
+
+        connection_created.connect(counter)
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(len(environs)) as pool_executor:
+                per_worker = list(pool_executor.map(work, environs))
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(counter)
+
+        opened = pool_stats()['default'].get('connections_num', 0) if pool else counter.count
+        first = sorted(latencies[0] for latencies in per_worker)
+        latencies = sorted(latency for worker in per_worker for latency in worker)
+        return {
+            'connections_opened': opened,
+            'first_request_p50_ms': percentile(first, 0.5) * 1000,
+            'requests': len(latencies),
+            'p50_ms': percentile(latencies, 0.5) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        }
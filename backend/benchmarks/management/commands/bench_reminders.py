@@ -0,0 +1,99 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from appointments.models import Appointment, Reminder
+from appointments.reminders import send_due_reminders
+from benchmarks.seed import seed
+
+TARGET_PER_DAY = 1_000_000
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class SleepingNotifier:
+    """Stands in for an SMS gateway that takes ``latency`` seconds per message."""
+    latency = 0.0
+
+    def send_sms(self, phone, message):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with due reminders and measure how "
+        "many a single send_reminders scheduler handles per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reminders', type=int, default=20000)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--sms-latency-ms', type=float, default=0.0)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            result = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(result['plan'])
+        self.stdout.write(
+            f"{result['reminders']} reminders in {result['elapsed_s']:.2f}s: {result['per_second']:.0f}/s, "
+            f"{result['per_day']:,.0f}/day ({result['per_day'] / TARGET_PER_DAY:.1f}x a million a day)"
+        )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+
+    def run_benchmark(self, options):
+        count = options['reminders']
+        # Seeded bookings run three hours apart from a year ago, so about a
+        # third of them lie in the past; seed enough to have ``count`` ahead.
+        seed(users=10, appointments=count + count // 2 + 3000)
+        now = timezone.now()
+        upcoming = Appointment.objects.filter(scheduled_time__gt=now + timedelta(hours=1)).values_list('pk', flat=True)[:count]
+        Reminder.objects.bulk_create(
+            [Reminder(appointment_id=pk, due_at=now - timedelta(seconds=i % 3600)) for i, pk in enumerate(upcoming)],
+            batch_size=5000,
+        )
+        # Reminders already sent make up most of a real table.
+        Reminder.objects.filter(pk__in=Reminder.objects.values('pk')[:count // 2]).update(sent_at=now)
+        due = Reminder.objects.filter(sent_at__isnull=True, due_at__lte=now)
+        pending = due.count()
+        plan = due.order_by('due_at')[:options['batch_size']].explain()
+
+        SleepingNotifier.latency = options['sms_latency_ms'] / 1000
+        notifier_path = f'{__name__}.SleepingNotifier'
+        with override_settings(NOTIFIER=notifier_path), ThreadPoolExecutor(options['concurrency']) as pool:
+            started = time.perf_counter()
+            handled = 0
+            while True:
+                claimed = send_due_reminders(options['batch_size'], pool.map)
+                handled += claimed
+                if claimed < options['batch_size']:
+                    break
+            elapsed = time.perf_counter() - started
+
+        per_second = handled / elapsed if elapsed else 0.0
+        return {
+            'database': connection.vendor,
+            'parameters': {key: options[key] for key in ('batch_size', 'concurrency', 'sms_latency_ms')},
+            'plan': plan,
+            'reminders': handled,
+            'pending_before': pending,
+            'elapsed_s': elapsed,
+            'per_second': per_second,
+            'per_day': per_second * SECONDS_PER_DAY,
+        }
@@ -0,0 +1,77 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from appointments.routing import distance_matrix, lay_out, nearest_neighbour, order_stops, route_length
+from benchmarks.harness import Benchmark
+
+BUDGET_MS = 1000
+
+
+def build_workload(stops, seed):
+    rng = random.Random(seed)
+    coordinates = [(40.6 + 0.25 * rng.random(), -74.1 + 0.3 * rng.random()) for _ in range(stops + 1)]
+    durations = [timedelta(minutes=rng.choice((5, 10, 15))) for _ in range(stops)]
+    day = datetime(2025, 6, 2, tzinfo=timezone.utc)
+    windows = [(day + timedelta(hours=7), day + timedelta(hours=12)), (day + timedelta(hours=13), day + timedelta(hours=23))]
+    return coordinates, durations, windows
+
+
+def plan(coordinates, durations, windows):
+    dist = distance_matrix(coordinates)
+    stops = len(coordinates) - 1
+    order, padded = order_stops(dist[:stops, :stops], dist[stops, :stops])
+    placed, unplaced = lay_out(order, padded, durations, windows, speed_kmh=40, start=stops)
+    return order, padded, placed
+
+
+class Command(BaseCommand):
+    help = (
+        "Time daily route planning (distance matrix, nearest neighbour, "
+        "2-opt and layout) on a synthetic day against the latency budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stops', type=int, default=60)
+        parser.add_argument('--rounds', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        coordinates, durations, windows = build_workload(options['stops'], options['seed'])
+        planned = []
+
+        def request():
+            planned[:] = plan(coordinates, durations, windows)
+
+        benchmark = Benchmark(rounds=options['rounds'], warmup=options['warmup'])
+        result = benchmark('plan_route', request)
+
+        order, padded, placed = planned
+        start = options['stops']
+        greedy = route_length(padded, nearest_neighbour(padded, start, start + 1))
+        improved = route_length(padded, [start] + order + [start + 1])
+        report = {
+            'parameters': {key: options[key] for key in ('stops', 'rounds', 'warmup', 'seed')},
+            'budget_ms': BUDGET_MS,
+            'placed': len(placed),
+            'nearest_neighbour_km': greedy,
+            'two_opt_km': improved,
+            'result': result,
+        }
+        self.stdout.write(
+            f"stops={options['stops']} placed={len(placed)} "
+            f"nearest_neighbour={greedy:.1f}km two_opt={improved:.1f}km"
+        )
+        self.stdout.write(
+            f"plan_route p50={result['p50_ms']:.2f}ms min={result['min_ms']:.2f}ms "
+            f"max={result['max_ms']:.2f}ms budget={BUDGET_MS}ms"
+        )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+        if result['p50_ms'] > BUDGET_MS:
+            raise CommandError(f"p50 {result['p50_ms']:.2f}ms is over the {BUDGET_MS}ms budget")
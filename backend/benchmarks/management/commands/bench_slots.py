@@ -0,0 +1,168 @@
+import json
+import random
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from appointments.models import Appointment
+from benchmarks.harness import Benchmark
+from benchmarks.seed import PASSWORD, SERVICE_CATALOG
+from services.models import Service
+from work_hours.models import WorkHour
+
+User = get_user_model()
+
+BUDGET_MS = 50
+BATCH_SIZE = 2000
+
+# A split weekday shift with a lunch break and a Saturday morning.
+SCHEDULE = {
+    'monday': [(time(7), time(12)), (time(13), time(18))],
+    'tuesday': [(time(7), time(12)), (time(13), time(18))],
+    'wednesday': [(time(7), time(12)), (time(13), time(18))],
+    'thursday': [(time(7), time(12)), (time(13), time(18))],
+    'friday': [(time(7), time(12)), (time(13), time(18))],
+    'saturday': [(time(8), time(12))],
+}
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+# Travel and slack between jobs; mostly back to back, sometimes an hour free.
+GAPS_MINUTES = (0, 0, 0, 15, 30, 60)
+
+
+def book_schedule(rng, services, first_day, days, tz):
+    """Yield back-to-back bookings filling each working window of ``days`` days."""
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        for window_start, window_end in SCHEDULE.get(WEEKDAYS[day.weekday()], []):
+            cursor = datetime.combine(day, window_start, tz)
+            end = datetime.combine(day, window_end, tz)
+            while True:
+                service = rng.choice(services)
+                start = cursor + timedelta(minutes=rng.choice(GAPS_MINUTES))
+                if start + timedelta(minutes=service.duration_minutes) > end:
+                    break
+                yield service, start
+                cursor = start + timedelta(minutes=service.duration_minutes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with plumbers whose working hours "
+        "are densely booked and time GET /appointments/slots/ end to end "
+        "against the latency budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plumbers', type=int, default=20, help='Plumbers sharing the appointments table.')
+        parser.add_argument('--history-days', type=int, default=720, help='Booked days before the queried range.')
+        parser.add_argument('--days', type=int, default=90, help='Length of the queried range.')
+        parser.add_argument('--rounds', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            report = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        result = report['result']
+        self.stdout.write(
+            f"appointments={report['appointments']} in_range={report['in_range']} "
+            f"slots={report['slots']} database={connection.vendor}"
+        )
+        self.stdout.write(
+            f"slots_90d p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms "
+            f"max={result['max_ms']:.2f}ms budget={BUDGET_MS}ms"
+        )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+        if result['p99_ms'] > BUDGET_MS:
+            raise CommandError(f"p99 {result['p99_ms']:.2f}ms is over the {BUDGET_MS}ms budget")
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        tz = timezone.get_current_timezone()
+        password = make_password(PASSWORD)
+        plumbers = User.objects.bulk_create([
+            User(username=f'bench-slots-{i}', password=password) for i in range(options['plumbers'])
+        ])
+        WorkHour.objects.bulk_create([
+            WorkHour(user=user, day=day, start_time=start, end_time=end)
+            for user in plumbers for day, windows in SCHEDULE.items() for start, end in windows
+        ])
+        services = Service.objects.bulk_create([
+            Service(user=user, name=name, duration_minutes=minutes)
+            for user in plumbers for name, minutes in SERVICE_CATALOG
+        ])
+        by_plumber = {}
+        for service in services:
+            by_plumber.setdefault(service.user_id, []).append(service)
+
+        range_start = date(2025, 1, 6)
+        first_day = range_start - timedelta(days=options['history_days'])
+        days = options['history_days'] + options['days']
+        batch = []
+        for user in plumbers:
+            for i, (service, start) in enumerate(book_schedule(rng, by_plumber[user.pk], first_day, days, tz)):
+                appointment = Appointment(
+                    owner=user,
+                    customer_name=f'Slots Customer {i}',
+                    customer_phone=f'555-{rng.randrange(10000):04d}',
+                    address=f'{rng.randrange(1, 9999)} Main St',
+                    service=service,
+                    scheduled_time=start,
+                )
+                appointment.compute_end_time()
+                batch.append(appointment)
+                if len(batch) == BATCH_SIZE:
+                    Appointment.objects.bulk_create(batch)
+                    batch = []
+        Appointment.objects.bulk_create(batch)
+        return plumbers[0], by_plumber[plumbers[0].pk][0], range_start
+
+    def run_benchmark(self, options):
+        plumber, service, range_start = self.seed(options)
+        range_end = range_start + timedelta(days=options['days'] - 1)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(plumber).access_token))
+        params = {'service': service.pk, 'start': range_start.isoformat(), 'end': range_end.isoformat()}
+
+        slots = []
+
+        def request():
+            response = client.get('/appointments/slots/', params)
+            if response.status_code != 200:
+                raise RuntimeError(f'{response.status_code}: {response.data}')
+            slots[:] = response.data
+
+        benchmark = Benchmark(rounds=options['rounds'], warmup=options['warmup'])
+        result = benchmark('slots_90d', request)
+        tz = timezone.get_current_timezone()
+        in_range = plumber.appointments.filter(
+            scheduled_time__gte=datetime.combine(range_start, time.min, tz),
+            scheduled_time__lt=datetime.combine(range_end + timedelta(days=1), time.min, tz),
+        ).count()
+        return {
+            'parameters': {
+                key: options[key] for key in ('plumbers', 'history_days', 'days', 'rounds', 'warmup', 'seed')
+            },
+            'budget_ms': BUDGET_MS,
+            'appointments': Appointment.objects.count(),
+            'in_range': in_range,
+            'slots': len(slots),
+            'result': result,
+        }
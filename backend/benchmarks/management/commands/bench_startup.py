@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks.harness import percentile
+from benchmarks.seed import seed
+
+PROFILES = ['backend.settings.dev', 'backend.settings.production']
+
+# Runs in a fresh interpreter: import the WSGI application as a server
+# worker would, then time its first two requests.
+WORKER = """
+import io, json, sys, time
+started = time.perf_counter()
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = sys.argv[1]
+from backend.wsgi import application
+ready = time.perf_counter()
+from django.db import connection
+environ = json.loads(sys.argv[2])
+timings = []
+for _ in range(2):
+    began = time.perf_counter()
+    response = application({**environ, 'wsgi.input': io.BytesIO()}, lambda status, headers: None)
+    response.close()
+    timings.append(time.perf_counter() - began)
+    if response.status_code != 200:
+        sys.exit(f'{environ["PATH_INFO"]} returned {response.status_code}')
+print(json.dumps({
+    'import_ms': (ready - started) * 1000,
+    'first_request_ms': timings[0] * 1000,
+    'second_request_ms': timings[1] * 1000,
+    'modules': len(sys.modules),
+    'queries_kept': len(connection.queries_log),
+}))
+"""
+
+METRICS = ['process_ms', 'import_ms', 'first_request_ms', 'second_request_ms', 'modules', 'queries_kept']
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the WSGI application in fresh processes under each settings "
+        "profile and report import time and first-request latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10, help='Process starts per profile.')
+        parser.add_argument('--profile', action='append', dest='profiles', help='Settings module to start (repeatable).')
+        parser.add_argument('--output', help='Write results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite':
+            # The workers need a database file, not the in-memory default.
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'startup.sqlite3')
+        test_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            user = seed(users=1, appointments=200)[0]
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': '/appointments/',
+                'QUERY_STRING': 'limit=20',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'HTTP_HOST': 'localhost',
+                'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}',
+                'wsgi.url_scheme': 'http',
+            }
+            connection.close()
+            profiles = options['profiles'] or PROFILES
+            samples = {profile: {metric: [] for metric in METRICS} for profile in profiles}
+            # Profiles take turns so drift in machine load hits them alike; the
+            # first round writes bytecode for anything not yet compiled.
+            for run in range(options['runs'] + 1):
+                for profile in profiles:
+                    sample = self.start(profile, test_name, environ)
+                    if run:
+                        for metric in METRICS:
+                            samples[profile][metric].append(sample[metric])
+            result = {
+                'parameters': {'runs': options['runs']},
+                'profiles': {
+                    profile: {metric: percentile(sorted(values), 0.5) for metric, values in by_metric.items()}
+                    for profile, by_metric in samples.items()
+                },
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for profile, row in result['profiles'].items():
+            self.stdout.write(
+                f"{profile:<30} process={row['process_ms']:7.1f}ms import={row['import_ms']:7.1f}ms "
+                f"first_request={row['first_request_ms']:6.1f}ms second_request={row['second_request_ms']:5.1f}ms "
+                f"modules={row['modules']:5.0f} queries_kept={row['queries_kept']:.0f}"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+
+    def start(self, profile, database_name, environ):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': profile}
+        command = [sys.executable, '-c', WORKER, str(database_name), json.dumps(environ)]
+        started = time.perf_counter()
+        worker = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if worker.returncode:
+            raise CommandError(f'{profile} failed to start:\n{worker.stderr}')
+        return {**json.loads(worker.stdout.splitlines()[-1]), 'process_ms': elapsed * 1000}
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, time, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from appointments.models import Appointment
+from services.models import Service
+from work_hours.models import DAYS_OF_WEEK, WorkHour
+
+User = get_user_model()
+
+PASSWORD = 'bench-pass-123'
+SERVICE_CATALOG = [
+    ('Drain Cleaning', 60),
+    ('Leak Repair', 90),
+    ('Water Heater Install', 180),
+    ('Faucet Replacement', 45),
+    ('Sewer Inspection', 120),
+]
+STREETS = ['Main St', 'Oak Ave', 'Pine St', 'Cedar Ln', 'Elm St', 'Birch Rd', 'Maple Dr']
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'Dan', 'Eve', 'Frank', 'Grace', 'Hank', 'Ivy', 'Jon']
+BATCH_SIZE = 2000
+
+
+def seed(users=10, appointments=10000, rng_seed=1):
+    """
+    Populate the current database with ``users`` plumbers, each with a
+    service catalog and a Monday-Friday schedule, plus ``appointments``
+    bookings spaced three hours apart starting a year ago.
+    """
+    rng = random.Random(rng_seed)
+    password = make_password(PASSWORD)
+    plumbers = User.objects.bulk_create([
+        User(username=f'bench-plumber-{i}', password=password) for i in range(users)
+    ])
+    services = Service.objects.bulk_create([
+        Service(user=user, name=name, duration_minutes=minutes)
+        for user in plumbers for name, minutes in SERVICE_CATALOG
+    ])
+    WorkHour.objects.bulk_create([
+        WorkHour(user=user, day=day, start_time=time(8), end_time=time(17))
+        for user in plumbers for day, _ in DAYS_OF_WEEK[:5]
+    ])
+
+    # One booking per 3-hour block keeps bookings from overlapping.
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(days=365)
+    batch = []
+    for i in range(appointments):
+        service = rng.choice(services)
+        appointment = Appointment(
+            owner_id=service.user_id,
+            customer_name=f'{rng.choice(FIRST_NAMES)} {i}',
+            customer_phone=f'555-{rng.randrange(10000):04d}',
+            address=f'{rng.randrange(1, 9999)} {rng.choice(STREETS)}',
+            description='Seeded for benchmarking',
+            service=service,
+            scheduled_time=start + timedelta(hours=3 * i),
+        )
+        appointment.compute_end_time()
+        batch.append(appointment)
+        if len(batch) == BATCH_SIZE:
+            Appointment.objects.bulk_create(batch)
+            batch = []
+    Appointment.objects.bulk_create(batch)
+    return plumbers
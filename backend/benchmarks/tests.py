@@ -0,0 +1,58 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+
+from django.test import SimpleTestCase, TestCase
+from appointments.models import Appointment
+from services.models import Service
+from .harness import Benchmark, compare, percentile
+from .management.commands.bench_slots import SCHEDULE, book_schedule
+from .seed import seed
+
+
+class HarnessTests(SimpleTestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+    def test_benchmark_records_results(self):
+        calls = []
+        result = Benchmark(rounds=10, warmup=2)('noop', calls.append, 1)
+        self.assertEqual(len(calls), 12)
+        self.assertEqual(result['rounds'], 10)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_compare(self):
+        baseline = {'list': {'p50_ms': 10.0}, 'gone': {'p50_ms': 1.0}}
+        current = {'list': {'p50_ms': 5.0}, 'new': {'p50_ms': 1.0}}
+        self.assertEqual(list(compare(baseline, current)), [('list', 10.0, 5.0, -0.5)])
+
+
+class SeedTests(TestCase):
+
+    def test_seed_creates_non_overlapping_appointments(self):
+        seed(users=2, appointments=50)
+        appointments = list(Appointment.objects.order_by('scheduled_time'))
+        self.assertEqual(len(appointments), 50)
+        for earlier, later in zip(appointments, appointments[1:]):
+            self.assertLessEqual(earlier.end_time, later.scheduled_time)
+
+
+class SlotsWorkloadTests(SimpleTestCase):
+
+    def test_bookings_fill_working_windows_without_overlap(self):
+        services = [Service(duration_minutes=minutes) for minutes in (45, 60, 180)]
+        bookings = list(book_schedule(random.Random(1), services, date(2025, 1, 6), 7, timezone.utc))
+        windows = [
+            (datetime.combine(date(2025, 1, 6 + offset), start, timezone.utc),
+             datetime.combine(date(2025, 1, 6 + offset), end, timezone.utc))
+            for offset, day in enumerate(SCHEDULE) for start, end in SCHEDULE[day]
+        ]
+        intervals = [(start, start + timedelta(minutes=service.duration_minutes)) for service, start in bookings]
+        self.assertGreater(len(intervals), 2 * len(windows))
+        for start, end in intervals:
+            self.assertTrue(any(opens <= start and end <= closes for opens, closes in windows))
+        for (_, earlier_end), (later_start, _) in zip(intervals, intervals[1:]):
+            self.assertLessEqual(earlier_end, later_start)
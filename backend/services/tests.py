@@ -1,6 +1,8 @@
+from datetime import date
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
+from appointments.models import Appointment, DailyRollup
 from .models import Service
 
 User = get_user_model()
@@ -40,6 +42,30 @@ class ServiceTests(APITestCase):
         self.assertEqual(response.status_code, 204)
         self.assertEqual(Service.objects.count(), 0)
 
+    def test_duration_change_retimes_appointments(self):
+        service = Service.objects.create(user=self.user, name="Drain", duration_minutes=60)
+        appointment = Appointment.objects.create(
+            owner=self.user, customer_name="Ann", customer_phone="555-0100", address="1 Elm St",
+            service=service, scheduled_time="2025-06-02T09:00:00Z",
+        )
+        booking = {"customer_name": "Bo", "customer_phone": "555-0101", "address": "2 Elm St", "scheduled_time": "2025-06-02T10:30:00Z"}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f"/services/{service.id}/", {"duration_minutes": 120}, format="json")
+        self.assertEqual(response.status_code, 200)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.end_time.isoformat(), "2025-06-02T11:00:00+00:00")
+        self.assertEqual(DailyRollup.objects.get(owner=self.user, day=date(2025, 6, 2)).booked_minutes, 120)
+        self.assertEqual(self.client.post("/appointments/create/", booking, format="json").status_code, 409)
+
+        # Without a service the booking falls back to the default length
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f"/services/{service.id}/").status_code, 204)
+        appointment.refresh_from_db()
+        self.assertEqual(appointment.end_time.isoformat(), "2025-06-02T10:00:00+00:00")
+        self.assertEqual(DailyRollup.objects.get(owner=self.user, day=date(2025, 6, 2)).booked_minutes, 60)
+        self.assertEqual(self.client.post("/appointments/create/", booking, format="json").status_code, 201)
+
     def test_unauthenticated_access(self):
         self.client.credentials()  # Remove token
         response = self.client.get("/services/")
@@ -1,16 +1,31 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions
+from appointments.models import DEFAULT_APPOINTMENT_MINUTES
+from appointments.rollups import retime_appointments
+from backend.asyncapi import JSONResponse, async_api_view
+from backend.renderers import fast_renderers
+from backend.rows import FastListMixin, row_mapper
+from users.versions import APPOINTMENTS, SERVICES, bump_version, conditional_get
 from .models import Service
 from .serializers import ServiceSerializer
 
-class ServiceListCreateView(generics.ListCreateAPIView):
+class ServiceListCreateView(FastListMixin, generics.ListCreateAPIView):
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = fast_renderers()
 
     def get_queryset(self):
         return Service.objects.filter(user=self.request.user)
 
+    @method_decorator(conditional_get(SERVICES))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            bump_version(SERVICES, self.request.user.pk)
 
 
 class ServiceRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -19,3 +34,44 @@ class ServiceRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         return Service.objects.filter(user=self.request.user)
+
+    @method_decorator(conditional_get(SERVICES))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        previous_minutes = serializer.instance.duration_minutes
+        with transaction.atomic():
+            service = serializer.save()
+            if service.duration_minutes != previous_minutes:
+                if retime_appointments(service.appointments.all(), service.duration_minutes):
+                    bump_version(APPOINTMENTS, self.request.user.pk)
+            bump_version(SERVICES, self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # SET_NULL on appointments is a bulk UPDATE that skips auto_now and
+            # end_time; retiming first touches them for delta sync and ETags.
+            if retime_appointments(instance.appointments.all(), DEFAULT_APPOINTMENT_MINUTES):
+                bump_version(APPOINTMENTS, self.request.user.pk)
+            instance.delete()
+            bump_version(SERVICES, self.request.user.pk)
+
+
+@async_api_view
+@conditional_get(SERVICES)
+async def alist_services(request):
+    """Async GET for ``ServiceListCreateView`` in ASGI deployments."""
+    mapper = row_mapper(ServiceSerializer)
+    return JSONResponse(mapper.to_rows([row async for row in mapper.values(Service.objects.filter(user=request.user))]))
+
+
+@async_api_view
+@conditional_get(SERVICES)
+async def aget_service(request, pk):
+    """Async GET for ``ServiceRetrieveUpdateDestroyView`` in ASGI deployments."""
+    mapper = row_mapper(ServiceSerializer)
+    row = await mapper.values(Service.objects.filter(pk=pk, user=request.user)).afirst()
+    if row is None:
+        return JSONResponse({'detail': 'No Service matches the given query.'}, status=404)
+    return JSONResponse(mapper.to_rows([row])[0])
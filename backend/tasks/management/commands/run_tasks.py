@@ -0,0 +1,21 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks. Any number of workers can share the queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Tasks run at the same time.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls of an idle queue.')
+        parser.add_argument('--once', action='store_true', help='Exit once no task is due instead of polling.')
+
+    def handle(self, *args, **options):
+        worker = Worker(concurrency=options['concurrency'], poll_interval=options['poll_interval'])
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        self.stdout.write(f"Running tasks with concurrency {worker.concurrency}")
+        worker.run(once=options['once'])
@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FAILED = 'failed'
+STATUSES = [
+    (QUEUED, 'Queued'),
+    (RUNNING, 'Running'),
+    (FAILED, 'Failed'),
+]
+
+
+class Task(models.Model):
+    """
+    A queued call of a background function, run by the ``run_tasks`` worker.
+
+    Finished tasks are deleted, so the table only holds pending, running and
+    failed work. ``attempts`` counts runs started so far.
+    """
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=7, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
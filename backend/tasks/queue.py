@@ -0,0 +1,42 @@
+"""
+Enqueueing of background tasks.
+
+A task is any module-level function taking JSON-serializable keyword
+arguments. Decorate it with ``background`` and call ``func.enqueue(...)``
+from a request handler: the task row is inserted once the surrounding
+transaction commits, so the worker never sees work for data that was
+rolled back, and the handler returns without waiting for it.
+"""
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def task_name(func):
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, *, delay=None, max_attempts=DEFAULT_MAX_ATTEMPTS, **kwargs):
+    """Queue ``func(**kwargs)`` to run after the current transaction commits."""
+    task = Task(
+        name=task_name(func),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + (delay or timedelta(0)),
+    )
+    transaction.on_commit(task.save)
+    return task
+
+
+def background(func=None, *, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Give ``func`` an ``enqueue(**kwargs)`` method; it stays directly callable."""
+    if func is None:
+        return partial(background, max_attempts=max_attempts)
+    func.enqueue = partial(enqueue, func, max_attempts=max_attempts)
+    return func
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from .models import FAILED, QUEUED, RUNNING, Task
+from .queue import background
+from .worker import Worker, claim, execute, release_stale
+
+CALLS = []
+
+
+@background
+def record(value):
+    CALLS.append(value)
+
+
+@background(max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(value=1)
+            self.assertFalse(Task.objects.exists())
+        task = Task.objects.get()
+        self.assertEqual(task.name, 'tasks.tests.record')
+        self.assertEqual(task.kwargs, {'value': 1})
+        self.assertEqual(task.status, QUEUED)
+
+    def test_rolled_back_enqueue_is_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    record.enqueue(value=1)
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertFalse(Task.objects.exists())
+
+    def test_claim_runs_due_tasks_in_order(self):
+        now = timezone.now()
+        later = Task.objects.create(name='tasks.tests.record', kwargs={'value': 2}, run_after=now - timedelta(seconds=1))
+        first = Task.objects.create(name='tasks.tests.record', kwargs={'value': 1}, run_after=now - timedelta(seconds=2))
+        Task.objects.create(name='tasks.tests.record', kwargs={'value': 3}, run_after=now + timedelta(hours=1))
+
+        claimed = claim(5)
+        self.assertEqual([task.pk for task in claimed], [first.pk, later.pk])
+        self.assertEqual(Task.objects.filter(status=RUNNING, attempts=1).count(), 2)
+        self.assertEqual(claim(5), [])
+
+        for task in claimed:
+            execute(task)
+        self.assertEqual(CALLS, [1, 2])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            explode.enqueue()
+
+        with self.assertLogs('tasks.worker', 'ERROR'):
+            execute(claim(1)[0])
+        task = Task.objects.get()
+        self.assertEqual(task.status, QUEUED)
+        self.assertGreater(task.run_after, timezone.now() + timedelta(seconds=10))
+        self.assertIn('RuntimeError: boom', task.last_error)
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('tasks.worker', 'ERROR'):
+            execute(claim(1)[0])
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (FAILED, 2))
+
+    def test_release_stale_requeues_abandoned_tasks(self):
+        stale = timezone.now() - timedelta(hours=1)
+        requeued = Task.objects.create(name='tasks.tests.record', status=RUNNING, attempts=1, locked_at=stale)
+        exhausted = Task.objects.create(name='tasks.tests.record', status=RUNNING, attempts=5, locked_at=stale)
+        Task.objects.create(name='tasks.tests.record', status=RUNNING, attempts=1, locked_at=timezone.now())
+
+        self.assertEqual(release_stale(), 2)
+        requeued.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(requeued.status, QUEUED)
+        self.assertEqual(exhausted.status, FAILED)
+
+
+class WorkerTests(TransactionTestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_worker_drains_queue(self):
+        Task.objects.bulk_create(Task(name='tasks.tests.record', kwargs={'value': i}) for i in range(10))
+        Task.objects.create(name='tasks.tests.explode', max_attempts=1)
+
+        # One thread: SQLite test databases do not take concurrent writers.
+        with self.assertLogs('tasks.worker', 'ERROR'):
+            Worker(concurrency=1, poll_interval=0.01).run(once=True)
+
+        self.assertEqual(sorted(CALLS), list(range(10)))
+        self.assertEqual(list(Task.objects.values_list('name', 'status')), [('tasks.tests.explode', FAILED)])
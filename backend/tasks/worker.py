@@ -0,0 +1,127 @@
+"""
+The background task worker.
+
+The main thread claims due tasks and hands them to a pool of ``concurrency``
+threads, never claiming more than there are idle threads. Claiming locks
+the rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` and marks them running
+in the same transaction, so any number of worker processes can share one
+queue without running a task twice. A failed task is retried with
+exponential backoff until it runs out of attempts; a task whose worker died
+mid-run is released again once its lock times out.
+"""
+import logging
+import random
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import FAILED, QUEUED, RUNNING, Task
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+LOCK_TIMEOUT = timedelta(minutes=10)
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def retry_delay(attempts):
+    """Backoff before retry number ``attempts``: doubling, capped, with jitter."""
+    delay = min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim(limit):
+    """Lock up to ``limit`` due tasks, mark them running and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=QUEUED, run_after__lte=now)
+            .order_by('run_after', 'id')[:limit]
+        )
+        if tasks:
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                status=RUNNING, locked_at=now, attempts=F('attempts') + 1,
+            )
+    for task in tasks:
+        task.status, task.locked_at, task.attempts = RUNNING, now, task.attempts + 1
+    return tasks
+
+
+def record_failure(task, error):
+    if task.attempts >= task.max_attempts:
+        changes = {'status': FAILED}
+    else:
+        changes = {'status': QUEUED, 'run_after': timezone.now() + retry_delay(task.attempts)}
+    Task.objects.filter(pk=task.pk).update(locked_at=None, last_error=error, **changes)
+
+
+def execute(task):
+    """Run a claimed task; delete it on success, otherwise schedule a retry."""
+    try:
+        import_string(task.name)(**task.kwargs)
+    except Exception:
+        logger.exception("Task %s #%s failed (attempt %d of %d)", task.name, task.pk, task.attempts, task.max_attempts)
+        record_failure(task, traceback.format_exc())
+    else:
+        Task.objects.filter(pk=task.pk).delete()
+
+
+def run_task(task):
+    """``execute`` in a worker thread, then release its connection for the next task."""
+    try:
+        execute(task)
+    finally:
+        close_old_connections()
+
+
+def release_stale(timeout=LOCK_TIMEOUT):
+    """Give back tasks held longer than ``timeout`` by a worker that went away."""
+    stale = Task.objects.filter(status=RUNNING, locked_at__lt=timezone.now() - timeout)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=FAILED, locked_at=None, last_error='Lock timed out',
+    )
+    return stale.update(status=QUEUED, locked_at=None) + failed
+
+
+class Worker:
+    def __init__(self, concurrency=4, poll_interval=1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stopping = threading.Event()
+
+    def stop(self):
+        """Stop claiming; tasks already running are allowed to finish."""
+        self.stopping.set()
+
+    def run(self, once=False):
+        """Process tasks until ``stop()``, or with ``once`` until none are due."""
+        running = set()
+        next_sweep = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='task') as pool:
+            while not self.stopping.is_set():
+                if time.monotonic() >= next_sweep:
+                    release_stale()
+                    next_sweep = time.monotonic() + SWEEP_INTERVAL_SECONDS
+                idle = self.concurrency - len(running)
+                claimed = claim(idle) if idle else []
+                running.update(pool.submit(run_task, task) for task in claimed)
+                if running:
+                    done, running = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.exception() is not None:
+                            # The task stays locked and is retried once the lock times out.
+                            logger.error("Could not record a task result", exc_info=future.exception())
+                elif once:
+                    break
+                else:
+                    self.stopping.wait(self.poll_interval)
+        close_old_connections()
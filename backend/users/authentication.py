@@ -0,0 +1,115 @@
+"""
+JWT authentication without a user query on every request.
+
+``CachedJWTAuthentication`` validates tokens exactly like simplejwt's
+``JWTAuthentication`` but takes the user from the cache: the fields needed
+for permission checks are cached per user id for ``AUTH_USER_CACHE_SECONDS``
+and the user is rebuilt from them with every other field deferred, so it
+still loads on first access. Saving or deleting a user drops its entry.
+
+``revoke_token`` records a single token in ``RevokedToken`` until it
+expires. Whether a token is revoked is looked up once and then cached too,
+for at most ``AUTH_USER_CACHE_SECONDS`` while it is not.
+
+Entries live in the default cache. With the local-memory default each
+process has its own, so a user change or revocation made in one process
+reaches the others within ``AUTH_USER_CACHE_SECONDS``; point CACHES at
+Redis for immediate effect everywhere.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from backend.routers import reading_from_primary
+from .models import RevokedToken
+
+IDENTITY_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def revoked_key(jti):
+    return f'auth:revoked:{jti}'
+
+
+def forget_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+def remaining_seconds(token):
+    return token['exp'] - int(timezone.now().timestamp())
+
+
+def revoke_token(token):
+    """Reject ``token`` (a validated simplejwt token) from now until it expires."""
+    remaining = remaining_seconds(token)
+    if remaining <= 0:
+        return
+    now = timezone.now()
+    RevokedToken.objects.filter(expires_at__lte=now).delete()
+    RevokedToken.objects.update_or_create(
+        jti=token[api_settings.JTI_CLAIM], defaults={'expires_at': now + timedelta(seconds=remaining)},
+    )
+    cache.set(revoked_key(token[api_settings.JTI_CLAIM]), True, remaining)
+
+
+def is_revoked(token):
+    """Look ``token`` up in ``RevokedToken`` and cache the answer."""
+    jti = token[api_settings.JTI_CLAIM]
+    with reading_from_primary():
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+    remaining = remaining_seconds(token)
+    timeout = remaining if revoked else min(remaining, settings.AUTH_USER_CACHE_SECONDS)
+    if timeout > 0:
+        cache.set(revoked_key(jti), revoked, timeout)
+    return revoked
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.identity_fields = [
+            field.attname for field in self.user_model._meta.concrete_fields if field.attname in IDENTITY_FIELDS
+        ]
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        cached = cache.get_many([user_key(user_id), revoked_key(jti)])
+        revoked = cached.get(revoked_key(jti))
+        if revoked is None and jti is not None:
+            revoked = is_revoked(validated_token)
+        if revoked:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        identity = cached.get(user_key(user_id))
+        if identity is None:
+            with reading_from_primary():
+                user = super().get_user(validated_token)
+            cache.set(user_key(user_id), self.identity(user), settings.AUTH_USER_CACHE_SECONDS)
+            return user
+
+        values, password_hash = identity
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return self.user_model.from_db(router.db_for_read(self.user_model), self.identity_fields, values)
+
+    def identity(self, user):
+        """The cached form of ``user``: its identity field values and password hash check."""
+        password_hash = get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None
+        return [getattr(user, field) for field in self.identity_fields], password_hash
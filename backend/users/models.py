@@ -1,3 +1,21 @@
 from django.db import models
 
 # Create your models here.
+class ChangeVersion(models.Model):
+    """
+    Monotonic write counter for one resource, optionally scoped to a user.
+
+    Conditional GETs compare against this single row instead of reading the
+    resource's own tables.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key}@{self.version}"
+
+
+class RevokedToken(models.Model):
+    """An access token logged out before it expires, kept until it would have."""
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
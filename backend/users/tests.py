@@ -1,6 +1,17 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from appointments.models import Appointment
+from services.models import Service
+from .authentication import CachedJWTAuthentication, forget_user
+from .versions import SERVICES, bump_version
+
+User = get_user_model()
 
 class UserAuthTests(APITestCase):
 
@@ -36,3 +47,120 @@ class UserAuthTests(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertIn('detail', response.data)
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="etaguser", password="pass1234")
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(refresh.access_token))
+
+    def assertNotModified(self, url, etag):
+        with self.assertNumQueries(1):  # version lookup only; the user is cached
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_services_etag_changes_on_write(self):
+        first = self.client.get("/services/")
+        etag = first["ETag"]
+        self.assertNotModified("/services/", etag)
+
+        self.client.post("/services/", {"name": "Drain", "duration_minutes": 30}, format="json")
+        response = self.client.get("/services/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data), 1)
+
+    def test_work_hours_etag_changes_on_write(self):
+        etag = self.client.get("/work_hours/")["ETag"]
+        self.assertNotModified("/work_hours/", etag)
+        self.client.post("/work_hours/", {"monday": ["09:00", "17:00"]}, format="json")
+        self.assertEqual(self.client.get("/work_hours/", HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get("/services/")["ETag"]
+        other = User.objects.create_user(username="other", password="pass1234")
+        Service.objects.create(user=other, name="Other", duration_minutes=30)
+        bump_version(SERVICES, other.pk)
+        self.assertNotModified("/services/", etag)
+
+    def test_appointments_etag_varies_by_query(self):
+        url = reverse('list_appointments')
+        etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(self.client.get(url, {'limit': 5})["ETag"], etag)
+        self.client.post(reverse('create_appointment'), {
+            "customer_name": "Ray",
+            "customer_phone": "555-0200",
+            "address": "8 Eighth St",
+            "scheduled_time": "2025-06-01T10:00:00Z",
+        }, format='json')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_appointments_etag_changes_when_their_service_is_deleted(self):
+        service = Service.objects.create(user=self.user, name="Drain", duration_minutes=30)
+        Appointment.objects.create(
+            owner=self.user, service=service, customer_name="Ray", customer_phone="555-0200",
+            address="8 Eighth St", scheduled_time="2025-06-01T10:00:00Z",
+        )
+        url = reverse('list_appointments')
+        etag = self.client.get(url)["ETag"]
+        self.client.delete(f"/services/{service.pk}/")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['results'][0]['service'])
+
+
+class CachedAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cacheduser", password="pass1234", email="c@example.com")
+        self.token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(self.token))
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len([query for query in queries if 'auth_user' in query['sql']]), len(queries)
+
+    def test_user_query_saved_after_first_request(self):
+        for url in ("/services/", "/work_hours/"):
+            self.client.get(url)  # warm the view's own caches
+            forget_user(self.user.pk)
+            uncached_user_queries, uncached_total = self.user_queries(url)
+            user_queries, total = self.user_queries(url)
+            self.assertEqual(uncached_user_queries, 1)
+            self.assertEqual(user_queries, 0)
+            self.assertEqual(total, uncached_total - 1)
+
+    def test_cached_user_defers_other_fields(self):
+        authentication = CachedJWTAuthentication()
+        authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = authentication.get_user(self.token)
+        self.assertEqual((user.pk, user.username, user.is_active), (self.user.pk, "cacheduser", True))
+        self.assertIn('email', user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "c@example.com")
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.assertEqual(self.client.get("/services/").status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/services/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_is_rejected(self):
+        self.assertEqual(self.client.get("/services/").status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('token_revoke'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get("/services/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['code'], 'token_revoked')
+        # Another worker's cache has never seen the revocation
+        cache.clear()
+        self.assertEqual(self.client.get("/services/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.assertEqual(self.client.get("/services/").status_code, status.HTTP_200_OK)
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import register_user
+from .views import register_user, revoke_access_token
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 urlpatterns = [
     path('register/', register_user, name='register_user'),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revoke/', revoke_access_token, name='token_revoke'),
 ]
@@ -0,0 +1,87 @@
+"""
+Per-user, per-resource change versions backing strong ETags.
+
+Every write path calls ``bump_version`` inside its transaction; read views
+wrap their GET handler with ``conditional_get`` so a matching
+``If-None-Match`` is answered with ``304 Not Modified`` after a single
+primary-key lookup, before any query or serialization of the resource.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+
+from .models import ChangeVersion
+
+APPOINTMENTS = 'appointments'
+SERVICES = 'services'
+WORK_HOURS = 'work_hours'
+
+
+def version_key(resource, user_id=None):
+    return resource if user_id is None else f'{resource}:{user_id}'
+
+
+def get_version(resource, user_id=None):
+    try:
+        return ChangeVersion.objects.values_list('version', flat=True).get(key=version_key(resource, user_id))
+    except ChangeVersion.DoesNotExist:
+        return 0
+
+
+async def aget_version(resource, user_id=None):
+    try:
+        return await ChangeVersion.objects.values_list('version', flat=True).aget(key=version_key(resource, user_id))
+    except ChangeVersion.DoesNotExist:
+        return 0
+
+
+def bump_version(resource, user_id=None):
+    key = version_key(resource, user_id)
+    if ChangeVersion.objects.filter(key=key).update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ChangeVersion.objects.create(key=key, version=1)
+    except IntegrityError:
+        # Another writer created the row first
+        ChangeVersion.objects.filter(key=key).update(version=F('version') + 1)
+
+
+def conditional_get(resource, per_user=True):
+    """
+    Decorate a DRF GET handler with ETag support for ``resource``.
+
+    The ETag covers the resource version, the user, the full path and the
+    Accept header, so every distinct response gets its own tag. Async views
+    are supported too; their version lookup uses the async ORM.
+    """
+    def tag(request, version):
+        user_id = request.user.pk if per_user else None
+        raw = f"{resource}:{user_id}:{version}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def etag(request, *args, **kwargs):
+        return tag(request, get_version(resource, request.user.pk if per_user else None))
+
+    def decorator(view):
+        if not iscoroutinefunction(view):
+            return condition(etag_func=etag)(view)
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag_value = quote_etag(tag(request, await aget_version(resource, request.user.pk if per_user else None)))
+            response = get_conditional_response(request, etag=etag_value)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                response.headers.setdefault('ETag', etag_value)
+            return response
+        return wrapper
+
+    return decorator
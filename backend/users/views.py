@@ -1,6 +1,8 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from .authentication import revoke_token
 from .serializers import UserSerializer
 
 @api_view(['POST'])
@@ -10,3 +12,10 @@ def register_user(request):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def revoke_access_token(request):
+    """Log out the token this request was made with."""
+    revoke_token(request.auth)
+    return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,104 @@
+"""
+Per-user cache of weekly work hours.
+
+Each user's schedule is stored as a tuple of ``(id, day, start_time,
+end_time)`` rows in the Django cache, keyed by the user's ``WORK_HOURS``
+change version. Writers call ``invalidate`` from inside their transaction,
+which bumps that version; readers only see the new version once the write
+has committed, so a schedule cached by a reader that raced the write sits
+under the old key and is never read again. Superseded entries simply expire.
+"""
+import threading
+
+from django.core.cache import cache
+
+from backend.routers import reading_from_primary
+from users.versions import WORK_HOURS, aget_version, bump_version, get_version
+from .models import WorkHour
+
+CACHE_TIMEOUT = 60 * 60
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _record(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def cache_key(user_id, version):
+    return f'work_hours:{user_id}:{version}'
+
+
+def get_schedule(user_id):
+    """Return the user's ``(id, day, start_time, end_time)`` rows, cached."""
+    with reading_from_primary():
+        key = cache_key(user_id, get_version(WORK_HOURS, user_id))
+    schedule = cache.get(key)
+    if schedule is not None:
+        _record('hits')
+        return schedule
+    _record('misses')
+    with reading_from_primary():
+        schedule = tuple(
+            WorkHour.objects.filter(user_id=user_id)
+            .order_by('id')
+            .values_list('id', 'day', 'start_time', 'end_time')
+        )
+    cache.set(key, schedule, CACHE_TIMEOUT)
+    return schedule
+
+
+async def aget_schedule(user_id):
+    """Async ``get_schedule``, sharing its cache entries."""
+    with reading_from_primary():
+        key = cache_key(user_id, await aget_version(WORK_HOURS, user_id))
+    schedule = await cache.aget(key)
+    if schedule is not None:
+        _record('hits')
+        return schedule
+    _record('misses')
+    with reading_from_primary():
+        schedule = tuple([
+            row async for row in WorkHour.objects.filter(user_id=user_id)
+            .order_by('id')
+            .values_list('id', 'day', 'start_time', 'end_time')
+        ])
+    await cache.aset(key, schedule, CACHE_TIMEOUT)
+    return schedule
+
+
+def get_weekly_hours(user_id):
+    """Return the user's schedule as ``{day: [(start_time, end_time), ...]}``."""
+    weekly_hours = {}
+    for _, day, start_time, end_time in get_schedule(user_id):
+        weekly_hours.setdefault(day, []).append((start_time, end_time))
+    return weekly_hours
+
+
+def to_rows(schedule):
+    return [
+        {"id": pk, "day": day, "start_time": start_time.isoformat(), "end_time": end_time.isoformat()}
+        for pk, day, start_time, end_time in schedule
+    ]
+
+
+def get_rows(user_id):
+    """Return the user's schedule in ``WorkHourSerializer`` output form."""
+    return to_rows(get_schedule(user_id))
+
+
+async def aget_rows(user_id):
+    return to_rows(await aget_schedule(user_id))
+
+
+def invalidate(user_id):
+    """Move ``user_id`` to a new cache key; call inside the writing transaction."""
+    bump_version(WORK_HOURS, user_id)
+    _record('invalidations')
+
+
+def stats():
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,61 @@
+from django.utils.dateparse import parse_time
+from .models import DAYS_OF_WEEK
+
+VALID_DAYS = {day for day, _ in DAYS_OF_WEEK}
+
+
+def parse_schedule(data):
+    """
+    Turn the submitted ``{day: [start, end]}`` payload into
+    ``{day: (start_time, end_time)}``, skipping entries without two times.
+    Raises ``ValueError`` for a payload that is not an object, unknown days,
+    or times that are not a list of parseable times.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected an object mapping days to [start, end].")
+    schedule = {}
+    for day, times in data.items():
+        if not isinstance(times, list):
+            raise ValueError(f"Invalid times for {day}.")
+        if len(times) != 2:
+            continue
+        if day not in VALID_DAYS:
+            raise ValueError(f"Invalid day: {day}")
+        try:
+            start_time, end_time = parse_time(times[0]), parse_time(times[1])
+        except (TypeError, ValueError):
+            start_time = end_time = None
+        if start_time is None or end_time is None:
+            raise ValueError(f"Invalid times for {day}.")
+        schedule[day] = (start_time, end_time)
+    return schedule
+
+
+def diff_schedule(existing, schedule):
+    """
+    Compare existing ``WorkHour`` rows against a parsed schedule.
+
+    Returns ``(to_create, to_update, to_delete)``: ``(day, start, end)``
+    tuples to insert, rows with new times assigned, and rows to remove.
+    A day keeps its first row (by id) when only its times changed.
+    """
+    rows_by_day = {}
+    for row in sorted(existing, key=lambda row: row.pk):
+        rows_by_day.setdefault(row.day, []).append(row)
+
+    to_create, to_update, to_delete = [], [], []
+    for day, rows in rows_by_day.items():
+        if day not in schedule:
+            to_delete.extend(rows)
+            continue
+        start_time, end_time = schedule[day]
+        keep = next((row for row in rows if (row.start_time, row.end_time) == (start_time, end_time)), rows[0])
+        to_delete.extend(row for row in rows if row is not keep)
+        if (keep.start_time, keep.end_time) != (start_time, end_time):
+            keep.start_time, keep.end_time = start_time, end_time
+            to_update.append(keep)
+
+    for day, (start_time, end_time) in schedule.items():
+        if day not in rows_by_day:
+            to_create.append((day, start_time, end_time))
+    return to_create, to_update, to_delete
@@ -1,12 +1,16 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
+from . import cache as work_hours_cache
 from .models import WorkHour
 
 User = get_user_model()
 
 class WorkHourTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username="testuser", password="pass1234")
         refresh = RefreshToken.for_user(self.user)
         self.access_token = str(refresh.access_token)
@@ -52,3 +56,94 @@ class WorkHourTests(APITestCase):
         delete_resp = self.client.delete("/work_hours/")
         self.assertEqual(delete_resp.status_code, 404)
         self.assertEqual(delete_resp.data['detail'], "No work hours to delete.")
+
+
+    def test_get_work_hours_served_from_cache(self):
+        WorkHour.objects.create(user=self.user, day="monday", start_time="09:00", end_time="17:00")
+        self.client.get("/work_hours/")
+        before = work_hours_cache.stats()
+        with self.assertNumQueries(2):  # the version for the ETag and the cache key; the user is cached
+            response = self.client.get("/work_hours/")
+        self.assertEqual(response.data[0]['start_time'], '09:00:00')
+        after = work_hours_cache.stats()
+        self.assertEqual(after['hits'], before['hits'] + 1)
+        self.assertEqual(after['misses'], before['misses'])
+
+    def test_post_invalidates_cached_work_hours(self):
+        self.client.post("/work_hours/", {"monday": ["09:00", "17:00"]}, format="json")
+        self.assertEqual(len(self.client.get("/work_hours/").data), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/work_hours/", {"monday": ["08:00", "12:00"], "friday": ["08:00", "12:00"]}, format="json")
+        get_resp = self.client.get("/work_hours/")
+        self.assertEqual(len(get_resp.data), 2)
+        self.assertEqual(get_resp.data[0]['start_time'], '08:00:00')
+
+    def test_schedule_cached_during_a_write_is_not_served_after_it(self):
+        WorkHour.objects.create(user=self.user, day="monday", start_time="09:00", end_time="17:00")
+        stale = work_hours_cache.get_schedule(self.user.pk)
+        with transaction.atomic():
+            WorkHour.objects.filter(user=self.user).update(start_time="08:00")
+            work_hours_cache.invalidate(self.user.pk)
+        # A reader that loaded the old rows before the commit stores them late
+        cache.set(work_hours_cache.cache_key(self.user.pk, 0), stale)
+        self.assertEqual(str(work_hours_cache.get_schedule(self.user.pk)[0][2]), '08:00:00')
+
+    def test_delete_invalidates_cached_work_hours(self):
+        self.client.post("/work_hours/", {"monday": ["09:00", "17:00"]}, format="json")
+        self.assertEqual(len(self.client.get("/work_hours/").data), 1)
+        self.client.delete("/work_hours/")
+        self.assertEqual(self.client.get("/work_hours/").data, [])
+
+    def test_cache_stats_requires_admin(self):
+        response = self.client.get("/work_hours/cache_stats/")
+        self.assertEqual(response.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/work_hours/cache_stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'hits', 'misses', 'invalidations'})
+        # The counters change on every read, so they must never be served as 304.
+        self.assertNotIn('ETag', response.headers)
+
+    def test_post_applies_only_changed_days(self):
+        monday = WorkHour.objects.create(user=self.user, day="monday", start_time="09:00", end_time="17:00")
+        tuesday = WorkHour.objects.create(user=self.user, day="tuesday", start_time="10:00", end_time="16:00")
+        WorkHour.objects.create(user=self.user, day="wednesday", start_time="10:00", end_time="16:00")
+
+        data = {
+            "monday": ["09:00", "17:00"],
+            "tuesday": ["08:00", "12:00"],
+            "thursday": ["07:00", "15:00"],
+        }
+        post_resp = self.client.post("/work_hours/", data, format="json")
+        self.assertEqual(post_resp.status_code, 201)
+        self.assertEqual(post_resp.data["created"], ["thursday"])
+        self.assertEqual(post_resp.data["updated"], ["tuesday"])
+        self.assertEqual(post_resp.data["deleted"], ["wednesday"])
+
+        rows = {row.day: row for row in WorkHour.objects.filter(user=self.user)}
+        self.assertEqual(set(rows), {"monday", "tuesday", "thursday"})
+        # Unchanged and updated days keep their rows
+        self.assertEqual(rows["monday"].pk, monday.pk)
+        self.assertEqual(rows["tuesday"].pk, tuesday.pk)
+        self.assertEqual(str(rows["tuesday"].start_time), "08:00:00")
+
+    def test_post_unchanged_schedule_writes_nothing(self):
+        WorkHour.objects.create(user=self.user, day="monday", start_time="09:00", end_time="17:00")
+        # revocation and user lookups, savepoint pair and the locking select only
+        with self.assertNumQueries(5):
+            post_resp = self.client.post("/work_hours/", {"monday": ["09:00", "17:00"]}, format="json")
+        self.assertEqual(post_resp.status_code, 201)
+        self.assertEqual(post_resp.data["created"] + post_resp.data["updated"] + post_resp.data["deleted"], [])
+
+    def test_post_invalid_schedule(self):
+        for data in (
+            {"someday": ["09:00", "17:00"]},
+            {"monday": ["nine", "17:00"]},
+            {"monday": 9},
+            {"monday": {"start": "09:00", "end": "17:00"}},
+            [["monday", "09:00", "17:00"]],
+        ):
+            post_resp = self.client.post("/work_hours/", data, format="json")
+            self.assertEqual(post_resp.status_code, 400)
+            self.assertIn("detail", post_resp.data)
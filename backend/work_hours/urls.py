@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import WorkHourView
+from .views import WorkHourCacheStatsView, WorkHourView
 
 urlpatterns = [
     path("", WorkHourView.as_view()),
+    path("cache_stats/", WorkHourCacheStatsView.as_view()),
 ]
@@ -1,38 +1,82 @@
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.utils.decorators import method_decorator
+from backend.asyncapi import JSONResponse, async_api_view
+from users.versions import WORK_HOURS, conditional_get
+from .cache import aget_rows, get_rows, invalidate, stats
+from .diff import diff_schedule, parse_schedule
 from .models import WorkHour
-from .serializers import WorkHourSerializer
 from django.db import transaction
 
+def save_schedule(user, schedule):
+    """Replace ``user``'s work hours with ``schedule``; call inside a transaction."""
+    existing = list(WorkHour.objects.select_for_update().filter(user=user))
+    to_create, to_update, to_delete = diff_schedule(existing, schedule)
+    if to_delete:
+        # Deleted first so an update or insert can reuse a freed unique key
+        WorkHour.objects.filter(pk__in=[row.pk for row in to_delete]).delete()
+    if to_update:
+        WorkHour.objects.bulk_update(to_update, ["start_time", "end_time"])
+    if to_create:
+        WorkHour.objects.bulk_create([
+            WorkHour(user=user, day=day, start_time=start_time, end_time=end_time)
+            for day, start_time, end_time in to_create
+        ])
+    if to_create or to_update or to_delete:
+        invalidate(user.pk)
+    return {
+        "status": "updated",
+        "created": sorted(day for day, _, _ in to_create),
+        "updated": sorted(row.day for row in to_update),
+        "deleted": sorted({row.day for row in to_delete} - schedule.keys()),
+    }
+
+
+def clear_schedule(user):
+    """Delete all of ``user``'s work hours and return how many there were."""
+    deleted_count, _ = WorkHour.objects.filter(user=user).delete()
+    if deleted_count:
+        invalidate(user.pk)
+    return deleted_count
+
+
 class WorkHourView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(conditional_get(WORK_HOURS))
     def get(self, request):
-        hours = WorkHour.objects.filter(user=request.user)
-        serializer = WorkHourSerializer(hours, many=True)
-        return Response(serializer.data)
+        return Response(get_rows(request.user.pk))
 
     def post(self, request):
         data = request.data  # Expecting dict with keys for each day
+        try:
+            schedule = parse_schedule(data)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
         with transaction.atomic():
-            WorkHour.objects.filter(user=request.user).delete()
-            entries = []
-            for day, times in data.items():
-                if len(times) != 2:
-                    continue
-                entries.append(WorkHour(
-                    user=request.user,
-                    day=day,
-                    start_time=times[0],
-                    end_time=times[1]
-                ))
-            WorkHour.objects.bulk_create(entries)
-        return Response({"status": "updated"}, status=201)
+            changes = save_schedule(request.user, schedule)
+        return Response(changes, status=201)
 
     def delete(self, request):
-        deleted_count, _ = WorkHour.objects.filter(user=request.user).delete()
+        with transaction.atomic():
+            deleted_count = clear_schedule(request.user)
         if deleted_count == 0:
             return Response({"detail": "No work hours to delete."}, status=status.HTTP_404_NOT_FOUND)
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@async_api_view
+@conditional_get(WORK_HOURS)
+async def aget_work_hours(request):
+    """Async GET for ``WorkHourView`` in ASGI deployments."""
+    return JSONResponse(await aget_rows(request.user.pk))
+
+
+class WorkHourCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(stats())
@@ -1,4 +1,4 @@
-import { API_BASE_URL } from "@/utils/config";
+import { apiFetch, AuthError } from "@/utils/api/client";
 import { useLocalSearchParams, useRouter } from "expo-router";
 import React, { useEffect, useState } from "react";
 import {
@@ -34,9 +34,7 @@ export default function AppointmentDetail() {
 
     async function fetchAppointment() {
       try {
-        const response = await fetch(
-          `${API_BASE_URL}/appointments/${id}/details/`
-        );
+        const response = await apiFetch(`/appointments/${id}/details/`);
         if (response.ok) {
           const data = await response.json();
           setAppointment(data);
@@ -45,6 +43,10 @@ export default function AppointmentDetail() {
           router.back(); // or navigate back to appointments list
         }
       } catch (error) {
+        if (error instanceof AuthError) {
+          router.replace("/");
+          return;
+        }
         Alert.alert("Network Error", "Failed to fetch appointment");
         router.back();
       } finally {
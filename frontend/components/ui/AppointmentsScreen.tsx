@@ -1,7 +1,7 @@
-import { API_BASE_URL } from "@/utils/config";
+import { apiFetch, AuthError, logout } from "@/utils/api/client";
 import { useFocusEffect } from "@react-navigation/native";
 import { useRouter } from "expo-router";
-import { useCallback, useState } from "react";
+import { useCallback, useRef, useState } from "react";
 import {
   ActivityIndicator,
   Alert,
@@ -24,6 +24,11 @@ export default function AppointmentsScreen() {
   const router = useRouter();
   const [appointments, setAppointments] = useState<Appointment[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // ETag of the last list we rendered, so refocusing can get a 304 instead
+  const etagRef = useRef<string | null>(null);
+  // Keyset cursor of the page after the last one rendered; null at the end
+  const nextCursorRef = useRef<string | null>(null);
 
   useFocusEffect(
     useCallback(() => {
@@ -34,24 +39,62 @@ export default function AppointmentsScreen() {
   const fetchAppointments = async () => {
     try {
       setLoading(true);
-      const res = await fetch(`${API_BASE_URL}/appointments/`);
+      const headers: Record<string, string> = {};
+      if (etagRef.current) headers["If-None-Match"] = etagRef.current;
+      const res = await apiFetch("/appointments/", { headers });
+      if (res.status === 304) return;
+      if (!res.ok) throw new Error(`Failed to load appointments (${res.status})`);
       const data = await res.json();
-      setAppointments(data);
+      etagRef.current = res.headers?.get("ETag") ?? null;
+      nextCursorRef.current = data.next_cursor;
+      setAppointments(data.results);
     } catch (err) {
+      if (err instanceof AuthError) {
+        router.replace("/");
+        return;
+      }
       console.error("Failed to load appointments", err);
+      Alert.alert("Error", "Failed to load appointments.");
     } finally {
       setLoading(false);
     }
   };
 
+  const fetchMoreAppointments = async () => {
+    const cursor = nextCursorRef.current;
+    if (!cursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const res = await apiFetch(
+        `/appointments/?cursor=${encodeURIComponent(cursor)}`
+      );
+      if (!res.ok) throw new Error(`Failed to load appointments (${res.status})`);
+      const data = await res.json();
+      nextCursorRef.current = data.next_cursor;
+      setAppointments((loaded) => [...loaded, ...data.results]);
+    } catch (err) {
+      if (err instanceof AuthError) {
+        router.replace("/");
+        return;
+      }
+      console.error("Failed to load more appointments", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const deleteAppointment = async (id: number) => {
     try {
-      const res = await fetch(`${API_BASE_URL}/appointments/${id}/`, {
+      const res = await apiFetch(`/appointments/${id}/`, {
         method: "DELETE",
       });
       if (!res.ok) throw new Error("Failed to delete");
       fetchAppointments();
     } catch (err) {
+      if (err instanceof AuthError) {
+        router.replace("/");
+        return;
+      }
       Alert.alert("Error", "Failed to delete appointment.");
     }
   };
@@ -68,6 +111,7 @@ export default function AppointmentsScreen() {
   };
 
   const handleLogout = () => {
+    logout();
     Alert.alert("Logout", "You have been logged out.", [
       { text: "OK", onPress: () => router.replace("/") },
     ]);
@@ -85,8 +129,12 @@ export default function AppointmentsScreen() {
     <SafeAreaView style={styles.container}>
       <Text style={styles.title}>Upcoming Appointments</Text>
       <FlatList
+        testID="appointments-list"
         data={appointments}
         keyExtractor={(item) => item.id.toString()}
+        onEndReached={fetchMoreAppointments}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={loadingMore ? <ActivityIndicator /> : null}
         renderItem={({ item }) => (
           <View
             style={{
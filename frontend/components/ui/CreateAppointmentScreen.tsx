@@ -1,4 +1,4 @@
-import { API_BASE_URL } from "@/utils/config";
+import { apiFetch, AuthError } from "@/utils/api/client";
 import DateTimePicker from "@react-native-community/datetimepicker";
 import { useFocusEffect } from "@react-navigation/native";
 import { useRouter } from "expo-router";
@@ -125,7 +125,7 @@ export default function CreateAppointmentScreen() {
     };
 
     try {
-      const response = await fetch(`${API_BASE_URL}/appointments/create/`, {
+      const response = await apiFetch("/appointments/create/", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -141,6 +141,10 @@ export default function CreateAppointmentScreen() {
         Alert.alert("Error", JSON.stringify(error));
       }
     } catch (err) {
+      if (err instanceof AuthError) {
+        router.replace("/");
+        return;
+      }
       Alert.alert("Network error", "Could not connect to backend");
     }
   };
@@ -1,4 +1,5 @@
 import { login } from "@/utils/api/auth";
+import { setTokens } from "@/utils/api/session";
 import { useRouter } from "expo-router";
 import React, { useState } from "react";
 import {
@@ -26,7 +27,7 @@ export default function LoginScreen() {
     setLoading(true);
     try {
       const tokens = await login(username, password);
-      // TODO: Save tokens in AsyncStorage or Context
+      setTokens(tokens);
       router.replace("/appointments"); // Navigate to home screen
     } catch (error: any) {
       Alert.alert("Login failed", error.message || "Unknown error");
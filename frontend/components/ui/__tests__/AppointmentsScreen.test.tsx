@@ -3,6 +3,7 @@ import { NavigationContainer } from "@react-navigation/native";
 import { fireEvent, render, waitFor } from "@testing-library/react-native";
 import React from "react";
 import { Alert } from "react-native";
+import { clearTokens, setTokens } from "@/utils/api/session";
 import AppointmentsScreen from "../AppointmentsScreen";
 
 // Shared mock router instance for consistency
@@ -35,6 +36,7 @@ const renderWithNavigation = () => {
 describe("AppointmentsScreen", () => {
   beforeEach(() => {
     jest.clearAllMocks();
+    clearTokens();
 
     // Default fetch mock returns one appointment on GET
     mockFetch.mockImplementation((url, options) => {
@@ -46,14 +48,17 @@ describe("AppointmentsScreen", () => {
       return Promise.resolve({
         ok: true,
         json: () =>
-          Promise.resolve([
-            {
-              id: 1,
-              customer_name: "John Doe",
-              address: "123 Main St",
-              scheduled_time: "2025-06-01T10:00:00Z",
-            },
-          ]),
+          Promise.resolve({
+            results: [
+              {
+                id: 1,
+                customer_name: "John Doe",
+                address: "123 Main St",
+                scheduled_time: "2025-06-01T10:00:00Z",
+              },
+            ],
+            next_cursor: null,
+          }),
       });
     });
   });
@@ -66,6 +71,79 @@ describe("AppointmentsScreen", () => {
     expect(getByText(/2025/)).toBeTruthy(); // Basic check for formatted date
   });
 
+  it("sends the access token", async () => {
+    setTokens({ access: "access-token", refresh: "refresh-token" });
+    const { getByText } = renderWithNavigation();
+    await waitFor(() => getByText("John Doe"));
+    expect(mockFetch.mock.calls[0][1].headers.Authorization).toBe(
+      "Bearer access-token"
+    );
+  });
+
+  it("returns to login when the session cannot be refreshed", async () => {
+    setTokens({ access: "expired", refresh: "expired" });
+    mockFetch.mockResolvedValue({ ok: false, status: 401 });
+    renderWithNavigation();
+    await waitFor(() => expect(mockRouter.replace).toHaveBeenCalledWith("/"));
+    // The list request and one refresh attempt
+    expect(mockFetch).toHaveBeenCalledTimes(2);
+  });
+
+  it("alerts instead of rendering a failed response", async () => {
+    mockFetch.mockResolvedValue({ ok: false, status: 500 });
+    renderWithNavigation();
+    await waitFor(() =>
+      expect(Alert.alert).toHaveBeenCalledWith(
+        "Error",
+        "Failed to load appointments."
+      )
+    );
+  });
+
+  it("loads the next page when the list is scrolled to the end", async () => {
+    mockFetch.mockImplementation((url) =>
+      Promise.resolve({
+        ok: true,
+        json: () =>
+          Promise.resolve(
+            url.includes("cursor=")
+              ? {
+                  results: [
+                    {
+                      id: 2,
+                      customer_name: "Jane Roe",
+                      address: "9 Oak Ave",
+                      scheduled_time: "2025-05-01T10:00:00Z",
+                    },
+                  ],
+                  next_cursor: null,
+                }
+              : {
+                  results: [
+                    {
+                      id: 1,
+                      customer_name: "John Doe",
+                      address: "123 Main St",
+                      scheduled_time: "2025-06-01T10:00:00Z",
+                    },
+                  ],
+                  next_cursor: "page/2",
+                }
+          ),
+      })
+    );
+    const { getByTestId, getByText } = renderWithNavigation();
+    await waitFor(() => getByText("John Doe"));
+    fireEvent(getByTestId("appointments-list"), "onEndReached");
+    await waitFor(() => getByText("Jane Roe"));
+    expect(getByText("John Doe")).toBeTruthy();
+    expect(mockFetch.mock.calls[1][0]).toContain("cursor=page%2F2");
+
+    // The last page has no cursor, so reaching the end again fetches nothing
+    fireEvent(getByTestId("appointments-list"), "onEndReached");
+    expect(mockFetch).toHaveBeenCalledTimes(2);
+  });
+
   it("navigates to appointment detail on press", async () => {
     const { getByText } = renderWithNavigation();
     await waitFor(() => getByText("John Doe"));
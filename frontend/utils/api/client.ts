@@ -0,0 +1,66 @@
+// frontend/utils/api/client.ts
+import { API_BASE_URL } from "../config";
+import { clearTokens, getTokens, setTokens } from "./session";
+
+// Thrown when the session is missing or can no longer be refreshed; screens
+// send the user back to the login screen.
+export class AuthError extends Error {
+  constructor() {
+    super("Please log in again");
+    this.name = "AuthError";
+  }
+}
+
+function send(path: string, options: RequestInit) {
+  const headers: Record<string, string> = {
+    ...(options.headers as Record<string, string> | undefined),
+  };
+  const access = getTokens()?.access;
+  if (access) headers.Authorization = `Bearer ${access}`;
+  return fetch(`${API_BASE_URL}${path}`, { ...options, headers });
+}
+
+async function refreshAccessToken(): Promise<boolean> {
+  const tokens = getTokens();
+  if (!tokens?.refresh) return false;
+  const response = await fetch(`${API_BASE_URL}/auth/token/refresh/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh: tokens.refresh }),
+  });
+  if (!response.ok) return false;
+  const data = await response.json();
+  setTokens({ access: data.access, refresh: data.refresh ?? tokens.refresh });
+  return true;
+}
+
+/**
+ * fetch() against the backend with the signed-in user's access token.
+ * An expired token is refreshed once and the request retried; if that is
+ * not possible the session is cleared and an AuthError thrown. Every
+ * other response, including non-2xx ones, is returned to the caller.
+ */
+export async function apiFetch(
+  path: string,
+  options: RequestInit = {}
+): Promise<Response> {
+  let response = await send(path, options);
+  if (response.status === 401 && (await refreshAccessToken())) {
+    response = await send(path, options);
+  }
+  if (response.status === 401) {
+    clearTokens();
+    throw new AuthError();
+  }
+  return response;
+}
+
+export async function logout() {
+  try {
+    await apiFetch("/auth/token/revoke/", { method: "POST" });
+  } catch {
+    // Already signed out
+  } finally {
+    clearTokens();
+  }
+}
@@ -0,0 +1,18 @@
+// frontend/utils/api/session.ts
+import type { LoginResponse } from "./auth";
+
+// Tokens of the signed-in user. They live in memory only, so the app asks
+// for a login again after a restart.
+let tokens: LoginResponse | null = null;
+
+export function getTokens(): LoginResponse | null {
+  return tokens;
+}
+
+export function setTokens(next: LoginResponse) {
+  tokens = next;
+}
+
+export function clearTokens() {
+  tokens = null;
+}